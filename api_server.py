@@ -0,0 +1,457 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+
+import recommend
+import report
+import scoring
+
+# --- API Constants ---
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8600
+# 이 시간 안에 같은 설정으로 들어온 작은 요청들은 한 번의 벡터 계산으로 묶어서 처리
+COALESCE_WINDOW_SEC = 0.002
+COALESCE_MAX_ROWS = 50000
+MAX_BODY_BYTES = 32 * 1024 * 1024
+RESPONSE_CACHE_SIZE = 512
+# /map 응답은 PNG라 항목 수만으로는 메모리가 제한되지 않으므로 응답 본문 크기의 합도 제한
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+LATENCY_WINDOW = 2048
+THROUGHPUT_WINDOW_SEC = 60
+CRITERIA_BY_TYPE = {criterion['assessment_type']: criterion for criterion in report.CRITERIA}
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+JSON_CONTENT_TYPE = 'application/json; charset=utf-8'
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def json_bytes(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+# --- Request Parsing ---
+def _number(value, what):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, f"{what} 값이 숫자가 아니에요: {value!r}")
+    if not math.isfinite(number):
+        raise ApiError(400, f"{what} 값이 올바르지 않아요: {value!r}")
+    return number
+
+def _keyword_items(body):
+    items = body.get('keywords')
+    if not isinstance(items, list) or not items:
+        raise ApiError(400, "'keywords' 목록이 비어 있거나 없어요.")
+    if not all(isinstance(item, dict) for item in items):
+        raise ApiError(400, "'keywords'의 각 항목은 객체여야 해요.")
+    return items
+
+def parse_score_request(body):
+    # {"weights": {사이트: 가중치}, "thresholds": [50, 200, 500], "top_n": 3,
+    #  "keywords": [{"keyword": "AI", "counts": {사이트: 검색 결과 수}}, ...]}
+    # 가중치를 주지 않은 사이트는 scoring CLI와 같이 기본 가중치(없으면 1.0)를 씀
+    items = _keyword_items(body)
+    weights = body.get('weights') or {}
+    if not isinstance(weights, dict):
+        raise ApiError(400, "'weights'는 {사이트: 가중치} 객체여야 해요.")
+    site_names = list(weights)
+    for item in items:
+        counts = item.get('counts', {})
+        if not isinstance(counts, dict):
+            raise ApiError(400, "'counts'는 {사이트: 검색 결과 수} 객체여야 해요.")
+        site_names.extend(name for name in counts if name not in weights)
+    site_names = list(dict.fromkeys(site_names))
+    site_weights = tuple(_number(weights.get(name, scoring.DEFAULT_SITE_WEIGHTS.get(name, 1.0)), f"'{name}' 가중치") for name in site_names)
+    thresholds = tuple(_number(value, "기준선") for value in body.get('thresholds', scoring.SCORE_THRESHOLDS))
+    if len(thresholds) != len(scoring.SCORE_THRESHOLDS) or list(thresholds) != sorted(thresholds):
+        raise ApiError(400, f"'thresholds'는 오름차순 숫자 {len(scoring.SCORE_THRESHOLDS)}개여야 해요.")
+    # 기본값은 사이트 수에 맞춰 줄이고, 직접 준 값은 1 ~ 사이트 수 사이의 정수만 받음
+    top_n = min(scoring.TOP_N_SITES, len(site_names))
+    if 'top_n' in body:
+        top_n = _number(body['top_n'], "'top_n'")
+        if top_n % 1 != 0 or not 1 <= top_n <= len(site_names):
+            raise ApiError(400, f"'top_n'은 1 이상 사이트 수({len(site_names)}) 이하의 정수여야 해요: {body['top_n']!r}")
+        top_n = int(top_n)
+    site_column = {name: j for j, name in enumerate(site_names)}
+    counts = np.zeros((len(items), len(site_names)))
+    for i, item in enumerate(items):
+        for name, count in item.get('counts', {}).items():
+            counts[i, site_column[name]] = _number(count, f"'{name}' 검색 결과 수")
+    keywords = [str(item.get('keyword', '')) for item in items]
+    return (tuple(site_names), site_weights, thresholds, top_n), keywords, counts
+
+def parse_classify_request(body):
+    # {"criterion": "average" | "유레카지수" | ..., "x_threshold": 2.5, "y_threshold": 2.5, "top_k": 9,
+    #  "keywords": [{"키워드": ..., "데이터가용성점수": ..., "유레카지수": ..., ...}, ...]} (앱에서 내보낸 표와 같은 열 이름)
+    items = _keyword_items(body)
+    criterion = CRITERIA_BY_TYPE.get(body.get('criterion', 'average'))
+    if criterion is None:
+        raise ApiError(400, f"'criterion'은 {', '.join(CRITERIA_BY_TYPE)} 중 하나여야 해요.")
+    df = pd.DataFrame(items)
+    missing = [column for column in scoring.TABLE_COLUMNS if column not in df.columns]
+    if missing:
+        raise ApiError(400, f"키워드 항목에 {', '.join(missing)} 값이 없어요.")
+    df = df[list(scoring.TABLE_COLUMNS)].copy()
+    for column in (scoring.SCORE_COLUMN,) + scoring.INDEX_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors='coerce')
+        if df[column].isna().any():
+            raise ApiError(400, f"'{column}' 값 중 숫자가 아닌 것이 있어요.")
+    df[scoring.KEYWORD_COLUMN] = df[scoring.KEYWORD_COLUMN].astype(str)
+    if criterion['assessment_type'] == 'average':
+        df[criterion['y_column']] = df[list(scoring.INDEX_COLUMNS)].astype(float).mean(axis=1).round(2)
+    x_threshold = _number(body.get('x_threshold', recommend.DEFAULT_THRESHOLD), "'x_threshold'")
+    y_threshold = _number(body.get('y_threshold', recommend.DEFAULT_THRESHOLD), "'y_threshold'")
+    top_k = int(_number(body.get('top_k', recommend.DEFAULT_TOP_K), "'top_k'"))
+    return criterion, x_threshold, y_threshold, top_k, df
+
+# --- Request Coalescing ---
+class BatchCoalescer:
+    # 같은 설정(key)으로 짧은 시간 안에 들어온 요청의 행을 모아 run_batch(key, 쌓은 행) 한 번으로 계산하고,
+    # 결과 배열들을 요청별로 다시 잘라서 돌려준다. 계산은 numpy 벡터 연산이라 이벤트 루프에서 바로 실행.
+    def __init__(self, run_batch, window_sec=COALESCE_WINDOW_SEC, max_rows=COALESCE_MAX_ROWS):
+        self.run_batch = run_batch
+        self.window_sec = window_sec
+        self.max_rows = max_rows
+        self.batches = 0
+        self.requests = 0
+        self.rows = 0
+        self._pending = {}
+
+    async def submit(self, key, rows):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = {'items': [], 'rows': 0}
+            loop.call_later(self.window_sec, self._flush, key, pending)
+        pending['items'].append((rows, future))
+        pending['rows'] += len(rows)
+        if pending['rows'] >= self.max_rows:
+            self._flush(key, pending)
+        return await future
+
+    def _flush(self, key, pending):
+        if self._pending.get(key) is not pending:
+            return
+        del self._pending[key]
+        items = pending['items']
+        self.batches += 1
+        self.requests += len(items)
+        self.rows += pending['rows']
+        try:
+            results = self.run_batch(key, np.concatenate([rows for rows, _ in items]))
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        start = 0
+        for rows, future in items:
+            end = start + len(rows)
+            if not future.done():
+                future.set_result(tuple(result[start:end] for result in results))
+            start = end
+
+    def stats(self):
+        return {'batches': self.batches, 'requests': self.requests, 'rows': self.rows,
+                'requests_per_batch': round(self.requests / self.batches, 2) if self.batches else 0.0}
+
+def score_batch(key, counts):
+    _, site_weights, thresholds, top_n = key
+    contributions, weighted_sum, scores = scoring.score_matrix(counts, site_weights, thresholds, top_n)
+    return contributions, weighted_sum, scores
+
+def classify_batch(key, values):
+    x_threshold, y_threshold = key
+    return (recommend.quadrant_codes(values[:, 0], values[:, 1], x_threshold, y_threshold),)
+
+# --- Response Cache ---
+class ResponseCache:
+    # 입력 해시 -> 응답 (LRU). 같은 입력이 계산 중이면 새로 계산하지 않고 그 결과를 같이 기다림
+    # 항목 수와 응답 본문 바이트 합 중 하나라도 넘으면 오래 안 쓴 항목부터 버림
+    def __init__(self, max_entries=RESPONSE_CACHE_SIZE, max_bytes=RESPONSE_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._inflight = {}
+
+    @staticmethod
+    def key(endpoint, body):
+        canonical = json.dumps(body, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(f"{endpoint}\n{canonical}".encode('utf-8')).hexdigest()
+
+    async def get_or_compute(self, key, compute):
+        # 반환: (응답, 캐시 사용 여부)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key], True
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.hits += 1
+            return await asyncio.shield(inflight), True
+        self.misses += 1
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            response = await compute()
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._inflight[key]
+        future.set_result(response)
+        self._store(key, response)
+        return response, False
+
+    @staticmethod
+    def response_bytes(response):
+        return len(response[2])
+
+    def _store(self, key, response):
+        size = self.response_bytes(response)
+        if size > self.max_bytes:
+            # 혼자서 예산을 넘는 응답은 다른 항목을 모두 밀어내지 않도록 저장하지 않음
+            return
+        self._entries[key] = response
+        self.total_bytes += size
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= self.response_bytes(evicted)
+            self.evictions += 1
+
+    def stats(self):
+        return {'entries': len(self._entries), 'bytes': self.total_bytes, 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+# --- Metrics ---
+class ApiMetrics:
+    def __init__(self, latency_window=LATENCY_WINDOW, throughput_window_sec=THROUGHPUT_WINDOW_SEC):
+        self.started = time.monotonic()
+        self.latency_window = latency_window
+        self.throughput_window_sec = throughput_window_sec
+        self._endpoints = {}
+
+    def record(self, endpoint, elapsed_sec, rows, status, cache_hit):
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = {'requests': 0, 'errors': 0, 'cache_hits': 0, 'rows': 0,
+                                                 'latency_ms': deque(maxlen=self.latency_window), 'recent': deque()}
+        now = time.monotonic()
+        stats['requests'] += 1
+        stats['errors'] += status >= 400
+        stats['cache_hits'] += bool(cache_hit)
+        stats['rows'] += rows
+        stats['latency_ms'].append(elapsed_sec * 1000)
+        stats['recent'].append((now, rows))
+        while stats['recent'] and stats['recent'][0][0] < now - self.throughput_window_sec:
+            stats['recent'].popleft()
+
+    def snapshot(self):
+        now = time.monotonic()
+        uptime = now - self.started
+        window = min(self.throughput_window_sec, max(uptime, 1e-9))
+        endpoints = {}
+        for endpoint, stats in self._endpoints.items():
+            latency = np.fromiter(stats['latency_ms'], dtype=float)
+            recent = [(t, rows) for t, rows in stats['recent'] if t >= now - self.throughput_window_sec]
+            endpoints[endpoint] = {
+                'requests': stats['requests'], 'errors': stats['errors'], 'cache_hits': stats['cache_hits'], 'rows': stats['rows'],
+                'latency_ms': {'mean': round(float(latency.mean()), 3), 'p50': round(float(np.percentile(latency, 50)), 3),
+                               'p95': round(float(np.percentile(latency, 95)), 3), 'p99': round(float(np.percentile(latency, 99)), 3),
+                               'max': round(float(latency.max()), 3)},
+                'requests_per_sec': round(len(recent) / window, 2),
+                'rows_per_sec': round(sum(rows for _, rows in recent) / window, 2),
+            }
+        return {'uptime_sec': round(uptime, 1), 'throughput_window_sec': self.throughput_window_sec, 'endpoints': endpoints}
+
+# --- Endpoints ---
+class KeywordApi:
+    def __init__(self, window_sec=COALESCE_WINDOW_SEC, cache_size=RESPONSE_CACHE_SIZE, render_workers=None, cache_bytes=RESPONSE_CACHE_MAX_BYTES):
+        self.score_coalescer = BatchCoalescer(score_batch, window_sec)
+        self.classify_coalescer = BatchCoalescer(classify_batch, window_sec)
+        self.cache = ResponseCache(cache_size, cache_bytes)
+        self.metrics = ApiMetrics()
+        self.renderer = report.ReportRenderer(render_workers)
+        self.routes = {
+            ('GET', '/health'): self.health,
+            ('GET', '/metrics'): self.metrics_endpoint,
+            ('POST', '/score'): self.score,
+            ('POST', '/classify'): self.classify,
+            ('POST', '/map'): self.render_map,
+        }
+
+    async def health(self, body):
+        return 200, JSON_CONTENT_TYPE, json_bytes({'status': 'ok'}), 0
+
+    async def metrics_endpoint(self, body):
+        snapshot = self.metrics.snapshot()
+        snapshot['coalescing'] = {'score': self.score_coalescer.stats(), 'classify': self.classify_coalescer.stats()}
+        snapshot['cache'] = self.cache.stats()
+        return 200, JSON_CONTENT_TYPE, json_bytes(snapshot), 0
+
+    async def score(self, body):
+        key, keywords, counts = parse_score_request(body)
+        contributions, weighted_sum, scores = await self.score_coalescer.submit(key, counts)
+        site_names, top_n = key[0], key[3]
+        top_sites = np.argsort(-contributions, axis=1, kind='stable')[:, :top_n]
+        results = []
+        for i, keyword in enumerate(keywords):
+            results.append({
+                'keyword': keyword,
+                'score': int(scores[i]),
+                'weighted_sum': float(weighted_sum[i]),
+                'top_sites': [{'name': site_names[j], 'contribution': float(contributions[i, j])} for j in top_sites[i] if contributions[i, j] > 0],
+            })
+        return 200, JSON_CONTENT_TYPE, json_bytes({'results': results}), len(results)
+
+    async def classify(self, body):
+        criterion, x_threshold, y_threshold, top_k, df = parse_classify_request(body)
+        y_values = df[criterion['y_column']].to_numpy(dtype=float)
+        values = np.column_stack([df[scoring.SCORE_COLUMN].to_numpy(dtype=float), y_values])
+        codes, = await self.classify_coalescer.submit((x_threshold, y_threshold), values)
+        keywords = df[scoring.KEYWORD_COLUMN].tolist()
+        results = [{'keyword': keyword, 'quadrant': int(code), 'criterion_score': float(y)} for keyword, code, y in zip(keywords, codes, y_values)]
+        quadrants = []
+        for quadrant in recommend.QUADRANTS:
+            members = np.flatnonzero(codes == quadrant['code'])
+            top = recommend.top_k_indices(y_values, members, top_k)
+            quadrants.append({'code': quadrant['code'], 'label': quadrant['label'], 'total': len(members), 'top': [keywords[i] for i in top]})
+        return 200, JSON_CONTENT_TYPE, json_bytes({'criterion': criterion['assessment_type'], 'results': results, 'quadrants': quadrants}), len(results)
+
+    async def render_map(self, body):
+        # 그래프는 보고서와 같은 작업 프로세스 풀에서 그림 (matplotlib이 이벤트 루프를 막지 않도록)
+        criterion, x_threshold, y_threshold, _, df = parse_classify_request(body)
+        jitter_seed = int(_number(body.get('jitter_seed', 0), "'jitter_seed'"))
+        args = (df[list(scoring.TABLE_COLUMNS)], criterion, x_threshold, y_threshold, jitter_seed)
+        try:
+            png = await self._render_in_pool(args)
+        except BrokenProcessPool:
+            # 작업 프로세스가 죽었으면 풀을 새로 만들어 한 번만 다시 시도 (닫는 동안 다른 요청의 작업을 기다리므로 스레드에서)
+            await asyncio.to_thread(self.renderer.shutdown)
+            png = await self._render_in_pool(args)
+        return 200, 'image/png', png, len(df)
+
+    async def _render_in_pool(self, args):
+        executor = await asyncio.to_thread(self.renderer.executor)
+        png, _ = await asyncio.get_running_loop().run_in_executor(executor, report.render_criterion, *args)
+        return png
+
+    async def dispatch(self, method, path, body_bytes):
+        # 반환: (상태 코드, Content-Type, 본문)
+        started = time.perf_counter()
+        handler = self.routes.get((method, path))
+        rows, cache_hit = 0, False
+        try:
+            if handler is None:
+                raise ApiError(405 if any(route_path == path for _, route_path in self.routes) else 404, f"{method} {path} 요청은 지원하지 않아요.")
+            if method == 'POST':
+                try:
+                    body = json.loads(body_bytes or b'{}')
+                except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                    raise ApiError(400, f"JSON 본문을 읽지 못했어요: {e}")
+                if not isinstance(body, dict):
+                    raise ApiError(400, "JSON 본문은 객체여야 해요.")
+                (status, content_type, payload, rows), cache_hit = await self.cache.get_or_compute(ResponseCache.key(path, body), lambda: handler(body))
+            else:
+                status, content_type, payload, rows = await handler(None)
+        except ApiError as e:
+            status, content_type, payload = e.status, JSON_CONTENT_TYPE, json_bytes({'error': str(e)})
+        except Exception as e:
+            status, content_type, payload = 500, JSON_CONTENT_TYPE, json_bytes({'error': f"{type(e).__name__}: {e}"})
+        if path != '/metrics':
+            self.metrics.record(path, time.perf_counter() - started, rows, status, cache_hit)
+        return status, content_type, payload
+
+    def close(self):
+        self.renderer.shutdown()
+
+# --- HTTP Server ---
+async def handle_connection(api, reader, writer):
+    # HTTP/1.1 keep-alive 최소 구현 (Content-Length 본문만 지원)
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            try:
+                method, target, version = request_line.decode('latin-1').split()
+            except ValueError:
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            try:
+                length = int(headers.get('content-length') or 0)
+            except ValueError:
+                length = -1
+            keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+            if length < 0 or length > MAX_BODY_BYTES:
+                status, content_type, payload = 413 if length > 0 else 400, JSON_CONTENT_TYPE, json_bytes({'error': "요청 본문 크기가 올바르지 않아요."})
+                keep_alive = False
+            else:
+                body = await reader.readexactly(length) if length else b''
+                status, content_type, payload = await api.dispatch(method.upper(), urlsplit(target).path, body)
+            writer.write((f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\nContent-Type: {content_type}\r\nContent-Length: {len(payload)}\r\n"
+                          f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode('latin-1') + payload)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, api=None, ready=None):
+    api = api or KeywordApi()
+    server = await asyncio.start_server(lambda reader, writer: handle_connection(api, reader, writer), host, port)
+    if ready is not None:
+        ready(server.sockets[0].getsockname()[:2])
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        api.close()
+
+# --- Command Line Entry Point ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="키워드 점수 계산, 사분면 분류, 평가 맵 PNG를 로컬 JSON API로 제공합니다.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--coalesce-ms', type=float, default=COALESCE_WINDOW_SEC * 1000, help="작은 요청을 모으는 시간 창 (밀리초)")
+    parser.add_argument('--cache-size', type=int, default=RESPONSE_CACHE_SIZE, help="입력 해시별로 기억할 응답 수")
+    parser.add_argument('--cache-mb', type=float, default=RESPONSE_CACHE_MAX_BYTES / (1024 * 1024), help="캐시할 응답 본문의 최대 합계 크기 (MB)")
+    parser.add_argument('--render-workers', type=int, default=None, help="그래프 렌더링 프로세스 수")
+    args = parser.parse_args(argv)
+
+    api = KeywordApi(args.coalesce_ms / 1000, args.cache_size, args.render_workers, int(args.cache_mb * 1024 * 1024))
+    try:
+        asyncio.run(serve(args.host, args.port, api, ready=lambda address: print(f"keyword API: http://{address[0]}:{address[1]}  (POST /score /classify /map, GET /metrics /health)", file=sys.stderr)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,275 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import export
+import rescoring
+import scoring
+import skyline
+import table_view
+from keyword_store import KeywordStore
+
+# --- Benchmark Constants ---
+DEFAULT_SIZES = (10, 1000, 10000, 100000)
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+DEFAULT_OUTPUT_PATH = 'bench_output.txt'
+DEFAULT_REPEAT = 3
+# 중앙값이 의미 있으려면 최소 3번은 재야 함 (--repeat 1이어도 3번)
+MIN_REPEAT = 3
+# 기준 대비 이 배율을 넘고, 차이가 최소값보다 클 때만 회귀로 판단 (작은 값의 측정 잡음 무시)
+TIME_TOLERANCE = 1.5
+MEMORY_TOLERANCE = 1.25
+MIN_TIME_DELTA_SEC = 0.005
+MIN_MEMORY_DELTA_BYTES = 1024 * 1024
+DELETE_SAMPLE = 1000
+SITE_NAMES = tuple(scoring.DEFAULT_SITE_WEIGHTS)
+
+# --- Synthetic Data ---
+def make_dataset(n, seed=0):
+    # 검색 결과 수는 실제처럼 한쪽으로 치우친 분포 (대부분 적고 일부만 아주 많음)
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({scoring.KEYWORD_COLUMN: [f"키워드{i:06d}" for i in range(n)]})
+    for site_name in SITE_NAMES:
+        df[site_name] = np.floor(rng.lognormal(4.0, 1.5, n)).astype(np.int64)
+    for index_column in scoring.INDEX_COLUMNS:
+        df[index_column] = rng.integers(1, 5, n)
+    return scoring.score_frame(df, scoring.DEFAULT_SITE_WEIGHTS)
+
+# --- Stages ---
+# 각 단계는 (준비, 측정) 함수 쌍: 준비는 시간/메모리에 포함하지 않고, 측정 함수만 잰다
+def stage_score_single(df):
+    # 앱의 calculate_data_availability_score_from_configs가 부르는 scoring.score_site_configs를 키워드 하나씩 실행
+    counts = df[list(SITE_NAMES)].to_numpy(dtype=np.int64)[:min(len(df), 1000)]
+    site_configs_rows = [[{'id': site_name, 'name': site_name, 'weight': weight, 'user_count': int(count)}
+                          for (site_name, weight), count in zip(scoring.DEFAULT_SITE_WEIGHTS.items(), row)] for row in counts]
+
+    def run():
+        for site_configs in site_configs_rows:
+            scoring.score_site_configs(site_configs)
+    return run
+
+def stage_score_batch(df):
+    counts = df[list(SITE_NAMES)].to_numpy(dtype=float)
+    weights = list(scoring.DEFAULT_SITE_WEIGHTS.values())
+    return lambda: scoring.score_matrix(counts, weights)
+
+def stage_rescore(df):
+    count_matrix = rescoring.SiteCountMatrix()
+    count_matrix.extend(df[scoring.KEYWORD_COLUMN], {site_name: df[site_name].to_numpy() for site_name in SITE_NAMES})
+    weights = np.array(list(scoring.DEFAULT_SITE_WEIGHTS.values()))
+
+    def run():
+        scorer = rescoring.WhatIfScorer()
+        new_scores = scorer.rescore(df, 0, count_matrix, SITE_NAMES, weights * 0.5)
+        rescoring.score_changes(df[scoring.SCORE_COLUMN].to_numpy(dtype=int), new_scores)
+    return run
+
+def stage_skyline(df):
+    frame = df[list(scoring.TABLE_COLUMNS)].copy()
+
+    def run():
+        ranked = skyline.with_frontier_levels(frame)
+        skyline.frontier_ranking(ranked)
+    return run
+
+def stage_add_delete(df):
+    rows = df[list(scoring.TABLE_COLUMNS)].to_dict('records')
+    doomed = df[scoring.KEYWORD_COLUMN].to_numpy()[::max(1, len(df) // DELETE_SAMPLE)].tolist()
+
+    def run():
+        store = KeywordStore()
+        for row in rows:
+            store.add(row)
+        for keyword in doomed:
+            store.remove(keyword)
+        store.frame()
+    return run
+
+def stage_table(df):
+    # 표는 라이브러리에서 한 페이지만 읽음 (라이브러리 채우기는 준비 단계)
+    import library_db
+
+    library = library_db.KeywordLibrary(':memory:')
+    library.add_keywords(df)
+
+    def run():
+        view = table_view.TableView()
+        styler, _, _, _ = view.styled_page(library, library.data_version(), sort_column=scoring.SCORE_COLUMN, descending=True, page=1, page_size=table_view.PAGE_SIZE_OPTIONS[1])
+        styler.to_html()
+    return run
+
+def stage_chart(df):
+    import matplotlib
+    matplotlib.use('Agg')
+    import fonts
+    fonts.setup_font()
+    import chart
+
+    plot_df = df[list(scoring.TABLE_COLUMNS)].copy()
+    plot_df['종합점수'] = plot_df[list(scoring.INDEX_COLUMNS)].astype(float).mean(axis=1).round(2)
+    return lambda: chart.render_keyword_map(plot_df, '종합점수', '종합 점수')
+
+def stage_export_csv(df):
+    frame = df[list(scoring.TABLE_COLUMNS)].copy()
+    return lambda: export.to_csv_bytes(frame)
+
+def stage_export_xlsx(df):
+    frame = df[list(scoring.TABLE_COLUMNS)].copy()
+    return lambda: export.to_xlsx_bytes(frame)
+
+def stage_app_rerun(df):
+    # 실제 스크립트를 AppTest로 실행: 라이브러리를 채운 뒤 첫 실행 + 표 페이지 넘김 한 번
+    # (같은 프로세스의 새 세션 기준: cache_resource는 측정 사이에 공유됨)
+    import importlib
+
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    import library_db
+
+    work_dir = tempfile.mkdtemp(prefix='keyword-bench-')
+    library_path = os.path.join(work_dir, 'library.sqlite3')
+    os.environ['KEYWORD_LIBRARY_PATH'] = library_path
+    importlib.reload(library_db)
+    st.cache_resource.clear()
+    library_db.KeywordLibrary(library_path).add_keywords(df)
+    script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '산점도v1.py')
+
+    def run():
+        app = AppTest.from_file(script_path, default_timeout=600).run()
+        if len(df) > table_view.PAGE_SIZE_OPTIONS[1]:
+            app.number_input(key='table_page').set_value(2).run()
+        if app.exception:
+            raise RuntimeError(app.exception[0].message)
+    return run
+
+STAGES = {
+    'score_single': stage_score_single,
+    'score_batch': stage_score_batch,
+    'rescore': stage_rescore,
+    'skyline': stage_skyline,
+    'add_delete': stage_add_delete,
+    'table': stage_table,
+    'chart': stage_chart,
+    'export_csv': stage_export_csv,
+    'export_xlsx': stage_export_xlsx,
+    'app_rerun': stage_app_rerun,
+}
+DEFAULT_STAGES = tuple(name for name in STAGES if name != 'app_rerun')
+
+# --- Measurement ---
+def measure(run, repeat=DEFAULT_REPEAT):
+    # 첫 실행은 지연 import, 폰트/스타일 초기화, 캐시 채우기가 섞여서 재지 않고 버림 (작은 크기에서 수십 배 튀는 원인)
+    # 시간은 tracemalloc 없이 여러 번 재서 중앙값, 최대 메모리는 따로 한 번 추적
+    gc.collect()
+    run()
+    times = []
+    for _ in range(max(repeat, MIN_REPEAT)):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': float(np.median(times)), 'peak_bytes': peak_bytes}
+
+def run_benchmarks(sizes, stages, repeat=DEFAULT_REPEAT, on_result=None):
+    results = {}
+    for n in sizes:
+        df = make_dataset(n)
+        for stage_name in stages:
+            result = measure(STAGES[stage_name](df), repeat)
+            results[f"{stage_name}@{n}"] = result
+            if on_result is not None:
+                on_result(stage_name, n, result)
+    return results
+
+# --- Baseline Comparison ---
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_baseline(path, results):
+    payload = {'created_at': time.strftime('%Y-%m-%d %H:%M:%S'), 'python': platform.python_version(), 'machine': platform.machine(), 'results': results}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+def compare(results, baseline, time_tolerance=TIME_TOLERANCE, memory_tolerance=MEMORY_TOLERANCE):
+    # 반환: {결과 키: [회귀 설명, ...]}
+    regressions = {}
+    base_results = (baseline or {}).get('results', {})
+    for key, result in results.items():
+        base = base_results.get(key)
+        if base is None:
+            continue
+        problems = []
+        if result['seconds'] > base['seconds'] * time_tolerance and result['seconds'] - base['seconds'] > MIN_TIME_DELTA_SEC:
+            problems.append(f"time {base['seconds'] * 1000:.1f}ms -> {result['seconds'] * 1000:.1f}ms")
+        if result['peak_bytes'] > base['peak_bytes'] * memory_tolerance and result['peak_bytes'] - base['peak_bytes'] > MIN_MEMORY_DELTA_BYTES:
+            problems.append(f"peak {base['peak_bytes'] / 2**20:.1f}MiB -> {result['peak_bytes'] / 2**20:.1f}MiB")
+        if problems:
+            regressions[key] = problems
+    return regressions
+
+def format_report(results, baseline):
+    base_results = (baseline or {}).get('results', {})
+    lines = [f"{'stage':<14}{'n':>8}{'time(ms)':>12}{'peak(MiB)':>12}{'base(ms)':>12}{'ratio':>8}"]
+    for key, result in results.items():
+        stage_name, n = key.split('@')
+        base = base_results.get(key)
+        ratio = f"{result['seconds'] / base['seconds']:.2f}" if base and base['seconds'] else "-"
+        base_ms = f"{base['seconds'] * 1000:.2f}" if base else "-"
+        lines.append(f"{stage_name:<14}{int(n):>8}{result['seconds'] * 1000:>12.2f}{result['peak_bytes'] / 2**20:>12.2f}{base_ms:>12}{ratio:>8}")
+    return "\n".join(lines)
+
+# --- Command Line Entry Point ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="점수 계산, 키워드 추가/삭제, 표, 그래프, 내보내기의 시간과 최대 메모리를 측정하고 기준값과 비교합니다.")
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES), help="키워드 수 (여러 개 지정 가능)")
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(DEFAULT_STAGES), help="측정할 단계 (app_rerun은 AppTest로 전체 스크립트 실행)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help=f"시간 측정 반복 횟수 (워밍업 1회 뒤 중앙값 사용, 최소 {MIN_REPEAT}회)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH, help="비교할 기준값 JSON")
+    parser.add_argument('--save-baseline', action='store_true', help="이번 결과를 기준값으로 저장 (기존 항목은 유지하고 덮어씀)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_PATH, help="보고서 파일 ('-'이면 저장 안 함)")
+    parser.add_argument('--time-tolerance', type=float, default=TIME_TOLERANCE)
+    parser.add_argument('--memory-tolerance', type=float, default=MEMORY_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings('ignore')
+    os.environ.setdefault('KEYWORD_APP_FONT_CACHE', os.path.join(tempfile.gettempdir(), 'keyword-bench-font-cache.json'))
+    baseline = load_baseline(args.baseline)
+    results = run_benchmarks(args.sizes, args.stages, args.repeat,
+                             on_result=lambda stage_name, n, result: print(f"{stage_name}@{n}: {result['seconds'] * 1000:.2f}ms, peak {result['peak_bytes'] / 2**20:.2f}MiB", file=sys.stderr))
+    report = format_report(results, baseline)
+    regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+    if regressions:
+        report += "\n\nREGRESSIONS:\n" + "\n".join(f"  {key}: {'; '.join(problems)}" for key, problems in regressions.items())
+    elif baseline is None:
+        report += f"\n\n(기준값 없음: {args.baseline})"
+    print(report)
+    if args.output != '-':
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report + "\n")
+    if args.save_baseline:
+        save_baseline(args.baseline, {**(baseline or {}).get('results', {}), **results})
+    return 1 if regressions and not args.save_baseline else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,198 @@
+import base64
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+import profiling
+import recommend
+import skyline
+
+# --- Chart Constants ---
+BASE_JITTER_STRENGTH = 0.05
+RENDER_CACHE_MAX_ENTRIES = 16
+RENDER_CACHE_MAX_BYTES = 64 * 1024 * 1024
+LABEL_ALL_MAX_POINTS = 60
+DENSITY_MODE_MIN_POINTS = 3000
+DENSITY_TOP_K_LABELS = 8
+MAX_PLACED_LABELS = 400
+
+# --- Helper Functions ---
+def get_color_palette(n):
+    base_colors = ['#FF9AA2', '#FFB7B2', '#FFDAC1', '#E2F0CB', '#B5EAD7', '#C7CEEA', '#B5B9FF', '#ADE8F4']
+    return (base_colors * (n // len(base_colors) + 1))[:n]
+
+def fig_to_base64(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight', dpi=150)
+    plt.close(fig)
+    buf.seek(0)
+    img_base64 = base64.b64encode(buf.read()).decode('utf-8')
+    return img_base64
+
+def keyword_jitter(keywords, seed=0, strength=BASE_JITTER_STRENGTH):
+    # 키워드마다 고정된 (x, y) 흔들림 -> 같은 데이터면 항상 같은 그림이 나와서 캐시가 안정적
+    offsets = np.empty((len(keywords), 2))
+    for i, keyword in enumerate(keywords):
+        digest = hashlib.blake2b(f"{seed}\x00{keyword}".encode('utf-8'), digest_size=8).digest()
+        offsets[i] = np.frombuffer(digest, dtype='<u4') / 2**32
+    return (offsets * 2 - 1) * strength
+
+def plot_content_hash(df, columns):
+    row_hashes = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+    return hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+
+# --- Render Cache ---
+class RenderCache:
+    # 프로세스 전체에서 공유되는 LRU 캐시 (항목 수와 총 바이트 수 둘 다 상한)
+    def __init__(self, max_entries=RENDER_CACHE_MAX_ENTRIES, max_bytes=RENDER_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= len(self._entries.pop(key))
+            self._entries[key] = value
+            self._total_bytes += len(value)
+            while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= len(evicted)
+
+    def get_or_render(self, key, render):
+        value = self.get(key)
+        if value is None:
+            value = render()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+# --- Label Placement ---
+def estimate_label_extent(labels, fontsize):
+    # 한글/전각 문자는 1em, 나머지는 약 0.6em으로 폭을 추정 (포인트 단위)
+    widths = np.array([sum(1.0 if ord(ch) >= 0x1100 else 0.6 for ch in label) for label in labels]) * fontsize
+    return widths, fontsize * 1.3
+
+def place_labels(x_pt, y_pt, widths_pt, height_pt, order, offset_pt=15, max_labels=MAX_PLACED_LABELS):
+    # 균일 격자 공간 색인: 이미 놓인 라벨 박스를 셀마다 기록하고, 겹치는 후보는 건너뛴다 (후보당 O(1) 근처)
+    cell_w = max(float(np.median(widths_pt)) if len(widths_pt) else height_pt, height_pt)
+    cell_h = height_pt
+    grid = {}
+    placed = []
+    for i in order:
+        half_w = widths_pt[i] / 2
+        box = (x_pt[i] - half_w, y_pt[i] + offset_pt, x_pt[i] + half_w, y_pt[i] + offset_pt + height_pt)
+        cells = [(cx, cy) for cx in range(int(box[0] // cell_w), int(box[2] // cell_w) + 1) for cy in range(int(box[1] // cell_h), int(box[3] // cell_h) + 1)]
+        collides = False
+        for cell in cells:
+            for other in grid.get(cell, ()):
+                if box[0] < other[2] and other[0] < box[2] and box[1] < other[3] and other[1] < box[3]:
+                    collides = True
+                    break
+            if collides:
+                break
+        if collides:
+            continue
+        for cell in cells:
+            grid.setdefault(cell, []).append(box)
+        placed.append(i)
+        if len(placed) >= max_labels:
+            break
+    return placed
+
+def top_k_per_quadrant(x_values, y_values, k=DENSITY_TOP_K_LABELS, threshold=recommend.DEFAULT_THRESHOLD):
+    # 사분면마다 (x + y)가 큰 순서로 k개씩
+    codes = recommend.quadrant_codes(x_values, y_values, threshold, threshold)
+    rank_values = x_values + y_values
+    selected = []
+    for quadrant in recommend.QUADRANTS:
+        selected.extend(recommend.top_k_indices(rank_values, np.flatnonzero(codes == quadrant['code']), k).tolist())
+    return selected
+
+# --- Keyword Map ---
+def draw_keyword_map(df_graph_plot, y_column_graph, title_suffix_graph, jitter_seed=0, label_all_max=LABEL_ALL_MAX_POINTS, density_threshold=DENSITY_MODE_MIN_POINTS):
+    fig_graph, ax_graph = plt.subplots(figsize=(17, 14))
+    n_points = len(df_graph_plot)
+    keywords = df_graph_plot['키워드'].astype(str).tolist()
+    jitter = keyword_jitter(keywords, jitter_seed)
+    x_jittered = df_graph_plot['데이터가용성점수'].astype(float).to_numpy() + jitter[:, 0]
+    y_jittered = df_graph_plot[y_column_graph].astype(float).to_numpy() + jitter[:, 1]
+    density_mode = n_points >= density_threshold
+
+    ax_graph.axhline(y=2.5, color='gray', linestyle='--', alpha=0.7); ax_graph.axvline(x=2.5, color='gray', linestyle='--', alpha=0.7)
+    quadrant_fills = {"top_left": ([0.5, 2.5], 2.5, 4.5, 'gold', 0.05), "top_right": ([2.5, 4.5], 2.5, 4.5, 'limegreen', 0.05), "bottom_left": ([0.5, 2.5], 0.5, 2.5, 'tomato', 0.05), "bottom_right": ([2.5, 4.5], 0.5, 2.5, 'dodgerblue', 0.05)}
+    for x_range, y_bottom, y_top, color_fill, alpha_fill in quadrant_fills.values(): ax_graph.fill_between(x_range, y_bottom, y_top, alpha=alpha_fill, color=color_fill)
+    if density_mode:
+        # 점이 많으면 개별 점 대신 육각 밀도 셀 + 사분면별 상위 라벨만
+        hexbin = ax_graph.hexbin(x_jittered, y_jittered, gridsize=48, extent=(0.5, 4.5, 0.5, 4.5), cmap='YlGnBu', mincnt=1, bins='log', alpha=0.85)
+        fig_graph.colorbar(hexbin, ax=ax_graph, fraction=0.035, pad=0.02).set_label('키워드 수 (log)', fontsize=18)
+    else:
+        # 점 개수와 무관하게 scatter 한 번 (키워드별 hue/범례 없음)
+        ax_graph.scatter(x_jittered, y_jittered, s=250 if n_points <= label_all_max else 60, c=get_color_palette(n_points), alpha=0.8, edgecolors='white', linewidths=0.75)
+    if skyline.LEVEL_COLUMN in df_graph_plot.columns:
+        # 네 점수 모두에서 다른 키워드에 밀리지 않는 최전선(1단계) 키워드는 별 모양으로 덧그림
+        frontier = df_graph_plot[skyline.LEVEL_COLUMN].to_numpy(dtype=float, na_value=np.nan) == skyline.FRONTIER_LEVEL
+        if frontier.any():
+            ax_graph.scatter(x_jittered[frontier], y_jittered[frontier], s=500 if n_points <= label_all_max else 160, marker='*', c='gold', edgecolors='#8a6d00', linewidths=1.0, zorder=3, label=f'파레토 최전선 ({int(frontier.sum()):,}개)')
+            ax_graph.legend(loc='lower left', fontsize=16, framealpha=0.9)
+    quadrant_texts = [(1.5, 3.5, "도전적인 보석\n(자료 부족, 높은 가치)", '#b28900'), (3.5, 3.5, "최고의 보석\n(자료 풍부, 높은 가치)", '#2a7d2a'), (1.5, 1.5, "재고려 필요\n(자료 부족, 낮은 가치)", '#c33'), (3.5, 1.5, "안정적 선택\n(자료 풍부, 낮은 가치)", '#177a8c')]
+    for x_text, y_text, label_text, color_text in quadrant_texts: ax_graph.text(x_text, y_text, label_text, ha='center', va='center', fontsize=20, color=color_text, wrap=True, linespacing=1.5, alpha=0.5 if density_mode else 1.0)
+    ax_graph.set_title(f'키워드 평가 맵: 데이터 가용성 vs {title_suffix_graph}', fontsize=35, pad=30, weight='bold')
+    ax_graph.set_xlabel('데이터 가용성 점수', fontsize=25, labelpad=25); ax_graph.set_ylabel(title_suffix_graph, fontsize=25, labelpad=25)
+    ax_graph.set_xlim(0.5, 4.5); ax_graph.set_ylim(0.5, 4.5); ax_graph.set_xticks([1, 2, 3, 4]); ax_graph.set_yticks([1, 2, 3, 4])
+    ax_graph.tick_params(axis='both', which='major', labelsize=20); ax_graph.grid(True, linestyle=':', alpha=0.6)
+
+    if n_points <= label_all_max:
+        label_fontsize, label_indices = 20, list(range(n_points))
+    else:
+        label_fontsize = 12
+        candidates = top_k_per_quadrant(x_jittered, y_jittered) if density_mode else np.argsort(-(x_jittered + y_jittered), kind='stable')
+        # 데이터 좌표 -> 포인트 좌표 (축 크기 기준 근사)로 바꿔서 겹침 판정
+        axes_box = ax_graph.get_position()
+        pt_per_unit_x = axes_box.width * fig_graph.get_figwidth() * 72 / 4.0
+        pt_per_unit_y = axes_box.height * fig_graph.get_figheight() * 72 / 4.0
+        widths_pt, height_pt = estimate_label_extent(keywords, label_fontsize)
+        label_indices = place_labels(x_jittered * pt_per_unit_x, y_jittered * pt_per_unit_y, widths_pt, height_pt, candidates)
+    for i in label_indices: ax_graph.annotate(keywords[i], (x_jittered[i], y_jittered[i]), xytext=(0, 15), textcoords='offset points', fontsize=label_fontsize, fontweight='bold', ha='center')
+    fig_graph.tight_layout(pad=1.5)
+    return fig_graph
+
+def render_keyword_map(df_graph_plot, y_column_graph, title_suffix_graph, jitter_seed=0, label_all_max=LABEL_ALL_MAX_POINTS, density_threshold=DENSITY_MODE_MIN_POINTS, profiler=None):
+    with profiling.span(profiler, 'chart_build'):
+        fig_graph = draw_keyword_map(df_graph_plot, y_column_graph, title_suffix_graph, jitter_seed, label_all_max, density_threshold)
+    with profiling.span(profiler, 'chart_png') as png_span:
+        img_base64 = fig_to_base64(fig_graph)
+        png_span.add_bytes(len(img_base64))
+    return img_base64
+
+def cached_keyword_map(render_cache, df_graph_plot, y_column_graph, title_suffix_graph, assessment_type, jitter_seed=0, profiler=None):
+    hash_columns = ['키워드', '데이터가용성점수', y_column_graph] + ([skyline.LEVEL_COLUMN] if skyline.LEVEL_COLUMN in df_graph_plot.columns else [])
+    content_hash = plot_content_hash(df_graph_plot, hash_columns)
+    cache_key = (content_hash, assessment_type, jitter_seed)
+    return render_cache.get_or_render(cache_key, lambda: render_keyword_map(df_graph_plot, y_column_graph, title_suffix_graph, jitter_seed, profiler=profiler))
@@ -0,0 +1,188 @@
+import math
+import re
+import unicodedata
+
+# --- Dedupe Constants ---
+DEFAULT_SIMILARITY_THRESHOLD = 0.75
+NGRAM_SIZE = 3
+MAX_MATCHES = 5
+# 단어 끝에 붙은 조사는 떼고 비교 (긴 것부터 확인, 떼고 남는 글자가 두 글자 이상일 때만)
+# 이/가/과/로/도/만처럼 명사 끝 글자와 자주 겹치는 한 글자 조사는 넣지 않음 ('고양이', '결과', '진로')
+PARTICLE_SUFFIXES = sorted(['은', '는', '을', '를', '의', '에', '와', '에서', '에게', '께서', '으로', '까지', '부터', '이나', '이랑', '보다', '처럼', '하고', '에대한', '에관한'], key=len, reverse=True)
+# 짧은 영문 약어는 한글 발음으로 바꿔서 'AI 윤리'와 '에이아이 윤리'를 같은 글자로 비교
+LATIN_LETTER_NAMES = dict(zip('abcdefghijklmnopqrstuvwxyz', ['에이', '비', '씨', '디', '이', '에프', '지', '에이치', '아이', '제이', '케이', '엘', '엠', '엔', '오', '피', '큐', '알', '에스', '티', '유', '브이', '더블유', '엑스', '와이', '지']))
+LATIN_ACRONYM_MAX_LEN = 4
+
+_HANGUL_BASE, _HANGUL_LAST = 0xAC00, 0xD7A3
+_CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+_JUNGSEONG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+_JONGSEONG = ' ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ'
+_NON_WORD = re.compile(r'[^0-9a-z가-힣ㄱ-ㆎ]+')
+_LATIN_RUN = re.compile(r'[a-z]+')
+
+# --- Normalization ---
+def _strip_particle(word, min_suffix_len=1):
+    for suffix in PARTICLE_SUFFIXES:
+        if len(suffix) >= min_suffix_len and word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            return word[:-len(suffix)]
+    return word
+
+def _spell_acronym(match):
+    run = match.group(0)
+    return ''.join(LATIN_LETTER_NAMES[c] for c in run) if len(run) <= LATIN_ACRONYM_MAX_LEN else run
+
+def normalize(keyword):
+    # NFKC + 소문자 -> 단어별 끝 조사 제거 -> 짧은 영문 약어 한글 발음 -> 공백/기호 제거
+    text = unicodedata.normalize('NFKC', str(keyword)).lower()
+    words = [_NON_WORD.sub('', word) for word in text.split()]
+    words = [word for word in words if word]
+    # 한 글자 조사는 키워드 중간 단어에서만 떼고, 마지막 단어에서는 두 글자 이상 조사만 뗌
+    words = [_strip_particle(word, 1 if position < len(words) - 1 else 2) for position, word in enumerate(words)]
+    return _LATIN_RUN.sub(_spell_acronym, ''.join(words))
+
+def to_jamo(text):
+    # 완성형 한글 음절을 초성/중성/종성 자모로 분해 (그 밖의 글자는 그대로)
+    out = []
+    for char in text:
+        code = ord(char)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            offset = code - _HANGUL_BASE
+            out.append(_CHOSEONG[offset // 588])
+            out.append(_JUNGSEONG[(offset % 588) // 28])
+            if offset % 28:
+                out.append(_JONGSEONG[offset % 28])
+        else:
+            out.append(char)
+    return ''.join(out)
+
+def keyword_ngrams(keyword, n=NGRAM_SIZE):
+    jamo = to_jamo(normalize(keyword))
+    if not jamo:
+        return frozenset()
+    padded = f"^{jamo}$"
+    if len(padded) <= n:
+        return frozenset([padded])
+    return frozenset(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    overlap = len(a & b)
+    return overlap / (len(a) + len(b) - overlap)
+
+# --- Inverted N-gram Index ---
+class NearDuplicateIndex:
+    # 자모 n-gram -> 키워드 id 역색인. 질의는 드문 n-gram 몇 개(prefix filter)만 훑어 후보를 모으고,
+    # 길이 조건으로 거른 뒤 후보만 Jaccard를 계산하므로 전체 쌍 비교(O(n²)) 없이 찾는다.
+    def __init__(self, keywords=()):
+        self._postings = {}
+        self._grams = {}
+        self._ids = {}
+        self._keywords = {}
+        self._next_id = 0
+        for keyword in keywords:
+            self.add(keyword)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, keyword):
+        return keyword in self._ids
+
+    def add(self, keyword):
+        if keyword in self._ids:
+            return False
+        keyword_id = self._next_id
+        self._next_id += 1
+        grams = keyword_ngrams(keyword)
+        self._ids[keyword] = keyword_id
+        self._keywords[keyword_id] = keyword
+        self._grams[keyword_id] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(keyword_id)
+        return True
+
+    def remove(self, keyword):
+        keyword_id = self._ids.pop(keyword, None)
+        if keyword_id is None:
+            return False
+        del self._keywords[keyword_id]
+        for gram in self._grams.pop(keyword_id):
+            posting = self._postings[gram]
+            posting.discard(keyword_id)
+            if not posting:
+                del self._postings[gram]
+        return True
+
+    def _candidates(self, grams, threshold):
+        # Jaccard >= t 이면 겹치는 n-gram이 ceil(t*|q|)개 이상 -> 드문 순으로 앞의 |q|-ceil(t*|q|)+1개 중 하나는 반드시 공유
+        ordered = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+        prefix_len = len(ordered) - math.ceil(threshold * len(ordered)) + 1
+        candidates = set()
+        for gram in ordered[:max(prefix_len, 1)]:
+            candidates.update(self._postings.get(gram, ()))
+        return candidates
+
+    def query(self, keyword, threshold=DEFAULT_SIMILARITY_THRESHOLD, limit=MAX_MATCHES):
+        # 반환: [(비슷한 키워드, 유사도)] 유사도 높은 순 (자기 자신 제외)
+        grams = keyword_ngrams(keyword)
+        if not grams:
+            return []
+        self_id = self._ids.get(keyword)
+        min_len, max_len = threshold * len(grams), len(grams) / threshold if threshold > 0 else math.inf
+        matches = []
+        for candidate_id in self._candidates(grams, threshold):
+            if candidate_id == self_id:
+                continue
+            candidate_grams = self._grams[candidate_id]
+            if not min_len <= len(candidate_grams) <= max_len:
+                continue
+            similarity = jaccard(grams, candidate_grams)
+            if similarity >= threshold:
+                matches.append((candidate_id, similarity))
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return [(self._keywords[candidate_id], similarity) for candidate_id, similarity in matches[:limit]]
+
+    def similar_pairs(self, threshold=DEFAULT_SIMILARITY_THRESHOLD):
+        # 목록 전체의 비슷한 쌍 (AllPairs 방식): 작은 키워드부터 처리하면서 양쪽 모두 드문 n-gram prefix만 색인/질의
+        order_key = {gram: (len(posting), gram) for gram, posting in self._postings.items()}
+        prefix_index = {}
+        for keyword_id, grams in sorted(self._grams.items(), key=lambda item: (len(item[1]), item[0])):
+            if not grams:
+                continue
+            ordered = sorted(grams, key=order_key.__getitem__)
+            prefix = ordered[:len(ordered) - math.ceil(threshold * len(ordered)) + 1]
+            candidates = set()
+            for gram in prefix:
+                candidates.update(prefix_index.get(gram, ()))
+            min_len = threshold * len(grams)
+            for candidate_id in candidates:
+                candidate_grams = self._grams[candidate_id]
+                if len(candidate_grams) >= min_len:
+                    similarity = jaccard(grams, candidate_grams)
+                    if similarity >= threshold:
+                        yield self._keywords[candidate_id], self._keywords[keyword_id], similarity
+            # 뒤에 오는 키워드는 크기가 같거나 크므로 색인에는 더 짧은 prefix(겹침 하한 2t/(1+t))만 넣어도 충분
+            for gram in ordered[:len(ordered) - math.ceil(2 * threshold / (1 + threshold) * len(ordered)) + 1]:
+                prefix_index.setdefault(gram, []).append(keyword_id)
+
+    def duplicate_groups(self, threshold=DEFAULT_SIMILARITY_THRESHOLD):
+        # 비슷한 키워드끼리 묶음. 반환: [[대표 키워드, 나머지...], ...]
+        # A~B, B~C라도 A와 C가 다르면 한 묶음이 되지 않도록, 먼저 추가된 키워드부터 대표로 정하고
+        # 대표와 직접 비슷한(유사도 >= threshold) 키워드 중 아직 묶이지 않은 것만 같은 묶음에 넣음
+        neighbors = {}
+        for keyword_a, keyword_b, _ in self.similar_pairs(threshold):
+            id_a, id_b = self._ids[keyword_a], self._ids[keyword_b]
+            neighbors.setdefault(id_a, []).append(id_b)
+            neighbors.setdefault(id_b, []).append(id_a)
+        grouped, groups = set(), []
+        for keyword_id in sorted(neighbors):
+            if keyword_id in grouped:
+                continue
+            members = sorted(neighbor for neighbor in neighbors[keyword_id] if neighbor not in grouped)
+            if not members:
+                continue
+            grouped.add(keyword_id)
+            grouped.update(members)
+            groups.append([self._keywords[keyword_id]] + [self._keywords[member] for member in members])
+        return groups
@@ -0,0 +1,83 @@
+import io
+
+import pandas as pd
+
+# --- Export Constants ---
+EXPORT_FILE_STEM = "키워드_분석_결과"
+EXCEL_SHEET_NAME = '키워드분석'
+CSV_CHUNK_ROWS = 10000
+XLSX_CONSTANT_MEMORY_MIN_ROWS = 20000
+
+# --- Builders ---
+def iter_csv_bytes(df, chunk_rows=CSV_CHUNK_ROWS):
+    # 헤더(BOM 포함) 다음에 행 묶음 단위로 인코딩 -> 전체 문자열을 한 번에 만들지 않음
+    yield df.iloc[:0].to_csv(index=False).encode('utf-8-sig')
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows].to_csv(index=False, header=False).encode('utf-8')
+
+def to_csv_bytes(df):
+    return b"".join(iter_csv_bytes(df))
+
+def to_xlsx_sheets_bytes(sheets, constant_memory_min_rows=XLSX_CONSTANT_MEMORY_MIN_ROWS):
+    # sheets: {시트 이름: DataFrame} (순서대로 시트 생성)
+    import xlsxwriter
+
+    output = io.BytesIO()
+    # constant_memory: 행을 순서대로 쓰면서 바로 디스크로 내보내서 큰 시트도 메모리가 일정
+    total_rows = sum(len(df) for df in sheets.values())
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': total_rows >= constant_memory_min_rows, 'nan_inf_to_errors': True})
+    header_format = workbook.add_format({'bold': True, 'align': 'center'})
+    for sheet_name, df in sheets.items():
+        worksheet = workbook.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, [str(c) for c in df.columns], header_format)
+        values = df.astype(object).where(df.notna(), None).to_numpy()
+        for row_idx, row in enumerate(values, start=1):
+            worksheet.write_row(row_idx, 0, row)
+    workbook.close()
+    return output.getvalue()
+
+def to_xlsx_bytes(df, sheet_name=EXCEL_SHEET_NAME, constant_memory_min_rows=XLSX_CONSTANT_MEMORY_MIN_ROWS):
+    return to_xlsx_sheets_bytes({sheet_name: df}, constant_memory_min_rows)
+
+def to_parquet_bytes(df):
+    output = io.BytesIO()
+    df.to_parquet(output, index=False, engine='pyarrow')
+    return output.getvalue()
+
+def to_arrow_bytes(df):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+EXPORT_FORMATS = {
+    'csv': {'label': "CSV", 'icon': "📥", 'extension': 'csv', 'mime': 'text/csv', 'builder': to_csv_bytes},
+    'xlsx': {'label': "엑셀 (XLSX)", 'icon': "📊", 'extension': 'xlsx', 'mime': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'builder': to_xlsx_bytes},
+    'parquet': {'label': "Parquet", 'icon': "🧱", 'extension': 'parquet', 'mime': 'application/vnd.apache.parquet', 'builder': to_parquet_bytes},
+    'arrow': {'label': "Arrow IPC", 'icon': "🏹", 'extension': 'arrow', 'mime': 'application/vnd.apache.arrow.file', 'builder': to_arrow_bytes},
+}
+
+def export_file_name(fmt, stem=EXPORT_FILE_STEM):
+    return f"{stem}.{EXPORT_FORMATS[fmt]['extension']}"
+
+# --- Versioned Export Cache ---
+class ExportCache:
+    # 데이터 버전이 바뀌면 이전 버전의 결과는 모두 버림 (버전당 형식별로 한 번만 생성)
+    def __init__(self):
+        self.version = None
+        self._built = {}
+
+    def get(self, version, fmt):
+        if version != self.version:
+            return None
+        return self._built.get(fmt)
+
+    def build(self, version, fmt, df):
+        if version != self.version:
+            self.version, self._built = version, {}
+        if fmt not in self._built:
+            self._built[fmt] = EXPORT_FORMATS[fmt]['builder'](df)
+        return self._built[fmt]
@@ -0,0 +1,86 @@
+import json
+import os
+import tempfile
+
+import matplotlib.font_manager as fm
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+# --- Font Resolution Cache ---
+# matplotlib 캐시를 지우고 전체 폰트를 다시 스캔하는 대신, 고른 한글 폰트의 (이름, 경로, mtime)만 저장해 두고
+# 파일이 그대로면 바로 재사용한다. 파일이 바뀌었거나 없어졌을 때만 다시 찾는다.
+KOREAN_FONTS_PRIORITY = ["NanumSquareRound", "NanumGothic", "Malgun Gothic", "AppleSDGothicNeo"]
+FONT_CACHE_PATH = os.environ.get('KEYWORD_APP_FONT_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'keyword-eval-app', 'font_cache.json'))
+
+def _file_mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+def load_cached_font(cache_path=FONT_CACHE_PATH):
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or not cached.get('name') or not cached.get('path'):
+        return None
+    if cached.get('mtime') != _file_mtime(cached['path']):
+        return None
+    return cached
+
+def save_cached_font(font_entry, cache_path=FONT_CACHE_PATH):
+    # 다른 프로세스와 동시에 써도 깨지지 않도록 임시 파일에 쓰고 교체
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(font_entry, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+def _match_font(font_entries):
+    by_name = {}
+    for font_info in font_entries:
+        by_name.setdefault(font_info.name, font_info)
+    for font in KOREAN_FONTS_PRIORITY:
+        if font in by_name:
+            return by_name[font]
+    for font_info in font_entries:
+        if any(kor_font.lower() in font_info.name.lower() for kor_font in KOREAN_FONTS_PRIORITY):
+            return font_info
+    return None
+
+def resolve_korean_font():
+    # 1) matplotlib이 이미 알고 있는 폰트 목록 (자체 fontlist 캐시, 스캔 없음)
+    font_info = _match_font(fm.fontManager.ttflist)
+    if font_info is None:
+        # 2) 서버에 나중에 설치된 폰트(fonts-nanum 등)만 골라서 등록 - 전체 FontManager 재생성은 하지 않음
+        candidate_keys = [name.lower().replace(' ', '') for name in KOREAN_FONTS_PRIORITY] + ['nanum', 'malgun', 'applesdgothic']
+        for path in fm.findSystemFonts():
+            if any(key in os.path.basename(path).lower().replace(' ', '') for key in candidate_keys):
+                try:
+                    fm.fontManager.addfont(path)
+                except (OSError, RuntimeError, ValueError):
+                    continue
+        font_info = _match_font(fm.fontManager.ttflist)
+    if font_info is None:
+        return None
+    return {'name': font_info.name, 'path': font_info.fname, 'mtime': _file_mtime(font_info.fname)}
+
+def setup_font(cache_path=FONT_CACHE_PATH):
+    font_entry = load_cached_font(cache_path)
+    if font_entry is not None:
+        if not any(f.fname == font_entry['path'] for f in fm.fontManager.ttflist):
+            fm.fontManager.addfont(font_entry['path'])
+    else:
+        font_entry = resolve_korean_font()
+        if font_entry is not None:
+            save_cached_font(font_entry, cache_path)
+
+    plt.rcParams['font.family'] = font_entry['name'] if font_entry else 'sans-serif'
+    plt.rcParams['axes.unicode_minus'] = False
+    sns.set_theme(style="whitegrid", rc={"font.family": plt.rcParams.get('font.family', 'sans-serif'), "axes.unicode_minus": False})
+    return font_entry['name'] if font_entry else None
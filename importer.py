@@ -0,0 +1,130 @@
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+import scoring
+
+# --- Import Constants ---
+DEFAULT_CHUNK_ROWS = 5000
+REJECT_REASON_COLUMN = '거부 사유'
+INDEX_MIN, INDEX_MAX = 1, 4
+
+# --- Chunked Readers ---
+def _stream_size(file_obj):
+    try:
+        position = file_obj.tell()
+        file_obj.seek(0, os.SEEK_END)
+        size = file_obj.tell()
+        file_obj.seek(position)
+        return size
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return 0
+
+def iter_csv_chunks(file_obj, chunk_rows=DEFAULT_CHUNK_ROWS):
+    size = _stream_size(file_obj)
+    reader = pd.read_csv(file_obj, chunksize=chunk_rows, dtype=str, keep_default_na=False, encoding='utf-8-sig', skipinitialspace=True)
+    for chunk in reader:
+        progress = min(file_obj.tell() / size, 1.0) if size else 0.0
+        yield chunk, progress
+
+def iter_xlsx_chunks(file_obj, chunk_rows=DEFAULT_CHUNK_ROWS):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_obj, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        total_rows = max((sheet.max_row or 1) - 1, 1)
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [str(h).strip() if h is not None else f'열{i + 1}' for i, h in enumerate(header)]
+        buffer, read_rows = [], 0
+        for row in rows:
+            buffer.append(['' if v is None else str(v) for v in row])
+            if len(buffer) >= chunk_rows:
+                read_rows += len(buffer)
+                yield pd.DataFrame(buffer, columns=header), min(read_rows / total_rows, 1.0)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=header), 1.0
+    finally:
+        workbook.close()
+
+def iter_import_chunks(file_obj, file_name, chunk_rows=DEFAULT_CHUNK_ROWS):
+    if file_name.lower().endswith(('.xlsx', '.xlsm')):
+        return iter_xlsx_chunks(file_obj, chunk_rows)
+    return iter_csv_chunks(file_obj, chunk_rows)
+
+# --- Validation & Scoring ---
+def validate_and_score_chunk(chunk, site_weights, seen_keywords, thresholds=scoring.SCORE_THRESHOLDS):
+    chunk = chunk.rename(columns=lambda c: str(c).strip())
+    reasons = pd.Series('', index=chunk.index, dtype=object)
+
+    def reject(mask, reason):
+        mask = mask & (reasons == '')
+        reasons[mask] = reason
+
+    keywords = chunk.get(scoring.KEYWORD_COLUMN, pd.Series('', index=chunk.index)).astype(str).str.strip()
+    reject(keywords == '', "키워드가 비어 있어요")
+
+    site_names = list(site_weights.keys())
+    counts = np.zeros((len(chunk), len(site_names)))
+    for j, site_name in enumerate(site_names):
+        if site_name not in chunk.columns:
+            continue
+        raw = chunk[site_name].astype(str).str.strip().str.replace(',', '', regex=False)
+        values = pd.to_numeric(raw.where(raw != '', '0'), errors='coerce')
+        reject(values.isna() | (values < 0) | (values % 1 != 0), f"'{site_name}' 검색 결과 수는 0 이상의 정수여야 해요")
+        counts[:, j] = values.fillna(0).to_numpy(dtype=float)
+
+    indices = {}
+    for index_column in scoring.INDEX_COLUMNS:
+        if index_column not in chunk.columns:
+            reject(pd.Series(True, index=chunk.index), f"'{index_column}' 열이 없어요")
+            indices[index_column] = pd.Series(np.nan, index=chunk.index)
+            continue
+        values = pd.to_numeric(chunk[index_column].astype(str).str.strip(), errors='coerce')
+        reject(values.isna() | (values % 1 != 0) | (values < INDEX_MIN) | (values > INDEX_MAX), f"'{index_column}'는 {INDEX_MIN}~{INDEX_MAX} 사이의 정수여야 해요")
+        indices[index_column] = values
+
+    # 파일 안 중복과 기존 목록 중복을 한 번에 확인 (seen_keywords는 청크 사이에서 공유되는 set)
+    # 검증을 통과한 행끼리만 비교해서, 앞의 잘못된 행 때문에 뒤의 올바른 행이 중복으로 버려지지 않게 함
+    valid = (reasons == '').to_numpy()
+    duplicated = np.zeros(len(chunk), dtype=bool)
+    duplicated[valid] = (keywords[valid].duplicated(keep='first') | keywords[valid].isin(seen_keywords)).to_numpy()
+    reject(pd.Series(duplicated, index=chunk.index), "이미 목록(또는 파일 앞부분)에 있는 키워드예요")
+
+    accepted_mask = (reasons == '').to_numpy()
+    _, _, scores = scoring.score_matrix(counts[accepted_mask], [site_weights[name] for name in site_names], thresholds)
+    accepted = pd.DataFrame({scoring.KEYWORD_COLUMN: keywords[accepted_mask].to_numpy(), scoring.SCORE_COLUMN: scores.astype(int)})
+    for index_column in scoring.INDEX_COLUMNS:
+        accepted[index_column] = indices[index_column][accepted_mask].astype(int).to_numpy()
+    # 가중치/기준선이 바뀌면 다시 계산할 수 있도록 원본 검색 결과 수도 함께 돌려줌 (사이트 이름 열)
+    for j, site_name in enumerate(site_names):
+        accepted[site_name] = counts[accepted_mask, j].astype(np.int64)
+    seen_keywords.update(accepted[scoring.KEYWORD_COLUMN])
+
+    rejected = chunk.loc[~accepted_mask].copy()
+    rejected.insert(0, REJECT_REASON_COLUMN, reasons[~accepted_mask])
+    return accepted, rejected
+
+def import_keywords(file_obj, file_name, site_weights, existing_keywords=(), chunk_rows=DEFAULT_CHUNK_ROWS, on_progress=None, thresholds=scoring.SCORE_THRESHOLDS):
+    seen_keywords = set(existing_keywords)
+    accepted_parts, rejected_parts, row_offset = [], [], 0
+    for chunk, progress in iter_import_chunks(file_obj, file_name, chunk_rows):
+        chunk = chunk.reset_index(drop=True)
+        accepted, rejected = validate_and_score_chunk(chunk, site_weights, seen_keywords, thresholds)
+        accepted_parts.append(accepted)
+        if not rejected.empty:
+            # 원본 파일 기준 행 번호 (헤더 = 1행)
+            rejected.insert(0, '행 번호', rejected.index + row_offset + 2)
+            rejected_parts.append(rejected)
+        row_offset += len(chunk)
+        if on_progress is not None:
+            on_progress(progress, row_offset)
+    accepted = pd.concat(accepted_parts, ignore_index=True) if accepted_parts else pd.DataFrame(columns=list(scoring.TABLE_COLUMNS) + list(site_weights))
+    rejected = pd.concat(rejected_parts, ignore_index=True) if rejected_parts else pd.DataFrame(columns=['행 번호', REJECT_REASON_COLUMN])
+    return accepted, rejected
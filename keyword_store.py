@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+
+import scoring
+
+# --- Indexed Keyword Store ---
+# 열 단위 list에 append (amortized O(1)), 키워드 -> 슬롯 dict로 중복 확인/삭제 O(1).
+# 삭제는 슬롯을 비워두고, 빈 슬롯이 절반을 넘으면 한 번에 압축해서 순서를 유지한다.
+COMPACT_MIN_DELETED = 64
+
+class KeywordStore:
+    def __init__(self, columns=scoring.TABLE_COLUMNS, key_column=scoring.KEYWORD_COLUMN):
+        self.columns = list(columns)
+        self.key_column = key_column
+        self.version = 0
+        self._data = {column: [] for column in self.columns}
+        self._alive = []
+        self._index = {}
+        self._deleted = 0
+        self._frame_cache = (None, None)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, keyword):
+        return keyword in self._index
+
+    @property
+    def empty(self):
+        return not self._index
+
+    def _touch(self):
+        self.version += 1
+
+    def add(self, row):
+        keyword = row[self.key_column]
+        if keyword in self._index:
+            return False
+        self._index[keyword] = len(self._alive)
+        self._alive.append(True)
+        for column in self.columns:
+            self._data[column].append(row.get(column))
+        self._touch()
+        return True
+
+    def extend(self, df):
+        # 한 번의 버전 증가로 여러 행을 추가 (중복 키워드는 건너뜀)
+        if df is None or df.empty:
+            return 0
+        df = df[~df[self.key_column].isin(self._index)].drop_duplicates(subset=self.key_column, keep='first')
+        if df.empty:
+            return 0
+        start = len(self._alive)
+        for column in self.columns:
+            self._data[column].extend(df[column].tolist() if column in df.columns else [None] * len(df))
+        self._alive.extend([True] * len(df))
+        self._index.update(zip(df[self.key_column].tolist(), range(start, start + len(df))))
+        self._touch()
+        return len(df)
+
+    def remove(self, keyword):
+        slot = self._index.pop(keyword, None)
+        if slot is None:
+            return False
+        self._alive[slot] = False
+        self._deleted += 1
+        if self._deleted >= COMPACT_MIN_DELETED and self._deleted * 2 > len(self._alive):
+            self._compact()
+        self._touch()
+        return True
+
+    def update(self, keyword, **values):
+        slot = self._index.get(keyword)
+        if slot is None:
+            return False
+        for column, value in values.items():
+            self._data[column][slot] = value
+        self._touch()
+        return True
+
+    def update_column(self, column, keywords, values):
+        # 여러 키워드의 한 열을 한 번의 버전 증가로 갱신 (다시 계산한 점수 반영용)
+        data = self._data[column]
+        updated = 0
+        for keyword, value in zip(keywords, values):
+            slot = self._index.get(keyword)
+            if slot is not None:
+                data[slot] = value
+                updated += 1
+        if updated:
+            self._touch()
+        return updated
+
+    def clear(self):
+        self._data = {column: [] for column in self.columns}
+        self._alive, self._index, self._deleted = [], {}, 0
+        self._touch()
+
+    def _compact(self):
+        live_slots = [slot for slot, alive in enumerate(self._alive) if alive]
+        self._data = {column: [values[slot] for slot in live_slots] for column, values in self._data.items()}
+        self._alive = [True] * len(live_slots)
+        self._index = {keyword: slot for slot, keyword in enumerate(self._data[self.key_column])}
+        self._deleted = 0
+
+    def get(self, keyword):
+        slot = self._index.get(keyword)
+        if slot is None:
+            return None
+        return {column: self._data[column][slot] for column in self.columns}
+
+    def keywords(self):
+        return list(self._index.keys())
+
+    def frame(self):
+        # 표/그래프가 필요할 때만 DataFrame을 만들고, 버전이 같으면 재사용 (읽기 전용으로 사용할 것)
+        cached_version, cached_frame = self._frame_cache
+        if cached_version == self.version:
+            return cached_frame
+        if not self._index:
+            df = pd.DataFrame(columns=self.columns)
+        else:
+            df = pd.DataFrame(self._data, columns=self.columns)
+            if self._deleted:
+                df = df[np.asarray(self._alive, dtype=bool)].reset_index(drop=True)
+            df = df.infer_objects()
+        self._frame_cache = (self.version, df)
+        return df
@@ -0,0 +1,361 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+import scoring
+import skyline
+
+# --- Library Constants ---
+DEFAULT_LIBRARY_PATH = os.environ.get('KEYWORD_LIBRARY_PATH', os.path.join(os.path.expanduser('~'), '.cache', 'keyword-eval-app', 'keyword_library.sqlite3'))
+POOL_SIZE = 4
+# 화면 열 이름 -> DB 열 이름 (정렬/검색은 이 목록에 있는 열만 허용)
+COLUMN_MAP = {scoring.KEYWORD_COLUMN: 'keyword', scoring.SCORE_COLUMN: 'score', '유레카지수': 'eureka', '덕질가능지수': 'fan', '성장잠재력지수': 'potential',
+              skyline.LEVEL_COLUMN: 'frontier_level'}
+# 키워드를 고치는 쓰기마다 1씩 올라가는 값 (세션이 불러 둔 목록이 최신인지 확인용, settings 표에 저장)
+KEYWORDS_VERSION_KEY = 'keywords_version'
+# 사이트 설정이나 다른 설정을 고칠 때마다 1씩 올라가는 값 (세션이 불러 둔 사이트 목록과 점수 기준이 최신인지 확인용)
+SETTINGS_VERSION_KEY = 'settings_version'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sites (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    weight REAL NOT NULL,
+    is_default INTEGER NOT NULL DEFAULT 0,
+    position INTEGER NOT NULL,
+    search_url TEXT NOT NULL DEFAULT '',
+    count_pattern TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS keywords (
+    keyword TEXT PRIMARY KEY,
+    score INTEGER NOT NULL,
+    eureka INTEGER NOT NULL,
+    fan INTEGER NOT NULL,
+    potential INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    frontier_level INTEGER
+);
+CREATE TABLE IF NOT EXISTS keyword_counts (
+    keyword TEXT NOT NULL REFERENCES keywords(keyword) ON DELETE CASCADE,
+    site_id TEXT NOT NULL REFERENCES sites(id) ON DELETE CASCADE,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (keyword, site_id)
+);
+CREATE TABLE IF NOT EXISTS score_combos (
+    score INTEGER NOT NULL,
+    eureka INTEGER NOT NULL,
+    fan INTEGER NOT NULL,
+    potential INTEGER NOT NULL,
+    keyword_count INTEGER NOT NULL,
+    frontier_level INTEGER,
+    PRIMARY KEY (score, eureka, fan, potential)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_keywords_score ON keywords(score, keyword);
+CREATE INDEX IF NOT EXISTS idx_keywords_eureka ON keywords(eureka, keyword);
+CREATE INDEX IF NOT EXISTS idx_keywords_fan ON keywords(fan, keyword);
+CREATE INDEX IF NOT EXISTS idx_keywords_potential ON keywords(potential, keyword);
+CREATE INDEX IF NOT EXISTS idx_keyword_counts_site ON keyword_counts(site_id);
+"""
+# 이전 버전 파일에는 없는 열 (자동 수집 설정, 최전선 단계) - 열을 붙인 다음에 만드는 색인과 트리거도 같이 둠
+# 트리거는 키워드를 쓸 때마다 점수 조합별 키워드 수(score_combos)를 고치고, 점수가 바뀐 행에는 새 조합의 단계를 붙임
+SITE_MIGRATION_COLUMNS = {'search_url': "TEXT NOT NULL DEFAULT ''", 'count_pattern': "TEXT NOT NULL DEFAULT ''"}
+KEYWORD_MIGRATION_COLUMNS = {'frontier_level': "INTEGER"}
+POST_MIGRATION_SCHEMA = """
+CREATE INDEX IF NOT EXISTS idx_keywords_frontier_level ON keywords(frontier_level, keyword);
+CREATE INDEX IF NOT EXISTS idx_keywords_score_combo ON keywords(score, eureka, fan, potential, frontier_level);
+CREATE TRIGGER IF NOT EXISTS trg_keywords_combo_insert AFTER INSERT ON keywords BEGIN
+    INSERT INTO score_combos (score, eureka, fan, potential, keyword_count) VALUES (NEW.score, NEW.eureka, NEW.fan, NEW.potential, 1)
+        ON CONFLICT (score, eureka, fan, potential) DO UPDATE SET keyword_count = keyword_count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_keywords_combo_delete AFTER DELETE ON keywords BEGIN
+    UPDATE score_combos SET keyword_count = keyword_count - 1 WHERE score = OLD.score AND eureka = OLD.eureka AND fan = OLD.fan AND potential = OLD.potential;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_keywords_combo_update AFTER UPDATE OF score, eureka, fan, potential ON keywords
+WHEN OLD.score IS NOT NEW.score OR OLD.eureka IS NOT NEW.eureka OR OLD.fan IS NOT NEW.fan OR OLD.potential IS NOT NEW.potential BEGIN
+    UPDATE score_combos SET keyword_count = keyword_count - 1 WHERE score = OLD.score AND eureka = OLD.eureka AND fan = OLD.fan AND potential = OLD.potential;
+    INSERT INTO score_combos (score, eureka, fan, potential, keyword_count) VALUES (NEW.score, NEW.eureka, NEW.fan, NEW.potential, 1)
+        ON CONFLICT (score, eureka, fan, potential) DO UPDATE SET keyword_count = keyword_count + 1;
+    UPDATE keywords SET frontier_level = (SELECT frontier_level FROM score_combos WHERE score = NEW.score AND eureka = NEW.eureka AND fan = NEW.fan AND potential = NEW.potential)
+        WHERE keyword = NEW.keyword;
+END;
+"""
+
+# --- Connection Pool ---
+class ConnectionPool:
+    # 세션들이 같은 파일을 공유 (WAL 모드라 읽기는 쓰기와 동시에 가능)
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._size = size
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self._size
+                if can_create:
+                    self._created += 1
+            conn = self._connect() if can_create else self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+# --- Keyword Library ---
+class KeywordLibrary:
+    def __init__(self, path=DEFAULT_LIBRARY_PATH, pool_size=POOL_SIZE):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.pool = ConnectionPool(path, 1 if path == ':memory:' else pool_size)
+        with self.pool.connection() as conn, conn:
+            conn.executescript(SCHEMA)
+            for table, migration_columns in (('sites', SITE_MIGRATION_COLUMNS), ('keywords', KEYWORD_MIGRATION_COLUMNS)):
+                existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                for column, definition in migration_columns.items():
+                    if column not in existing:
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            conn.executescript(POST_MIGRATION_SCHEMA)
+            # 조합 표가 없던 이전 파일이면 키워드에서 다시 만듦 (조합 수 합계가 키워드 수와 같으면 그대로 씀)
+            if conn.execute("SELECT (SELECT COALESCE(SUM(keyword_count), 0) FROM score_combos) != (SELECT COUNT(*) FROM keywords)").fetchone()[0]:
+                conn.execute("DELETE FROM score_combos")
+                conn.execute("INSERT INTO score_combos (score, eureka, fan, potential, keyword_count) "
+                             "SELECT score, eureka, fan, potential, COUNT(*) FROM keywords GROUP BY score, eureka, fan, potential")
+            self._refresh_frontier_levels(conn)
+
+    # --- Sites ---
+    def load_sites(self):
+        with self.pool.connection() as conn:
+            rows = conn.execute("SELECT id, name, weight, is_default, search_url, count_pattern FROM sites ORDER BY position").fetchall()
+        return [{'id': site_id, 'name': name, 'weight': weight, 'is_default': bool(is_default), 'user_count': 0, 'search_url': search_url, 'count_pattern': count_pattern}
+                for site_id, name, weight, is_default, search_url, count_pattern in rows]
+
+    def save_sites(self, site_configs):
+        # 넘겨받은 사이트만 추가/수정 (다른 세션이 방금 추가한 사이트는 건드리지 않음)
+        # 새 사이트는 맨 뒤에 붙이고, 이미 있는 사이트는 순서를 그대로 둠
+        with self.pool.connection() as conn, conn:
+            conn.executemany(
+                "INSERT INTO sites (id, name, weight, is_default, position, search_url, count_pattern) "
+                "VALUES (?, ?, ?, ?, (SELECT COALESCE(MAX(position), -1) + 1 FROM sites), ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET name = excluded.name, weight = excluded.weight, search_url = excluded.search_url, count_pattern = excluded.count_pattern",
+                [(s['id'], s['name'], float(s['weight']), int(bool(s.get('is_default', False))), s.get('search_url') or '', s.get('count_pattern') or '')
+                 for s in site_configs],
+            )
+            self._touch_settings(conn)
+
+    def seed_sites(self, site_configs):
+        # 빈 라이브러리에 기본 사이트를 넣고 저장된 목록을 돌려줌 (여러 세션이 동시에 시작해도 이름이 겹치면 먼저 넣은 쪽이 남음)
+        with self.pool.connection() as conn, conn:
+            if conn.execute("SELECT COUNT(*) FROM sites").fetchone()[0] == 0:
+                conn.executemany("INSERT OR IGNORE INTO sites (id, name, weight, is_default, position) VALUES (?, ?, ?, ?, ?)",
+                                 [(s['id'], s['name'], float(s['weight']), int(bool(s.get('is_default', False))), position) for position, s in enumerate(site_configs)])
+                self._touch_settings(conn)
+        return self.load_sites()
+
+    def delete_sites(self, site_ids):
+        # 사이트를 지우면 그 사이트의 키워드별 검색 결과 수도 같이 지워짐 (ON DELETE CASCADE)
+        with self.pool.connection() as conn, conn:
+            deleted = conn.executemany("DELETE FROM sites WHERE id = ?", ((site_id,) for site_id in site_ids)).rowcount
+            self._touch_settings(conn)
+        return deleted
+
+    # --- Settings ---
+    def load_setting(self, key, default=None):
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def save_setting(self, key, value):
+        with self.pool.connection() as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, json.dumps(value, ensure_ascii=False)))
+            self._touch_settings(conn)
+
+    def _touch_settings(self, conn):
+        conn.execute("INSERT INTO settings (key, value) VALUES (?, '1') ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1", (SETTINGS_VERSION_KEY,))
+
+    def settings_version(self):
+        return int(self.load_setting(SETTINGS_VERSION_KEY, 0))
+
+    # --- Keywords ---
+    def _refresh_frontier_levels(self, conn):
+        # 최전선 단계는 점수 조합의 집합으로만 정해지므로 (표가 ORDER BY frontier_level로 바로 페이지를 읽게 DB에 저장),
+        # 트리거가 센 조합별 키워드 수를 보고 조합이 새로 생기거나(단계 NULL) 없어졌을 때만 다시 계산.
+        # 조합은 최대 4^4 = 256개라 계산은 조합 표만 읽고, 단계가 바뀐 조합의 행만 조합 색인으로 고침
+        if conn.execute("SELECT 1 FROM score_combos WHERE keyword_count <= 0 OR frontier_level IS NULL LIMIT 1").fetchone():
+            conn.execute("DELETE FROM score_combos WHERE keyword_count <= 0")
+            combos = np.array(conn.execute("SELECT score, eureka, fan, potential, frontier_level FROM score_combos").fetchall(), dtype=float).reshape(-1, 5)
+            levels = skyline.frontier_levels(combos[:, :4])
+            # NULL은 NaN으로 읽히므로 새 조합도 바뀐 것으로 잡힘
+            changed = levels != combos[:, 4]
+            updates = [(level, *map(int, combo)) for level, combo in zip(levels[changed].tolist(), combos[changed, :4])]
+            conn.executemany("UPDATE score_combos SET frontier_level = ? WHERE score = ? AND eureka = ? AND fan = ? AND potential = ?", updates)
+            conn.executemany("UPDATE keywords SET frontier_level = ? WHERE score = ? AND eureka = ? AND fan = ? AND potential = ?", updates)
+        # 새로 추가된 행은 단계가 비어 있으므로 조합 표에서 붙임 (단계 색인으로 빈 행만 읽음)
+        conn.execute("UPDATE keywords SET frontier_level = (SELECT c.frontier_level FROM score_combos c WHERE c.score = keywords.score AND c.eureka = keywords.eureka "
+                     "AND c.fan = keywords.fan AND c.potential = keywords.potential) WHERE frontier_level IS NULL")
+
+    def _touch_keywords(self, conn):
+        # 같은 트랜잭션 안에서 단계와 버전을 고쳐서, 쓰기가 반영되면 둘 다 반드시 같이 바뀜
+        self._refresh_frontier_levels(conn)
+        conn.execute("INSERT INTO settings (key, value) VALUES (?, '1') ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1", (KEYWORDS_VERSION_KEY,))
+
+    def data_version(self):
+        return int(self.load_setting(KEYWORDS_VERSION_KEY, 0))
+
+    def has_keyword(self, keyword):
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT 1 FROM keywords WHERE keyword = ?", (keyword,)).fetchone() is not None
+
+    def add_keyword(self, row, site_counts=None):
+        with self.pool.connection() as conn, conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO keywords (keyword, score, eureka, fan, potential, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (row[scoring.KEYWORD_COLUMN], int(row[scoring.SCORE_COLUMN]), int(row['유레카지수']), int(row['덕질가능지수']), int(row['성장잠재력지수']), time.time()),
+            )
+            if cursor.rowcount and site_counts:
+                conn.executemany("INSERT OR REPLACE INTO keyword_counts (keyword, site_id, count) VALUES (?, ?, ?)",
+                                 [(row[scoring.KEYWORD_COLUMN], site_id, int(count)) for site_id, count in site_counts.items()])
+            self._touch_keywords(conn)
+            return bool(cursor.rowcount)
+
+    def add_keywords(self, df, site_count_columns=None):
+        # site_count_columns: {사이트 id: df의 열 이름}
+        if df is None or df.empty:
+            return 0
+        now = time.time()
+        records = df[[scoring.KEYWORD_COLUMN, scoring.SCORE_COLUMN, '유레카지수', '덕질가능지수', '성장잠재력지수']].itertuples(index=False, name=None)
+        with self.pool.connection() as conn, conn:
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO keywords (keyword, score, eureka, fan, potential, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                             ((k, int(s), int(e), int(f), int(p), now) for k, s, e, f, p in records))
+            inserted = conn.total_changes - before
+            for site_id, column in (site_count_columns or {}).items():
+                if column in df.columns:
+                    conn.executemany("INSERT OR REPLACE INTO keyword_counts (keyword, site_id, count) VALUES (?, ?, ?)",
+                                     ((k, site_id, int(c)) for k, c in zip(df[scoring.KEYWORD_COLUMN], df[column])))
+            self._touch_keywords(conn)
+        return inserted
+
+    def update_keyword(self, row, site_counts=None):
+        # 비슷한 키워드 합치기: 기존 키워드의 점수/지수와 사이트별 검색 결과 수를 새 값으로 교체
+        with self.pool.connection() as conn, conn:
+            cursor = conn.execute("UPDATE keywords SET score = ?, eureka = ?, fan = ?, potential = ? WHERE keyword = ?",
+                                  (int(row[scoring.SCORE_COLUMN]), int(row['유레카지수']), int(row['덕질가능지수']), int(row['성장잠재력지수']), row[scoring.KEYWORD_COLUMN]))
+            if cursor.rowcount and site_counts is not None:
+                conn.execute("DELETE FROM keyword_counts WHERE keyword = ?", (row[scoring.KEYWORD_COLUMN],))
+                conn.executemany("INSERT INTO keyword_counts (keyword, site_id, count) VALUES (?, ?, ?)",
+                                 [(row[scoring.KEYWORD_COLUMN], site_id, int(count)) for site_id, count in site_counts.items()])
+            self._touch_keywords(conn)
+            return bool(cursor.rowcount)
+
+    def delete_keyword(self, keyword):
+        with self.pool.connection() as conn, conn:
+            deleted = bool(conn.execute("DELETE FROM keywords WHERE keyword = ?", (keyword,)).rowcount)
+            self._touch_keywords(conn)
+            return deleted
+
+    def delete_keywords(self, keywords):
+        with self.pool.connection() as conn, conn:
+            # total_changes는 연쇄 삭제된 검색 결과 수 행까지 세므로 rowcount 사용
+            deleted = conn.executemany("DELETE FROM keywords WHERE keyword = ?", ((k,) for k in keywords)).rowcount
+            self._touch_keywords(conn)
+            return deleted
+
+    def merge_keywords(self, groups, site_weights, thresholds=scoring.SCORE_THRESHOLDS):
+        # 비슷한 키워드 정리: 묶음([남길 키워드, 합칠 키워드...])마다 사이트별 검색 결과 수를 큰 값으로 합쳐 남길 키워드에 두고
+        # (표기만 다른 같은 검색어라 결과가 대부분 겹치므로 더하지 않음) 나머지를 지운 뒤, 합친 수로 점수를 다시 계산.
+        # site_weights는 {사이트 id: 가중치}. 반환: (지운 키워드 수, {남긴 키워드: (새 점수, {사이트 id: 검색 결과 수})})
+        site_ids = list(site_weights)
+        with self.pool.connection() as conn, conn:
+            survivors, duplicates = [], []
+            for survivor, *group_duplicates in groups:
+                if not group_duplicates or not conn.execute("SELECT 1 FROM keywords WHERE keyword = ?", (survivor,)).fetchone():
+                    continue
+                placeholders = ", ".join("?" * (len(group_duplicates) + 1))
+                conn.execute(f"INSERT INTO keyword_counts (keyword, site_id, count) SELECT ?, site_id, MAX(count) FROM keyword_counts "
+                             f"WHERE keyword IN ({placeholders}) GROUP BY site_id "
+                             "ON CONFLICT (keyword, site_id) DO UPDATE SET count = excluded.count", [survivor, survivor, *group_duplicates])
+                survivors.append(survivor)
+                duplicates.extend(group_duplicates)
+            deleted = conn.executemany("DELETE FROM keywords WHERE keyword = ?", ((k,) for k in duplicates)).rowcount
+            merged = {survivor: {} for survivor in survivors}
+            for survivors_chunk in (survivors[i:i + 500] for i in range(0, len(survivors), 500)):
+                placeholders = ", ".join("?" * len(survivors_chunk))
+                for keyword, site_id, count in conn.execute(f"SELECT keyword, site_id, count FROM keyword_counts WHERE keyword IN ({placeholders})", survivors_chunk):
+                    merged[keyword][site_id] = count
+            counts = np.array([[merged[survivor].get(site_id, 0) for site_id in site_ids] for survivor in survivors], dtype=float).reshape(len(survivors), len(site_ids))
+            _, _, scores = scoring.score_matrix(counts, [site_weights[site_id] for site_id in site_ids], thresholds)
+            conn.executemany("UPDATE keywords SET score = ? WHERE keyword = ?", zip(scores.astype(int).tolist(), survivors))
+            self._touch_keywords(conn)
+            return deleted, {survivor: (int(score), merged[survivor]) for survivor, score in zip(survivors, scores)}
+
+    def update_scores(self, keywords, scores):
+        with self.pool.connection() as conn, conn:
+            conn.executemany("UPDATE keywords SET score = ? WHERE keyword = ?", ((int(s), k) for k, s in zip(keywords, scores)))
+            self._touch_keywords(conn)
+
+    def load_keywords(self):
+        with self.pool.connection() as conn:
+            df = pd.read_sql_query("SELECT keyword, score, eureka, fan, potential FROM keywords ORDER BY rowid", conn)
+        return df.rename(columns={v: k for k, v in COLUMN_MAP.items()})
+
+    def load_counts(self):
+        # 키워드 x 사이트 id 행렬 (없는 값은 0)
+        with self.pool.connection() as conn:
+            df = pd.read_sql_query("SELECT keyword, site_id, count FROM keyword_counts", conn)
+        if df.empty:
+            return pd.DataFrame()
+        return df.pivot(index='keyword', columns='site_id', values='count').fillna(0).astype(int)
+
+    # --- Server-side Queries ---
+    def _where(self, search):
+        if not search:
+            return "", []
+        escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return "WHERE keyword LIKE ? ESCAPE '\\'", [f"%{escaped}%"]
+
+    def count_keywords(self, search=""):
+        where, params = self._where(search)
+        with self.pool.connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM keywords {where}", params).fetchone()[0]
+
+    def query_keywords(self, search="", sort_column=None, descending=False, limit=50, offset=0):
+        where, params = self._where(search)
+        order_by = "rowid"
+        if sort_column is not None:
+            db_column = COLUMN_MAP[sort_column]
+            direction = "DESC" if descending else "ASC"
+            order_by = f"{db_column} {direction}" + ("" if db_column == 'keyword' else f", keyword {direction}")
+        with self.pool.connection() as conn:
+            df = pd.read_sql_query(f"SELECT keyword, score, eureka, fan, potential, frontier_level FROM keywords {where} ORDER BY {order_by} LIMIT ? OFFSET ?",
+                                   conn, params=params + [int(limit), int(offset)])
+        return df.rename(columns={v: k for k, v in COLUMN_MAP.items()})
+
+    def column_ranges(self, columns):
+        # 반환: {화면 열 이름: (최소, 최대)} - 표 색칠 기준 (키워드가 없으면 (None, None))
+        # 집계를 하나씩 하위 쿼리로 나눠야 SQLite가 열 색인의 양 끝만 읽음 (한 SELECT에 여러 개면 전체 스캔)
+        bounds = [f"(SELECT {aggregate}({COLUMN_MAP[column]}) FROM keywords)" for column in columns for aggregate in ('MIN', 'MAX')]
+        with self.pool.connection() as conn:
+            row = conn.execute(f"SELECT {', '.join(bounds)}").fetchone()
+        return {column: (row[2 * i], row[2 * i + 1]) for i, column in enumerate(columns)}
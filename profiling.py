@@ -0,0 +1,141 @@
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+
+import pandas as pd
+
+# --- Profiling Constants ---
+# KEYWORD_APP_PROFILE=1 이면 항상, 0~1 사이 소수면 그 비율의 실행만 기록 (운영 중 표본 수집용)
+PROFILE_ENV = 'KEYWORD_APP_PROFILE'
+PROFILE_QUERY_PARAM = 'profile'
+# 디버그 패널은 표본 비율과 따로, 직접 켠 경우에만 보여줌 (?profile=1로 연 세션 또는 이 환경 변수)
+PROFILE_PANEL_ENV = 'KEYWORD_APP_PROFILE_PANEL'
+PROFILE_LOG_PATH = os.environ.get('KEYWORD_APP_PROFILE_LOG', os.path.join(os.path.expanduser('~'), '.cache', 'keyword-eval-app', 'profile_spans.jsonl'))
+MAX_KEPT_SPANS = 300
+_ENABLED_VALUES = ('1', 'true', 'yes', 'on')
+
+def sample_rate(query_value=None, env_value=None):
+    # 쿼리 매개변수(?profile=1)가 있으면 그 값이 우선
+    for value in (query_value, os.environ.get(PROFILE_ENV, '') if env_value is None else env_value):
+        value = (value or '').strip().lower()
+        if not value:
+            continue
+        if value in _ENABLED_VALUES:
+            return 1.0
+        try:
+            return min(max(float(value), 0.0), 1.0)
+        except ValueError:
+            return 0.0
+    return 0.0
+
+# --- Spans ---
+class _NullSpan:
+    # 꺼져 있을 때 쓰는 공유 객체: 속성 확인 한 번 외에는 아무 일도 하지 않음
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add_bytes(self, nbytes):
+        pass
+
+NULL_SPAN = _NullSpan()
+
+class Span:
+    __slots__ = ('profiler', 'name', 'bytes', '_start', '_blocks')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.bytes = 0
+
+    def __enter__(self):
+        self._blocks = sys.getallocatedblocks()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._start
+        self.profiler.record({
+            'name': self.name,
+            'ms': round(elapsed * 1000, 3),
+            'alloc_blocks': sys.getallocatedblocks() - self._blocks,
+            'bytes': self.bytes,
+            'error': exc_type.__name__ if exc_type else None,
+        })
+        return False
+
+    def add_bytes(self, nbytes):
+        # 구간에서 만들어진 결과 크기 (PNG, 내보내기 파일, HTML 등)
+        self.bytes += int(nbytes)
+
+def span(profiler, name):
+    # profiler가 없거나 꺼져 있으면 NULL_SPAN (차트 모듈처럼 profiler를 선택 인자로 받는 곳에서 사용)
+    if profiler is None or not profiler.active:
+        return NULL_SPAN
+    return Span(profiler, name)
+
+# --- Session Profiler ---
+class Profiler:
+    # 세션마다 하나. 전체 실행이 시작될 때 begin_run으로 이번 실행을 기록할지 정한다 (fragment 재실행은 같은 결정을 따름)
+    def __init__(self, log_path=PROFILE_LOG_PATH, max_spans=MAX_KEPT_SPANS):
+        self.session_id = uuid.uuid4().hex[:12]
+        self.log_path = log_path
+        self.rate = 0.0
+        self.active = False
+        self.panel_requested = False
+        self.run_id = 0
+        self.spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.rate > 0
+
+    @property
+    def show_panel(self):
+        # KEYWORD_APP_PROFILE로 표본만 모으는 중이면 다른 사용자 화면에는 패널을 띄우지 않음
+        return self.panel_requested
+
+    def begin_run(self, query_value=None):
+        self.panel_requested = sample_rate(query_value, env_value='') > 0 or os.environ.get(PROFILE_PANEL_ENV, '').strip().lower() in _ENABLED_VALUES
+        self.rate = sample_rate(query_value)
+        self.active = self.rate > 0 and (self.rate >= 1.0 or random.random() < self.rate)
+        if self.active:
+            self.run_id += 1
+        return self.active
+
+    def span(self, name):
+        if not self.active:
+            return NULL_SPAN
+        return Span(self, name)
+
+    def record(self, entry):
+        entry = {'ts': round(time.time(), 3), 'session': self.session_id, 'run': self.run_id, **entry}
+        with self._lock:
+            self.spans.append(entry)
+            if self.log_path:
+                try:
+                    os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+                    with open(self.log_path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                except OSError:
+                    self.log_path = None
+
+    def frame(self):
+        return pd.DataFrame(list(self.spans), columns=['ts', 'session', 'run', 'name', 'ms', 'alloc_blocks', 'bytes', 'error'])
+
+    def summary(self):
+        df = self.frame()
+        if df.empty:
+            return df
+        return df.groupby('name', sort=False).agg(count=('ms', 'size'), mean_ms=('ms', 'mean'), max_ms=('ms', 'max'),
+                                                  mean_alloc_blocks=('alloc_blocks', 'mean'), total_bytes=('bytes', 'sum')).round(2)
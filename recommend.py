@@ -0,0 +1,58 @@
+import html
+
+import numpy as np
+
+import scoring
+
+# --- Recommendation Constants ---
+DEFAULT_THRESHOLD = 2.5
+DEFAULT_TOP_K = 9
+CARD_COLUMNS = 3
+# 사분면 코드 = (y < 기준) * 2 + (x < 기준)
+QUADRANTS = [
+    {'code': 0, 'label': "🌟 최고의 보석 (자료 풍부, 높은 가치)", 'badge_color': "#28a745"},
+    {'code': 1, 'label': "💡 도전적인 보석 (자료 부족, 높은 가치)", 'badge_color': "#ffc107"},
+    {'code': 2, 'label': "👍 안정적 선택 (자료 풍부, 낮은 가치)", 'badge_color': "#17a2b8"},
+    {'code': 3, 'label': "🤔 재고려 필요 (자료 부족, 낮은 가치)", 'badge_color': "#dc3545"},
+]
+
+# --- Vectorized Classification ---
+def quadrant_codes(x_values, y_values, x_threshold=DEFAULT_THRESHOLD, y_threshold=DEFAULT_THRESHOLD):
+    x_values = np.asarray(x_values, dtype=float)
+    y_values = np.asarray(y_values, dtype=float)
+    return (y_values < y_threshold).astype(np.int8) * 2 + (x_values < x_threshold).astype(np.int8)
+
+def top_k_indices(rank_values, members, k):
+    # (점수 내림차순, 원래 순서) 두 기준을 복소수 키 하나로 합침: numpy는 복소수를 실수부 -> 허수부 순으로 비교하고
+    # 원래 위치가 서로 달라 키가 겹치지 않으므로, argpartition 한 번이면 정확히 k개가 뽑히고 그 k개만 정렬하면 됨
+    if k <= 0 or len(members) == 0:
+        return members[:0]
+    keys = -rank_values[members].astype(float) + 1j * members
+    if len(members) > k:
+        candidates = np.argpartition(keys, k - 1)[:k]
+    else:
+        candidates = np.arange(len(members))
+    return members[candidates[np.argsort(keys[candidates])]]
+
+def classify(df, y_column, x_threshold=DEFAULT_THRESHOLD, y_threshold=DEFAULT_THRESHOLD, shown_per_quadrant=None, default_k=DEFAULT_TOP_K):
+    # 반환: 사분면마다 {label, badge_color, total, rows(상위 k개 DataFrame)}
+    codes = quadrant_codes(df[scoring.SCORE_COLUMN], df[y_column], x_threshold, y_threshold)
+    rank_values = df[y_column].to_numpy(dtype=float)
+    counts = np.bincount(codes, minlength=len(QUADRANTS))
+    order = np.argsort(codes, kind='stable')
+    starts = np.concatenate(([0], np.cumsum(counts)))
+    result = []
+    for quadrant in QUADRANTS:
+        code = quadrant['code']
+        members = order[starts[code]:starts[code + 1]]
+        k = (shown_per_quadrant or {}).get(code, default_k)
+        result.append({**quadrant, 'total': int(counts[code]), 'rows': df.iloc[top_k_indices(rank_values, members, k)]})
+    return result
+
+# --- Batched Card HTML ---
+def cards_html(rows, y_column, badge_color, columns=CARD_COLUMNS):
+    cards = "".join(
+        f"""<div style="margin: 0; padding: 12px; border-radius: 8px; background-color: #f8f9fa; border-left: 6px solid {badge_color}; box-shadow: 2px 2px 5px #eee;"><strong style="font-size:1.1em;">{html.escape(str(keyword))}</strong><span style="float: right; padding: 3px 10px; border-radius: 12px; background-color: {badge_color}; color: white; font-size:0.9em;">점수: {score:.2f}</span></div>"""
+        for keyword, score in zip(rows[scoring.KEYWORD_COLUMN].tolist(), rows[y_column].astype(float).tolist())
+    )
+    return f'<div style="display: grid; grid-template-columns: repeat({max(1, min(columns, len(rows)))}, minmax(0, 1fr)); gap: 8px 16px; margin: 8px 0;">{cards}</div>'
@@ -0,0 +1,305 @@
+import argparse
+import base64
+import io
+import os
+import pickle
+import queue
+import subprocess
+import sys
+import threading
+import zipfile
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+
+import export
+import recommend
+import scoring
+import skyline
+
+# --- Report Constants ---
+AVERAGE_COLUMN = '종합점수'
+# 그래프 평가 기준 선택 상자와 같은 네 가지 기준 (시트 이름은 엑셀 31자 제한 안에서 짧게)
+CRITERIA = [
+    {'assessment_type': 'average', 'label': '종합 점수 (평균)', 'y_column': AVERAGE_COLUMN, 'title_suffix': '종합 점수', 'sheet': '종합'},
+    {'assessment_type': '유레카지수', 'label': '유레카 지수 (참신성)', 'y_column': '유레카지수', 'title_suffix': '유레카 지수', 'sheet': '유레카'},
+    {'assessment_type': '덕질가능지수', 'label': '덕질 가능 지수 (흥미도)', 'y_column': '덕질가능지수', 'title_suffix': '덕질 가능 지수', 'sheet': '덕질'},
+    {'assessment_type': '성장잠재력지수', 'label': '성장 잠재력 지수 (미래성)', 'y_column': '성장잠재력지수', 'title_suffix': '성장 잠재력 지수', 'sheet': '성장잠재력'},
+]
+REPORT_FILE_STEM = "키워드_분석_보고서"
+REPORT_DPI = 150
+QUADRANT_COLUMN = '분류'
+RANK_COLUMN = '순위'
+CRITERION_SCORE_COLUMN = '평가점수'
+REPORT_FORMATS = {
+    'pdf': {'label': "PDF 보고서 (그래프 4쪽)", 'icon': "📄", 'extension': 'pdf', 'mime': 'application/pdf'},
+    'zip': {'label': "ZIP (그래프 PNG + 엑셀)", 'icon': "🗜️", 'extension': 'zip', 'mime': 'application/zip'},
+    'xlsx': {'label': "엑셀 (기준별 시트)", 'icon': "📊", 'extension': 'xlsx', 'mime': export.EXPORT_FORMATS['xlsx']['mime']},
+}
+
+# --- Per-criterion Work ---
+def plot_frame(df, criterion):
+    # 그래프 섹션과 같은 전처리: 점수 열을 숫자로 바꾸고 빈 값 제거, 종합 점수는 평균(소수 둘째 자리)
+    plot_df = df[list(scoring.TABLE_COLUMNS)].copy()
+    for column in (scoring.SCORE_COLUMN,) + scoring.INDEX_COLUMNS:
+        plot_df[column] = pd.to_numeric(plot_df[column], errors='coerce')
+    plot_df = skyline.with_frontier_levels(plot_df.dropna(subset=[scoring.SCORE_COLUMN] + list(scoring.INDEX_COLUMNS)))
+    if criterion['assessment_type'] == 'average':
+        plot_df[AVERAGE_COLUMN] = plot_df[list(scoring.INDEX_COLUMNS)].astype(float).mean(axis=1).round(2)
+    return plot_df.dropna(subset=[criterion['y_column']])
+
+def recommendation_table(plot_df, y_column, x_threshold=recommend.DEFAULT_THRESHOLD, y_threshold=recommend.DEFAULT_THRESHOLD):
+    # 사분면별 전체 키워드를 추천 순서(평가 점수 높은 순, 동점이면 입력 순)로 나열
+    parts = []
+    for quadrant in recommend.classify(plot_df, y_column, x_threshold, y_threshold, default_k=len(plot_df)):
+        rows = quadrant['rows']
+        parts.append(pd.DataFrame({
+            QUADRANT_COLUMN: quadrant['label'],
+            RANK_COLUMN: np.arange(1, len(rows) + 1),
+            scoring.KEYWORD_COLUMN: rows[scoring.KEYWORD_COLUMN].to_numpy(),
+            scoring.SCORE_COLUMN: rows[scoring.SCORE_COLUMN].to_numpy(),
+            CRITERION_SCORE_COLUMN: rows[y_column].to_numpy(),
+            skyline.LEVEL_COLUMN: rows[skyline.LEVEL_COLUMN].to_numpy(),
+        }))
+    return pd.concat(parts, ignore_index=True)
+
+def render_criterion(df, criterion, x_threshold=recommend.DEFAULT_THRESHOLD, y_threshold=recommend.DEFAULT_THRESHOLD, jitter_seed=0):
+    # 작업 프로세스에서 실행: (PNG bytes 또는 None, 추천 표)
+    import fonts
+    fonts.setup_font()
+    import chart
+
+    plot_df = plot_frame(df, criterion)
+    table = recommendation_table(plot_df, criterion['y_column'], x_threshold, y_threshold)
+    if plot_df.empty:
+        return None, table
+    return base64.b64decode(chart.render_keyword_map(plot_df, criterion['y_column'], criterion['title_suffix'], jitter_seed)), table
+
+# --- Process Pool ---
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'report_worker.py')
+WORKER_EXIT_TIMEOUT_SEC = 5
+# 작업 하나가 이 시간 안에 끝나지 않으면 작업 프로세스를 죽이고 새로 띄움 (10만 개 키워드 그래프도 수십 초 안에 끝남)
+WORKER_CALL_TIMEOUT_SEC = 180
+
+class _WorkerProcess:
+    # report_worker.py를 실행한 작업 프로세스 하나 (한 번에 한 작업만 맡김)
+    def __init__(self):
+        self.process = subprocess.Popen([sys.executable, WORKER_SCRIPT], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self.pid = None
+        self._expired = False
+
+    def wait_ready(self):
+        self.pid = self._receive()
+
+    def _receive(self):
+        try:
+            return pickle.load(self.process.stdout)
+        except (EOFError, OSError, pickle.UnpicklingError) as e:
+            raise BrokenProcessPool("렌더링 작업 프로세스가 예기치 않게 종료됐어요.") from e
+
+    def _expire(self):
+        self._expired = True
+        self.process.kill()
+
+    def call(self, fn, args, kwargs, timeout=None):
+        try:
+            self.process.stdin.write(pickle.dumps((fn, args, kwargs), pickle.HIGHEST_PROTOCOL))
+            self.process.stdin.flush()
+        except OSError as e:
+            raise BrokenProcessPool("렌더링 작업 프로세스가 예기치 않게 종료됐어요.") from e
+        # 결과를 기다리는 pickle.load에는 시간 제한이 없으므로, 시간이 지나면 프로세스를 죽여서 읽기를 끝냄
+        timer = None
+        if timeout is not None:
+            timer = threading.Timer(timeout, self._expire)
+            timer.daemon = True
+            timer.start()
+        try:
+            ok, value = self._receive()
+        except BrokenProcessPool:
+            if self._expired:
+                raise TimeoutError(f"렌더링 작업이 {timeout}초 안에 끝나지 않았어요.") from None
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+        if not ok:
+            raise value
+        return value
+
+    def close(self):
+        try:
+            self.process.stdin.close()
+            self.process.wait(WORKER_EXIT_TIMEOUT_SEC)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        self.process.stdout.close()
+
+class WorkerPool(Executor):
+    # 작업 프로세스마다 전달 스레드 하나를 두고, 스레드는 쉬고 있는 프로세스에 작업을 넘기고 결과를 기다림
+    def __init__(self, max_workers, call_timeout=WORKER_CALL_TIMEOUT_SEC):
+        self.call_timeout = call_timeout
+        self._closed = False
+        self._lock = threading.Lock()
+        self._workers = [_WorkerProcess() for _ in range(max_workers)]
+        try:
+            for worker in self._workers:
+                worker.wait_ready()
+        except BrokenProcessPool:
+            self._close_workers()
+            raise
+        self._idle = queue.SimpleQueue()
+        for worker in self._workers:
+            self._idle.put(worker)
+        self._threads = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='report-worker')
+
+    @property
+    def pids(self):
+        with self._lock:
+            return [worker.pid for worker in self._workers]
+
+    def _respawn(self, worker):
+        # 죽었거나 시간 안에 끝내지 못한 프로세스를 정리하고 새 프로세스로 바꿈 (풀을 닫는 중이면 바꾸지 않음)
+        worker.close()
+        with self._lock:
+            if self._closed:
+                return worker
+            replacement = _WorkerProcess()
+            self._workers[self._workers.index(worker)] = replacement
+        try:
+            replacement.wait_ready()
+        except BrokenProcessPool:
+            # 새 프로세스도 바로 죽었으면 다음 작업에서 다시 바꿈
+            pass
+        return replacement
+
+    def _run(self, fn, args, kwargs):
+        worker = self._idle.get()
+        try:
+            return worker.call(fn, args, kwargs, self.call_timeout)
+        except (BrokenProcessPool, TimeoutError):
+            worker = self._respawn(worker)
+            raise
+        finally:
+            self._idle.put(worker)
+
+    def submit(self, fn, /, *args, **kwargs):
+        return self._threads.submit(self._run, fn, args, kwargs)
+
+    def _close_workers(self):
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+        for worker in workers:
+            worker.close()
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        self._threads.shutdown(wait=wait, cancel_futures=cancel_futures)
+        self._close_workers()
+
+class ReportRenderer:
+    # matplotlib 렌더링은 CPU를 쓰고 GIL을 잡으므로 기준마다 별도 프로세스에서 그림 (풀은 한 번 만들어 재사용)
+    def __init__(self, max_workers=None, call_timeout=WORKER_CALL_TIMEOUT_SEC):
+        self.max_workers = max_workers or max(1, min(len(CRITERIA), os.cpu_count() or 1))
+        self.call_timeout = call_timeout
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                # 작업 프로세스는 report_worker.py로 띄우므로 Streamlit 앱 스크립트(__main__)를 다시 실행하지 않음
+                self._executor = WorkerPool(self.max_workers, self.call_timeout)
+            return self._executor
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+    def render(self, df, x_threshold=recommend.DEFAULT_THRESHOLD, y_threshold=recommend.DEFAULT_THRESHOLD, jitter_seed=0, on_progress=None):
+        # 반환: CRITERIA 순서의 [(기준, PNG bytes 또는 None, 추천 표)]
+        # 작업 프로세스가 죽거나 시간을 넘기면 BrokenProcessPool/TimeoutError가 그대로 올라가고, 풀은 그 프로세스만 새로 띄움
+        df = df[list(scoring.TABLE_COLUMNS)]
+        futures = {self.executor().submit(render_criterion, df, criterion, x_threshold, y_threshold, jitter_seed): i for i, criterion in enumerate(CRITERIA)}
+        results = [None] * len(CRITERIA)
+        for done, future in enumerate(as_completed(futures), start=1):
+            png, table = future.result()
+            results[futures[future]] = (CRITERIA[futures[future]], png, table)
+            if on_progress is not None:
+                on_progress(done, len(CRITERIA))
+        return results
+
+# --- Bundles ---
+def build_pdf(results, dpi=REPORT_DPI):
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    output = io.BytesIO()
+    with PdfPages(output) as pdf:
+        for criterion, png, _ in results:
+            if png is None:
+                continue
+            image = plt.imread(io.BytesIO(png), format='png')
+            fig = plt.figure(figsize=(image.shape[1] / dpi, image.shape[0] / dpi), dpi=dpi)
+            fig.figimage(image)
+            pdf.savefig(fig, dpi=dpi)
+            plt.close(fig)
+        pdf.infodict()['Title'] = REPORT_FILE_STEM
+    return output.getvalue()
+
+def build_xlsx(results):
+    return export.to_xlsx_sheets_bytes({criterion['sheet']: table for criterion, _, table in results})
+
+def build_zip(results, xlsx_bytes=None):
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w') as archive:
+        for position, (criterion, png, _) in enumerate(results, start=1):
+            if png is not None:
+                # PNG는 이미 압축되어 있으므로 그대로 저장
+                archive.writestr(f"{position}_{criterion['sheet']}.png", png, compress_type=zipfile.ZIP_STORED)
+        archive.writestr(f"{REPORT_FILE_STEM}.xlsx", xlsx_bytes if xlsx_bytes is not None else build_xlsx(results), compress_type=zipfile.ZIP_STORED)
+    return output.getvalue()
+
+def build_report(df, renderer, x_threshold=recommend.DEFAULT_THRESHOLD, y_threshold=recommend.DEFAULT_THRESHOLD, jitter_seed=0, on_progress=None):
+    # 반환: {'pdf': bytes, 'zip': bytes, 'xlsx': bytes}
+    results = renderer.render(df, x_threshold, y_threshold, jitter_seed, on_progress)
+    xlsx_bytes = build_xlsx(results)
+    return {'pdf': build_pdf(results), 'zip': build_zip(results, xlsx_bytes), 'xlsx': xlsx_bytes}
+
+def report_file_name(fmt, stem=REPORT_FILE_STEM):
+    return f"{stem}.{REPORT_FORMATS[fmt]['extension']}"
+
+# --- Command Line Entry Point ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="키워드 목록 CSV로 네 가지 평가 기준의 그래프와 추천 표 보고서를 만듭니다.")
+    parser.add_argument('input', help="'키워드', '데이터가용성점수', 지수 열이 있는 CSV (앱에서 내보낸 파일)")
+    parser.add_argument('-o', '--output-dir', default='.', help="보고서를 저장할 폴더")
+    parser.add_argument('--workers', type=int, default=None, help="렌더링 프로세스 수 (기본값: CPU 수, 최대 4)")
+    parser.add_argument('--x-threshold', type=float, default=recommend.DEFAULT_THRESHOLD, help="데이터 가용성 기준선")
+    parser.add_argument('--y-threshold', type=float, default=recommend.DEFAULT_THRESHOLD, help="평가 점수 기준선")
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.input, encoding='utf-8-sig')
+    missing = [column for column in scoring.TABLE_COLUMNS if column not in df.columns]
+    if missing:
+        parser.error(f"입력 파일에 {', '.join(missing)} 열이 없어요.")
+    renderer = ReportRenderer(args.workers)
+    try:
+        bundle = build_report(df, renderer, args.x_threshold, args.y_threshold,
+                              on_progress=lambda done, total: print(f"{done}/{total} 기준 완료", file=sys.stderr))
+    finally:
+        renderer.shutdown()
+    os.makedirs(args.output_dir, exist_ok=True)
+    for fmt, data in bundle.items():
+        path = os.path.join(args.output_dir, report_file_name(fmt))
+        with open(path, 'wb') as f:
+            f.write(data)
+        print(path)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,40 @@
+import os
+import pickle
+import sys
+
+# ReportRenderer가 띄우는 렌더링 작업 프로세스의 진입점.
+# multiprocessing의 spawn은 부모의 __main__(Streamlit 앱 스크립트)을 작업 프로세스에서 다시 실행하므로,
+# 작업 프로세스는 이 스크립트로 따로 띄우고 표준 입력/출력으로 (함수, 인자)와 결과를 pickle로 주고받는다.
+
+# --- Worker Loop ---
+def _send(responses, message):
+    # 직렬화가 끝난 뒤에 쓰므로, pickle 실패 때 반쯤 쓴 응답이 남지 않음
+    data = pickle.dumps(message, pickle.HIGHEST_PROTOCOL)
+    responses.write(data)
+    responses.flush()
+
+def serve(requests, responses):
+    # 준비가 끝났음을 알리려고 먼저 PID를 보냄
+    _send(responses, os.getpid())
+    while True:
+        try:
+            fn, args, kwargs = pickle.load(requests)
+        except EOFError:
+            return 0
+        try:
+            message = (True, fn(*args, **kwargs))
+        except Exception as e:
+            message = (False, e)
+        try:
+            _send(responses, message)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            _send(responses, (False, RuntimeError(f"작업 결과를 부모 프로세스로 보내지 못했어요: {e}")))
+
+def main():
+    # 결과는 원래의 표준 출력으로만 보내고, 작업 중 print 같은 출력은 표준 오류로 돌림
+    responses = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    return serve(sys.stdin.buffer, responses)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import numpy as np
+
+import scoring
+
+# --- Rescoring Constants ---
+COMPACT_MIN_DELETED = 64
+SCORE_LEVELS = len(scoring.SCORE_THRESHOLDS) + 1
+
+# --- Raw Site Count Matrix ---
+# 키워드 x 사이트 id 원본 검색 결과 수. 행 버퍼는 두 배씩 늘려서 추가가 amortized O(1),
+# 사이트 열은 처음 보는 id가 들어올 때 붙인다 (삭제된 사이트 열은 lookup에서 고르지 않으면 그만).
+class SiteCountMatrix:
+    def __init__(self):
+        self.site_ids = []
+        self.version = 0
+        self._site_index = {}
+        self._rows = {}
+        self._values = np.zeros((0, 0))
+        self._size = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, keyword):
+        return keyword in self._rows
+
+    @classmethod
+    def from_frame(cls, counts_df):
+        # counts_df: KeywordLibrary.load_counts() 결과 (index 키워드, 열 사이트 id)
+        matrix = cls()
+        if counts_df is not None and not counts_df.empty:
+            matrix.extend(counts_df.index.tolist(), {site_id: counts_df[site_id].to_numpy() for site_id in counts_df.columns})
+        return matrix
+
+    def _site_column(self, site_id):
+        column = self._site_index.get(site_id)
+        if column is None:
+            column = self._site_index[site_id] = len(self.site_ids)
+            self.site_ids.append(site_id)
+            self._values = np.hstack([self._values, np.zeros((self._values.shape[0], 1))])
+        return column
+
+    def _reserve(self, extra):
+        needed = self._size + extra
+        if needed > self._values.shape[0]:
+            grown = np.zeros((max(needed, self._values.shape[0] * 2, 64), self._values.shape[1]))
+            grown[:self._size] = self._values[:self._size]
+            self._values = grown
+
+    def set(self, keyword, site_counts):
+        self.extend([keyword], {site_id: [count] for site_id, count in site_counts.items()})
+
+    def extend(self, keywords, site_counts):
+        # site_counts: {사이트 id: keywords와 같은 길이의 배열}. 이미 있는 키워드는 덮어쓴다.
+        keywords = list(keywords)
+        columns = [self._site_column(site_id) for site_id in site_counts]
+        new_keywords = [k for k in dict.fromkeys(keywords) if k not in self._rows]
+        self._reserve(len(new_keywords))
+        self._rows.update(zip(new_keywords, range(self._size, self._size + len(new_keywords))))
+        self._size += len(new_keywords)
+        rows = np.fromiter((self._rows[k] for k in keywords), dtype=np.intp, count=len(keywords))
+        self._values[rows] = 0.0
+        for column, values in zip(columns, site_counts.values()):
+            self._values[rows, column] = np.asarray(values, dtype=float)
+        self.version += 1
+
+    def remove(self, keyword):
+        if self._rows.pop(keyword, None) is None:
+            return False
+        deleted = self._size - len(self._rows)
+        if deleted >= COMPACT_MIN_DELETED and deleted * 2 > self._size:
+            live_rows = np.fromiter(self._rows.values(), dtype=np.intp, count=len(self._rows))
+            self._values = self._values[live_rows].copy()
+            self._rows = dict(zip(self._rows.keys(), range(len(live_rows))))
+            self._size = len(live_rows)
+        self.version += 1
+        return True
+
+    def lookup(self, keywords, site_ids):
+        # 반환: (len(keywords) x len(site_ids) 검색 결과 수, 원본 수가 저장된 키워드 여부)
+        rows = np.fromiter((self._rows.get(k, -1) for k in keywords), dtype=np.intp, count=len(keywords))
+        known = rows >= 0
+        counts = np.zeros((len(rows), len(site_ids)))
+        for j, site_id in enumerate(site_ids):
+            column = self._site_index.get(site_id)
+            if column is not None:
+                counts[known, j] = self._values[rows[known], column]
+        return counts, known
+
+# --- What-if Rescoring ---
+class WhatIfScorer:
+    # 마지막 계산의 사이트별 기여도를 기억해 두고, 가중치가 바뀐 사이트 열만 다시 곱한다.
+    # 기준선(50/200/500)만 바뀌면 가중치 합계는 그대로 두고 구간 나누기만 다시 한다.
+    def __init__(self, top_n=scoring.TOP_N_SITES):
+        self.top_n = top_n
+        self._key = None
+        self._counts = self._known = None
+        self._weights = self._contributions = self._weighted_sum = None
+
+    def weighted_sums(self, keywords, version, count_matrix, site_ids, weights):
+        key = (version, count_matrix.version, tuple(site_ids))
+        if key != self._key:
+            self._key = key
+            self._counts, self._known = count_matrix.lookup(keywords, site_ids)
+            self._weights = None
+        weights = np.asarray(weights, dtype=float)
+        if self._weights is None:
+            self._contributions = scoring.weighted_contributions(self._counts, weights)
+            self._weighted_sum = scoring.top_n_sum(self._contributions, self.top_n)
+        else:
+            changed = np.flatnonzero(self._weights != weights)
+            if len(changed):
+                self._contributions[:, changed] = scoring.weighted_contributions(self._counts[:, changed], weights[changed])
+                self._weighted_sum = scoring.top_n_sum(self._contributions, self.top_n)
+        self._weights = weights.copy()
+        return self._weighted_sum, self._known
+
+    def rescore(self, df, version, count_matrix, site_ids, weights, thresholds=scoring.SCORE_THRESHOLDS):
+        # 반환: 새 점수 배열 (원본 검색 결과 수가 없는 예전 키워드는 기존 점수 유지)
+        weighted_sum, known = self.weighted_sums(df[scoring.KEYWORD_COLUMN].tolist(), version, count_matrix, site_ids, weights)
+        new_scores = df[scoring.SCORE_COLUMN].to_numpy(dtype=int).copy()
+        new_scores[known] = scoring.bin_scores(weighted_sum[known], thresholds)
+        return new_scores
+
+def score_changes(old_scores, new_scores, levels=SCORE_LEVELS):
+    # 반환: 바뀐 행 위치, 올라간/내려간 수, (이전 점수 x 새 점수) 건수 표
+    old_scores = np.asarray(old_scores, dtype=int)
+    new_scores = np.asarray(new_scores, dtype=int)
+    changed = np.flatnonzero(old_scores != new_scores)
+    transitions = np.bincount((old_scores - 1) * levels + (new_scores - 1), minlength=levels * levels).reshape(levels, levels)
+    return {'changed': changed, 'up': int((new_scores > old_scores).sum()), 'down': int((new_scores < old_scores).sum()), 'transitions': transitions}
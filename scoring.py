@@ -0,0 +1,98 @@
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+# --- Scoring Constants ---
+DEFAULT_SITE_WEIGHTS = {'DBpia': 2.0, 'BIGKINDS': 1.0, '교보문고': 1.0}
+SCORE_THRESHOLDS = (50, 200, 500)
+TOP_N_SITES = 3
+KEYWORD_COLUMN = '키워드'
+WEIGHTED_SUM_COLUMN = '가중치합계'
+SCORE_COLUMN = '데이터가용성점수'
+INDEX_COLUMNS = ('유레카지수', '덕질가능지수', '성장잠재력지수')
+TABLE_COLUMNS = (KEYWORD_COLUMN, SCORE_COLUMN) + INDEX_COLUMNS
+
+# --- Vectorized Scoring ---
+def weighted_contributions(counts, weights):
+    # counts: (N keywords x M sites), weights: (M,). 검색 결과가 0 이하인 사이트는 기여도 0.
+    counts = np.atleast_2d(np.asarray(counts, dtype=float))
+    weights = np.asarray(weights, dtype=float)
+    return np.where(counts > 0, counts * weights, 0.0)
+
+def top_n_sum(contributions, top_n=TOP_N_SITES):
+    if contributions.shape[1] == 0:
+        return np.zeros(contributions.shape[0])
+    top = -np.sort(-contributions, axis=1)[:, :top_n]
+    # 기존 sum()과 같은 순서(큰 값부터)로 더해서 경계값(50/200/500)에서도 결과가 같게 유지
+    weighted_sum = np.zeros(contributions.shape[0])
+    for j in range(top.shape[1]):
+        weighted_sum += top[:, j]
+    return weighted_sum
+
+def bin_scores(weighted_sum, thresholds=SCORE_THRESHOLDS):
+    return np.searchsorted(np.asarray(thresholds, dtype=float), np.asarray(weighted_sum, dtype=float), side='right') + 1
+
+def score_matrix(counts, weights, thresholds=SCORE_THRESHOLDS, top_n=TOP_N_SITES):
+    contributions = weighted_contributions(counts, weights)
+    weighted_sum = top_n_sum(contributions, top_n)
+    return contributions, weighted_sum, bin_scores(weighted_sum, thresholds)
+
+def top_site_indices(contribution_row, top_n=TOP_N_SITES):
+    # 동점이면 사이트 설정 순서를 유지 (sorted()의 안정 정렬과 동일)
+    order = np.argsort(-contribution_row, kind='stable')
+    return [int(i) for i in order[:top_n] if contribution_row[i] > 0]
+
+def score_site_configs(site_configs, thresholds=SCORE_THRESHOLDS):
+    # 앱에서 키워드 하나의 사이트별 입력(user_count, weight)으로 점수를 계산할 때 쓰는 경로
+    counts = [int(site_config.get('user_count', 0)) for site_config in site_configs]
+    weights = [float(site_config.get('weight', 1.0)) for site_config in site_configs]
+    raw_counts_summary = {site_config['name']: {'count': count, 'weight': weight} for site_config, count, weight in zip(site_configs, counts, weights)}
+    contributions, weighted_sums, scores = score_matrix([counts], weights, thresholds)
+    top_sites_for_score = [{'name': site_configs[i]['name'], 'contribution': float(contributions[0, i]), 'raw_count': counts[i], 'weight': weights[i]} for i in top_site_indices(contributions[0])]
+    return int(scores[0]), float(weighted_sums[0]), raw_counts_summary, top_sites_for_score
+
+def score_frame(df, site_weights, thresholds=SCORE_THRESHOLDS, top_n=TOP_N_SITES):
+    site_names = list(site_weights.keys())
+    counts = df.reindex(columns=site_names).apply(pd.to_numeric, errors='coerce').fillna(0).to_numpy(dtype=float)
+    _, weighted_sum, scores = score_matrix(counts, [site_weights[name] for name in site_names], thresholds, top_n)
+    scored = df.copy()
+    scored[WEIGHTED_SUM_COLUMN] = weighted_sum
+    scored[SCORE_COLUMN] = scores
+    return scored
+
+# --- Command Line Entry Point ---
+def parse_weights(weight_args):
+    site_weights = {}
+    for item in weight_args:
+        name, sep, value = item.rpartition('=')
+        if not sep or not name:
+            raise argparse.ArgumentTypeError(f"가중치는 '사이트=값' 형식이어야 해요: {item}")
+        site_weights[name] = float(value)
+    return site_weights
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="키워드 x 사이트 검색 결과 수 CSV에서 데이터 가용성 점수를 한 번에 계산합니다.")
+    parser.add_argument('input', help="입력 CSV ('키워드' 열 + 사이트별 검색 결과 수 열), '-'이면 표준 입력")
+    parser.add_argument('-o', '--output', default='-', help="출력 CSV 경로 (기본값: 표준 출력)")
+    parser.add_argument('-w', '--weight', action='append', default=[], metavar='SITE=WEIGHT', help="사이트별 가중치 (여러 번 지정 가능)")
+    parser.add_argument('--thresholds', nargs=3, type=float, default=list(SCORE_THRESHOLDS), metavar=('T2', 'T3', 'T4'))
+    parser.add_argument('--top', type=int, default=TOP_N_SITES, help="점수에 반영할 상위 사이트 수")
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(sys.stdin if args.input == '-' else args.input, encoding='utf-8-sig')
+    if KEYWORD_COLUMN not in df.columns:
+        parser.error(f"입력 파일에 '{KEYWORD_COLUMN}' 열이 없어요.")
+    try:
+        explicit_weights = parse_weights(args.weight)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    site_columns = [c for c in df.columns if c not in TABLE_COLUMNS and c != WEIGHTED_SUM_COLUMN]
+    site_weights = {c: explicit_weights.get(c, DEFAULT_SITE_WEIGHTS.get(c, 1.0)) for c in site_columns}
+    scored = score_frame(df, site_weights, tuple(args.thresholds), args.top)
+    scored.to_csv(sys.stdout if args.output == '-' else args.output, index=False, encoding='utf-8-sig')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,284 @@
+import abc
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import sqlite3
+import sys
+import threading
+import time
+import urllib.parse
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+import scoring
+
+# --- Fetch Constants ---
+DEFAULT_CACHE_PATH = os.environ.get('KEYWORD_FETCH_CACHE_PATH', os.path.join(os.path.expanduser('~'), '.cache', 'keyword-eval-app', 'search_count_cache.sqlite3'))
+DEFAULT_CACHE_TTL_SEC = 7 * 24 * 3600
+DEFAULT_RATE_PER_SEC = 2.0
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT_SEC = 10.0
+MAX_RETRIES = 3
+BACKOFF_BASE_SEC = 0.5
+# 서버가 Retry-After로 아주 긴 시간을 요구해도 한 번에 이보다 오래 기다리지 않음
+MAX_BACKOFF_SEC = 30.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+USER_AGENT = "keyword-eval-app/1.0 (+search count collector)"
+
+class FetchError(Exception):
+    pass
+
+# --- Site Adapters ---
+class SiteAdapter(abc.ABC):
+    # 사이트 하나에 대한 "키워드 -> 검색 결과 수" 규칙. 새 사이트 형식은 이 클래스를 상속해서 parse_count를 구현한다.
+    def __init__(self, name, search_url, rate_per_sec=DEFAULT_RATE_PER_SEC, concurrency=DEFAULT_CONCURRENCY, timeout_sec=DEFAULT_TIMEOUT_SEC):
+        if '{query}' not in search_url:
+            raise ValueError(f"'{name}' 검색 URL에 {{query}} 자리표시자가 없어요.")
+        self.name = name
+        self.search_url = search_url
+        self.rate_per_sec = rate_per_sec
+        self.concurrency = concurrency
+        self.timeout_sec = timeout_sec
+        self._session = None
+
+    @property
+    def cache_key(self):
+        # 주소/패턴이 바뀌면 예전 캐시를 쓰지 않도록 설정 전체로 키를 만든다
+        return hashlib.blake2b(json.dumps([type(self).__name__, self.search_url, self.describe()], ensure_ascii=False).encode('utf-8'), digest_size=12).hexdigest()
+
+    def describe(self):
+        return ""
+
+    def build_url(self, keyword):
+        return self.search_url.replace('{query}', urllib.parse.quote(keyword))
+
+    def session(self):
+        # 사이트마다 keep-alive 연결 풀 하나
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.headers['User-Agent'] = USER_AGENT
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, self.concurrency))
+            self._session.mount('http://', adapter)
+            self._session.mount('https://', adapter)
+        return self._session
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    @abc.abstractmethod
+    def parse_count(self, response):
+        pass
+
+class RegexCountAdapter(SiteAdapter):
+    # 검색 결과 페이지에서 정규식 첫 번째 그룹(숫자, 쉼표 허용)을 결과 수로 사용
+    def __init__(self, name, search_url, count_pattern, **kwargs):
+        super().__init__(name, search_url, **kwargs)
+        self.count_pattern = re.compile(count_pattern)
+
+    def describe(self):
+        return self.count_pattern.pattern
+
+    def parse_count(self, response):
+        match = self.count_pattern.search(response.text)
+        if not match:
+            raise FetchError(f"'{self.name}' 응답에서 검색 결과 수를 찾지 못했어요.")
+        return int(re.sub(r'[^0-9]', '', match.group(1)) or 0)
+
+class JsonCountAdapter(SiteAdapter):
+    # JSON 응답에서 점(.)으로 구분된 경로의 값을 결과 수로 사용 (예: "data.total")
+    def __init__(self, name, search_url, json_path, **kwargs):
+        super().__init__(name, search_url, **kwargs)
+        self.json_path = json_path
+
+    def describe(self):
+        return self.json_path
+
+    def parse_count(self, response):
+        value = response.json()
+        for part in self.json_path.split('.'):
+            value = value[int(part)] if isinstance(value, list) else value[part]
+        return int(value)
+
+def adapter_from_site_config(site_config, **kwargs):
+    # site_configs 항목에 'search_url'과 'count_pattern'(정규식) 또는 'json:경로'가 있어야 자동 수집 대상
+    search_url = (site_config.get('search_url') or '').strip()
+    count_pattern = (site_config.get('count_pattern') or '').strip()
+    if not search_url or not count_pattern:
+        return None
+    if count_pattern.startswith('json:'):
+        return JsonCountAdapter(site_config['name'], search_url, count_pattern[len('json:'):], **kwargs)
+    return RegexCountAdapter(site_config['name'], search_url, count_pattern, **kwargs)
+
+# --- TTL Disk Cache ---
+class CountCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl_sec=DEFAULT_CACHE_TTL_SEC):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS search_counts (site_key TEXT NOT NULL, keyword TEXT NOT NULL, count INTEGER NOT NULL, fetched_at REAL NOT NULL, PRIMARY KEY (site_key, keyword))")
+
+    def get_many(self, site_key, keywords):
+        cutoff = time.time() - self.ttl_sec
+        found = {}
+        keywords = list(keywords)
+        with self._lock:
+            for start in range(0, len(keywords), 500):
+                batch = keywords[start:start + 500]
+                rows = self._conn.execute(f"SELECT keyword, count FROM search_counts WHERE site_key = ? AND fetched_at >= ? AND keyword IN ({','.join('?' * len(batch))})",
+                                          [site_key, cutoff] + batch).fetchall()
+                found.update(rows)
+        return found
+
+    def put_many(self, site_key, counts):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO search_counts (site_key, keyword, count, fetched_at) VALUES (?, ?, ?, ?)",
+                                   [(site_key, keyword, int(count), now) for keyword, count in counts.items()])
+
+    def purge_expired(self):
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM search_counts WHERE fetched_at < ?", (time.time() - self.ttl_sec,)).rowcount
+
+# --- Async Fetching ---
+class AsyncRateLimiter:
+    # 토큰 버킷: 초당 rate개, 최대 burst개까지 몰아서 허용
+    def __init__(self, rate_per_sec, burst=1):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+        self.burst = max(1, burst)
+        self._next_time = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            start = max(self._next_time, now - self.interval * (self.burst - 1))
+            self._next_time = start + self.interval
+            delay = start - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+def _retry_delay(attempt, response=None):
+    if response is not None and response.headers.get('Retry-After', '').isdigit():
+        delay = float(response.headers['Retry-After'])
+    else:
+        delay = BACKOFF_BASE_SEC * (2 ** attempt) * (0.5 + random.random())
+    return min(delay, MAX_BACKOFF_SEC)
+
+async def fetch_one(adapter, keyword, limiter, semaphore, max_retries=MAX_RETRIES):
+    last_error = None
+    for attempt in range(max_retries + 1):
+        await limiter.acquire()
+        response = None
+        try:
+            async with semaphore:
+                # requests는 블로킹 클라이언트라 요청마다 이벤트 루프의 기본 스레드 풀에서 스레드 하나를 씀
+                # (동시 요청은 사이트별 concurrency와 기본 스레드 풀 크기 min(32, CPU 수 + 4) 중 작은 쪽까지)
+                response = await asyncio.to_thread(adapter.session().get, adapter.build_url(keyword), timeout=adapter.timeout_sec)
+            if response.status_code in RETRY_STATUS:
+                last_error = FetchError(f"HTTP {response.status_code}")
+            else:
+                response.raise_for_status()
+                return adapter.parse_count(response)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            last_error = e
+        except (requests.HTTPError, FetchError, ValueError, KeyError, IndexError, TypeError) as e:
+            raise FetchError(f"'{adapter.name}' / '{keyword}': {e}") from e
+        if attempt < max_retries:
+            await asyncio.sleep(_retry_delay(attempt, response))
+    raise FetchError(f"'{adapter.name}' / '{keyword}': {last_error}")
+
+async def fetch_counts_async(keywords, adapters, cache=None, on_progress=None, max_retries=MAX_RETRIES):
+    keywords = list(dict.fromkeys(keywords))
+    results = {adapter.name: {} for adapter in adapters}
+    errors = []
+    jobs = []
+    for adapter in adapters:
+        cached = cache.get_many(adapter.cache_key, keywords) if cache is not None else {}
+        results[adapter.name].update(cached)
+        limiter = AsyncRateLimiter(adapter.rate_per_sec, burst=adapter.concurrency)
+        semaphore = asyncio.Semaphore(adapter.concurrency)
+        jobs.extend((adapter, keyword, limiter, semaphore) for keyword in keywords if keyword not in cached)
+
+    async def run(adapter, keyword, limiter, semaphore):
+        try:
+            return adapter, keyword, await fetch_one(adapter, keyword, limiter, semaphore, max_retries), None
+        except FetchError as e:
+            return adapter, keyword, None, str(e)
+
+    fresh = {adapter.name: {} for adapter in adapters}
+    done = 0
+    for finished in asyncio.as_completed([run(*job) for job in jobs]):
+        adapter, keyword, count, error = await finished
+        if error is None:
+            results[adapter.name][keyword] = count
+            fresh[adapter.name][keyword] = count
+        else:
+            errors.append(error)
+        done += 1
+        if on_progress is not None:
+            on_progress(done, len(jobs))
+    if cache is not None:
+        for adapter in adapters:
+            if fresh[adapter.name]:
+                cache.put_many(adapter.cache_key, fresh[adapter.name])
+    return results, errors
+
+def fetch_counts(keywords, adapters, cache=None, on_progress=None, max_retries=MAX_RETRIES):
+    # 반환: (키워드 x 사이트 이름 DataFrame - 실패한 칸은 NaN, 오류 메시지 목록)
+    try:
+        results, errors = asyncio.run(fetch_counts_async(keywords, adapters, cache, on_progress, max_retries))
+    finally:
+        for adapter in adapters:
+            adapter.close()
+    keywords = list(dict.fromkeys(keywords))
+    df = pd.DataFrame({adapter.name: [results[adapter.name].get(k) for k in keywords] for adapter in adapters}, index=pd.Index(keywords, name=scoring.KEYWORD_COLUMN))
+    return df.astype('Int64').reset_index(), errors
+
+# --- Command Line Entry Point ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="키워드 목록의 사이트별 검색 결과 수를 동시에 수집합니다.")
+    parser.add_argument('input', help="키워드 CSV ('키워드' 열) 또는 한 줄에 하나씩 쓴 텍스트 파일")
+    parser.add_argument('-o', '--output', default='-', help="출력 CSV 경로 (기본값: 표준 출력)")
+    parser.add_argument('-s', '--site', action='append', default=[], metavar='NAME|URL|PATTERN', help="수집할 사이트 ('이름|{query}가 들어간 URL|정규식 또는 json:경로')")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE_PER_SEC, help="사이트별 초당 요청 수")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help="사이트별 동시 요청 수")
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, help="결과 캐시 파일 (':memory:'이면 저장 안 함)")
+    parser.add_argument('--ttl', type=float, default=DEFAULT_CACHE_TTL_SEC, help="캐시 유효 시간(초)")
+    args = parser.parse_args(argv)
+    if not args.site:
+        parser.error("--site 설정이 필요해요.")
+
+    if args.input.lower().endswith('.csv'):
+        keywords = pd.read_csv(args.input, encoding='utf-8-sig')[scoring.KEYWORD_COLUMN].astype(str).str.strip().tolist()
+    else:
+        with open(args.input, encoding='utf-8-sig') as f:
+            keywords = [line.strip() for line in f]
+    keywords = [k for k in keywords if k]
+    adapters = []
+    for site_arg in args.site:
+        parts = site_arg.split('|', 2)
+        if len(parts) != 3:
+            parser.error(f"사이트 설정은 '이름|URL|패턴' 형식이어야 해요: {site_arg}")
+        adapters.append(adapter_from_site_config({'name': parts[0], 'search_url': parts[1], 'count_pattern': parts[2]}, rate_per_sec=args.rate, concurrency=args.concurrency))
+    counts, errors = fetch_counts(keywords, adapters, CountCache(args.cache, args.ttl))
+    for error in errors:
+        print(error, file=sys.stderr)
+    counts.to_csv(sys.stdout if args.output == '-' else args.output, index=False, encoding='utf-8-sig')
+    return 1 if errors else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+import scoring
+
+# --- Skyline Constants ---
+# 네 가지 점수 모두 클수록 좋음. 단계 1 = 어떤 키워드에도 지배되지 않는 파레토 최전선,
+# 단계 k = 단계 1~k-1을 빼고 남은 키워드 중의 최전선
+SKYLINE_COLUMNS = (scoring.SCORE_COLUMN,) + scoring.INDEX_COLUMNS
+LEVEL_COLUMN = '최전선단계'
+FRONTIER_LEVEL = 1
+_INITIAL_LEVEL_CAPACITY = 16
+
+# --- Layered Pareto Frontier ---
+def frontier_levels(values):
+    # values: (N x D), 클수록 좋음. 반환: 행마다 최전선 단계 (1부터)
+    # 같은 점수 조합은 한 번만 계산하고(점수가 1~4 정수라 조합은 최대 256개), 사전식 내림차순으로 정렬하면
+    # 나를 지배하는 점은 항상 먼저 처리된다. 단계는 "k단계의 누군가에게 지배되면 1~k-1단계에도 지배자가 있다"는
+    # 단조성이 있어서, 각 점의 단계를 이진 탐색으로 찾는다 (Efficient Non-dominated Sort, binary search).
+    values = np.asarray(values, dtype=float)
+    if values.ndim != 2 or len(values) == 0:
+        return np.zeros(len(values), dtype=np.int64)
+    order = np.lexsort(-values.T[::-1])
+    sorted_values = values[order]
+    is_first = np.empty(len(values), dtype=bool)
+    is_first[0] = True
+    np.any(sorted_values[1:] != sorted_values[:-1], axis=1, out=is_first[1:])
+    unique = sorted_values[is_first]
+    unique_levels = np.empty(len(unique), dtype=np.int64)
+    buffers, sizes = [], []
+    for index, point in enumerate(unique):
+        low, high = 0, len(buffers)
+        while low < high:
+            middle = (low + high) // 2
+            # 서로 다른 점이므로 모든 차원에서 크거나 같으면 곧 지배
+            if np.all(buffers[middle][:sizes[middle]] >= point, axis=1).any():
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(buffers):
+            buffers.append(np.empty((_INITIAL_LEVEL_CAPACITY, unique.shape[1])))
+            sizes.append(0)
+        if sizes[low] == len(buffers[low]):
+            buffers[low] = np.concatenate([buffers[low], np.empty_like(buffers[low])])
+        buffers[low][sizes[low]] = point
+        sizes[low] += 1
+        unique_levels[index] = low + 1
+    levels = np.empty(len(values), dtype=np.int64)
+    levels[order] = unique_levels[np.cumsum(is_first) - 1]
+    return levels
+
+def with_frontier_levels(df, columns=SKYLINE_COLUMNS):
+    # 점수 열이 숫자가 아닌 행은 단계 없음(NaN)
+    values = df[list(columns)].apply(pd.to_numeric, errors='coerce')
+    valid = values.notna().all(axis=1).to_numpy()
+    levels = np.full(len(df), np.nan)
+    levels[valid] = frontier_levels(values.to_numpy(dtype=float)[valid])
+    result = df.copy()
+    result[LEVEL_COLUMN] = pd.array(levels, dtype='Int64') if not valid.all() else levels.astype(np.int64)
+    return result
+
+def frontier_ranking(df, level_column=LEVEL_COLUMN, columns=SKYLINE_COLUMNS):
+    # 단계 오름차순, 같은 단계 안에서는 네 점수 합계 내림차순 (동점이면 입력 순서)
+    totals = df[list(columns)].apply(pd.to_numeric, errors='coerce').sum(axis=1).to_numpy(dtype=float)
+    levels = df[level_column].to_numpy(dtype=float, na_value=np.inf)
+    return np.lexsort((np.arange(len(df)), -totals, levels))
+
+def level_counts(levels, max_levels=None):
+    # 반환: {단계: 키워드 수} (단계 오름차순)
+    levels = pd.Series(levels).dropna().astype(np.int64)
+    counts = levels.value_counts().sort_index()
+    if max_levels is not None:
+        counts = counts.iloc[:max_levels]
+    return {int(level): int(count) for level, count in counts.items()}
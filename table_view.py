@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+import scoring
+
+# --- Table Constants ---
+# ColorBrewer YlGnBu (matplotlib 'YlGnBu'와 같은 기준색) - 표 색칠에 matplotlib을 불러오지 않기 위해 직접 보간
+YLGNBU_STOPS = ['#ffffd9', '#edf8b1', '#c7e9b4', '#7fcdbb', '#41b6c4', '#1d91c0', '#225ea8', '#253494', '#081d58']
+GRADIENT_COLUMNS = (scoring.SCORE_COLUMN,) + scoring.INDEX_COLUMNS
+PAGE_SIZE_OPTIONS = (25, 50, 100, 200)
+PICKER_PAGE_SIZE = 100
+TEXT_LUMINANCE_THRESHOLD = 0.408
+TABLE_STYLES = [{'selector': 'th', 'props': [('text-align', 'center'), ('font-size', '1.05em'), ('padding', '10px 12px')]}, {'selector': 'td', 'props': [('text-align', 'center'), ('padding', '8px 10px')]}]
+
+# --- Vectorized Gradient ---
+def _hex_to_rgb(hex_colors):
+    return np.array([[int(h[i:i + 2], 16) for i in (1, 3, 5)] for h in hex_colors], dtype=float) / 255.0
+
+_STOP_RGB = _hex_to_rgb(YLGNBU_STOPS)
+_STOP_POSITIONS = np.linspace(0.0, 1.0, len(YLGNBU_STOPS))
+
+def gradient_css(values, vmin=None, vmax=None):
+    # Styler.background_gradient와 같은 규칙: 열 단위 min-max 정규화, 어두운 배경이면 밝은 글자색
+    # vmin/vmax를 주면 보이는 페이지가 아니라 전체 목록 기준으로 색을 정함
+    values = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float)
+    css = np.full(len(values), '', dtype=object)
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return css
+    # 점수 열은 값 종류가 적으므로 고유값마다 한 번만 색 문자열을 만든다
+    unique_values, inverse = np.unique(values[valid], return_inverse=True)
+    vmin = unique_values[0] if vmin is None else float(vmin)
+    vmax = unique_values[-1] if vmax is None else float(vmax)
+    normalized = np.clip((unique_values - vmin) / (vmax - vmin), 0.0, 1.0) if vmax > vmin else np.zeros(len(unique_values))
+    rgb = np.stack([np.interp(normalized, _STOP_POSITIONS, _STOP_RGB[:, channel]) for channel in range(3)], axis=1)
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    luminance = linear @ np.array([0.2126, 0.7152, 0.0722])
+    rgb_255 = np.rint(rgb * 255).astype(int)
+    unique_css = np.array([f"background-color: #{r:02x}{g:02x}{b:02x}; color: {'#f1f1f1' if lum < TEXT_LUMINANCE_THRESHOLD else '#000000'};"
+                           for (r, g, b), lum in zip(rgb_255, luminance)], dtype=object)
+    css[valid] = unique_css[inverse]
+    return css
+
+# --- Paged Table View ---
+class TableView:
+    # 보이는 페이지만 라이브러리에서 읽고 (LIKE 검색, ORDER BY, LIMIT/OFFSET), 색 기준인 열별 최소/최대는
+    # 데이터 버전이 바뀔 때만 다시 조회해서 페이지가 달라도 같은 값은 같은 색
+    def __init__(self, gradient_columns=GRADIENT_COLUMNS):
+        self.gradient_columns = list(gradient_columns)
+        self.version = None
+        self._ranges = {}
+
+    def _refresh(self, library, version):
+        if version == self.version:
+            return
+        self.version = version
+        self._ranges = library.column_ranges(self.gradient_columns)
+
+    def page(self, library, version, search="", sort_column=None, descending=False, page=1, page_size=PAGE_SIZE_OPTIONS[1]):
+        self._refresh(library, version)
+        total_rows = library.count_keywords(search)
+        total_pages = max(1, -(-total_rows // page_size))
+        page = min(max(1, int(page)), total_pages)
+        offset = (page - 1) * page_size
+        page_df = library.query_keywords(search, sort_column, descending, limit=page_size, offset=offset)
+        page_df.index = pd.RangeIndex(offset, offset + len(page_df))
+        page_colors = pd.DataFrame({c: gradient_css(page_df[c], *self._ranges[c]) if c in self._ranges else '' for c in page_df.columns}, index=page_df.index)
+        return page_df, page_colors, total_rows, total_pages, page
+
+    def styled_page(self, library, version, **page_args):
+        page_df, page_colors, total_rows, total_pages, page = self.page(library, version, **page_args)
+        styler = page_df.style.apply(lambda _: page_colors, axis=None).set_table_styles(TABLE_STYLES).set_properties(**{'text-align': 'center', 'width': '150px'})
+        return styler, total_rows, total_pages, page
@@ -0,0 +1,65 @@
+import argparse
+import hashlib
+import random
+import sys
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# site_fetch 테스트용 로컬 검색 서버: /search?q=키워드 -> 키워드에서 정해지는 결과 수를 HTML로 돌려줌
+# (명령줄: python tests/stub_server.py 8765)
+
+# --- Stub Constants ---
+STUB_COUNT_PATTERN = r'class="count">([\d,]+)<'
+
+def expected_count(keyword):
+    return int(hashlib.blake2b(keyword.encode('utf-8'), digest_size=4).hexdigest(), 16) % 2000
+
+# --- Stub Server ---
+class StubSearchHandler(BaseHTTPRequestHandler):
+    # 가끔 503으로 재시도 경로 확인. 응답한 (키워드, 상태 코드)는 server.served에 차례로 남김
+    flaky_ratio = 0.0
+
+    def do_GET(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query).get('q', [''])[0]
+        if self.flaky_ratio and random.random() < self.flaky_ratio:
+            self.server.served.append((query, 503))
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = f'<html><body><p>검색 결과 <span class="count">{expected_count(query):,}</span>건</p></body></html>'.encode('utf-8')
+        self.server.served.append((query, 200))
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_server(port=0, flaky_ratio=0.0):
+    handler = type('ConfiguredStubSearchHandler', (StubSearchHandler,), {'flaky_ratio': flaky_ratio})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.served = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# --- Command Line Entry Point ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="site_fetch.py를 시험해 보는 로컬 검색 서버를 실행합니다.")
+    parser.add_argument('port', type=int, nargs='?', default=8765, help="포트 번호")
+    parser.add_argument('--flaky', type=float, default=0.0, help="503으로 응답할 비율 (0~1)")
+    args = parser.parse_args(argv)
+
+    server = start_stub_server(args.port, args.flaky)
+    print(f"stub search server: http://127.0.0.1:{server.server_address[1]}/search?q={{query}}  pattern: {STUB_COUNT_PATTERN}", file=sys.stderr)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
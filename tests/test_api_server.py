@@ -0,0 +1,76 @@
+import asyncio
+import json
+import os
+import signal
+
+import pytest
+
+import api_server
+
+def _score_body(**extra):
+    return {'weights': {'DBpia': 2.0, 'BIGKINDS': 1.0}, 'keywords': [{'keyword': 'AI', 'counts': {'DBpia': 100, 'BIGKINDS': 30}}], **extra}
+
+def _dispatch(api, path, body):
+    status, _, payload = asyncio.run(api.dispatch('POST', path, json.dumps(body).encode('utf-8')))
+    return status, json.loads(payload)
+
+@pytest.fixture
+def api():
+    api = api_server.KeywordApi(window_sec=0)
+    yield api
+    api.close()
+
+@pytest.mark.parametrize('top_n', [0, -1, 3, 1.5, 'x'])
+def test_out_of_range_top_n_is_rejected(api, top_n):
+    status, payload = _dispatch(api, '/score', _score_body(top_n=top_n))
+    assert status == 400
+    assert "'top_n'" in payload['error']
+
+def test_top_n_within_site_count_and_default(api):
+    status, payload = _dispatch(api, '/score', _score_body(top_n=1))
+    assert status == 200
+    assert [site['name'] for site in payload['results'][0]['top_sites']] == ['DBpia']
+    # 기본값(3)은 사이트가 2개뿐이면 2로 줄여서 계산
+    key, _, _ = api_server.parse_score_request(_score_body())
+    assert key[3] == 2
+
+def _response(size):
+    return 200, 'image/png', b'x' * size, 1
+
+def _fill(cache, items):
+    async def run():
+        for key, size in items:
+            async def compute(size=size):
+                return _response(size)
+            await cache.get_or_compute(key, compute)
+    asyncio.run(run())
+
+def test_cache_evicts_least_recent_entries_past_byte_budget():
+    cache = api_server.ResponseCache(max_entries=100, max_bytes=1000)
+    _fill(cache, [('a', 400), ('b', 400), ('a', 0), ('c', 400)])
+    # 'a'는 다시 쓰여서 최근 항목이 되었으므로 'b'가 밀려남
+    assert list(cache._entries) == ['a', 'c']
+    assert cache.stats()['bytes'] == 800 and cache.stats()['evictions'] == 1
+
+def test_cache_skips_responses_larger_than_budget():
+    cache = api_server.ResponseCache(max_entries=100, max_bytes=1000)
+    _fill(cache, [('a', 400), ('big', 2000)])
+    assert list(cache._entries) == ['a']
+    assert cache.stats()['bytes'] == 400
+
+def test_cache_still_caps_entry_count():
+    cache = api_server.ResponseCache(max_entries=2, max_bytes=1000)
+    _fill(cache, [('a', 1), ('b', 1), ('c', 1)])
+    assert list(cache._entries) == ['b', 'c']
+    assert cache.stats()['bytes'] == 2
+
+def test_map_recovers_after_render_workers_die():
+    api = api_server.KeywordApi(window_sec=0, render_workers=1)
+    try:
+        body = {'criterion': '유레카지수', 'keywords': [{'키워드': 'AI', '데이터가용성점수': 3, '유레카지수': 4, '덕질가능지수': 2, '성장잠재력지수': 1}]}
+        for pid in api.renderer.executor().pids:
+            os.kill(pid, signal.SIGKILL)
+        status, content_type, payload = asyncio.run(api.dispatch('POST', '/map', json.dumps(body).encode('utf-8')))
+        assert (status, content_type) == (200, 'image/png') and payload.startswith(b'\x89PNG')
+    finally:
+        api.close()
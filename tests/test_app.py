@@ -0,0 +1,110 @@
+import importlib
+import os
+import threading
+import time
+
+import pandas as pd
+import pytest
+import streamlit as st
+from streamlit.runtime.fragment import MemoryFragmentStorage
+from streamlit.runtime.scriptrunner.script_requests import RerunData
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1 import app_test as app_test_module
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+import library_db
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '산점도v1.py')
+
+class FragmentScriptRunner(LocalScriptRunner):
+    # AppTest는 실행마다 새 ScriptRunner와 빈 fragment 저장소를 만들어 항상 전체 스크립트를 다시 실행하므로,
+    # 저장소를 실행 사이에 공유하고 fragment_id_queue가 있으면 그 fragment만 다시 실행하게 함
+    fragment_storage = None
+    fragment_id_queue = []
+    last = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._fragment_storage = type(self).fragment_storage
+        type(self).last = self
+
+    def request_rerun(self, rerun_data):
+        if type(self).fragment_id_queue:
+            rerun_data = RerunData(widget_states=rerun_data.widget_states, query_string=rerun_data.query_string,
+                                   page_script_hash=rerun_data.page_script_hash, fragment_id_queue=list(type(self).fragment_id_queue))
+        return super().request_rerun(rerun_data)
+
+@pytest.fixture
+def library_path(tmp_path, monkeypatch):
+    # 앱의 공유 라이브러리(cache_resource)를 테스트마다 빈 임시 파일로 바꿈
+    path = str(tmp_path / 'library.sqlite3')
+    monkeypatch.setenv('KEYWORD_LIBRARY_PATH', path)
+    importlib.reload(library_db)
+    st.cache_resource.clear()
+    yield path
+    monkeypatch.undo()
+    importlib.reload(library_db)
+    st.cache_resource.clear()
+
+@pytest.fixture
+def app(library_path):
+    return AppTest.from_file(APP_PATH, default_timeout=60).run()
+
+def _script_sleeps(monkeypatch):
+    # 스크립트 스레드에서 부른 time.sleep만 기록 (AppTest 자체의 대기는 다른 스레드)
+    sleeps, original = [], time.sleep
+    def recording_sleep(seconds):
+        if threading.current_thread().name == 'ScriptRunner.scriptThread':
+            sleeps.append(seconds)
+        original(seconds)
+    monkeypatch.setattr(time, 'sleep', recording_sleep)
+    return sleeps
+
+def _add_keyword(app, keyword, count=120):
+    app.text_input(key='main_keyword_input').set_value(keyword).run()
+    for site_config in app.session_state['site_configs']:
+        app.number_input(key=f"count_input_{site_config['id']}").set_value(count)
+    app.button(key='calc_avail_button_main').click().run()
+    app.button(key='add_keyword_button_main_submit').click().run()
+    assert not app.exception, app.exception
+
+def _toasts(app):
+    return [element.value for element in app.markdown if 'kw-toast-' in element.value]
+
+def test_adding_a_keyword_and_saving_a_site_do_not_sleep(app, monkeypatch):
+    sleeps = _script_sleeps(monkeypatch)
+    _add_keyword(app, 'AI')
+    site_id = app.session_state['site_configs'][0]['id']
+    next(element for element in app.sidebar.number_input if element.label == f"가중치 변경##{site_id}").set_value(3.0)
+    app.button(key=f"save_sidebar_{site_id}").click().run()
+    assert not app.exception, app.exception
+    assert app.session_state['site_configs'][0]['weight'] == 3.0
+    assert sleeps == []
+
+def test_notifications_survive_rerun_and_are_flushed_once(app):
+    # 추가 버튼은 알림을 큐에 넣고 st.rerun()을 부름 -> 다시 실행된 화면에 한 번 그려지고 큐는 비워짐
+    _add_keyword(app, 'AI')
+    assert len(_toasts(app)) == 1 and "'AI' 키워드가 추가되었어요!" in _toasts(app)[0]
+    assert app.session_state['notification_queue'] == []
+    app.run()
+    assert _toasts(app) == []
+
+def test_widget_inside_a_fragment_reruns_only_that_fragment(library_path, monkeypatch):
+    library_db.KeywordLibrary(library_path).add_keywords(pd.DataFrame([
+        {'키워드': keyword, '데이터가용성점수': 2, '유레카지수': 1, '덕질가능지수': 2, '성장잠재력지수': 3} for keyword in ('AI 윤리', '기후 변화', '우주')]))
+    monkeypatch.setattr(FragmentScriptRunner, 'fragment_storage', MemoryFragmentStorage())
+    monkeypatch.setattr(app_test_module, 'LocalScriptRunner', FragmentScriptRunner)
+    app = AppTest.from_file(APP_PATH, default_timeout=60).run()
+    deltas = [msg.delta for msg in FragmentScriptRunner.last.forward_msgs() if msg.HasField('delta')]
+    table_fragment_id = next(delta.fragment_id for delta in deltas if 'table_search' in str(delta.new_element))
+    # 전체 실행에는 fragment 밖(빈 id)과 여러 fragment의 출력이 섞여 있음
+    assert len({delta.fragment_id for delta in deltas}) > 2
+
+    app.text_input(key='table_search').set_value('기후')
+    monkeypatch.setattr(FragmentScriptRunner, 'fragment_id_queue', [table_fragment_id])
+    app.run()
+    assert not app.exception, app.exception
+    deltas = [msg.delta for msg in FragmentScriptRunner.last.forward_msgs() if msg.HasField('delta')]
+    # 표 fragment의 출력만 다시 그려짐 (다른 fragment와 페이지 본문은 실행되지 않음)
+    assert deltas and {delta.fragment_id for delta in deltas} == {table_fragment_id}
+    assert any('총 1개' in str(delta.new_element) for delta in deltas)
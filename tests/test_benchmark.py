@@ -0,0 +1,19 @@
+import time
+
+import benchmark
+
+def test_measure_discards_warm_up_and_uses_median():
+    # 첫 호출만 느린 단계 (지연 import, 캐시 채우기와 같은 상황)
+    calls = []
+
+    def run():
+        calls.append(None)
+        time.sleep(0.2 if len(calls) == 1 else 0.001)
+    result = benchmark.measure(run, repeat=1)
+    assert len(calls) == 1 + benchmark.MIN_REPEAT + 1
+    assert result['seconds'] < 0.1
+
+def test_compare_ignores_small_absolute_changes():
+    baseline = {'results': {'table@10': {'seconds': 0.001, 'peak_bytes': 1000}, 'chart@10': {'seconds': 0.5, 'peak_bytes': 1000}}}
+    results = {'table@10': {'seconds': 0.004, 'peak_bytes': 1000}, 'chart@10': {'seconds': 0.9, 'peak_bytes': 1000}}
+    assert list(benchmark.compare(results, baseline)) == ['chart@10']
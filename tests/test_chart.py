@@ -0,0 +1,76 @@
+import matplotlib
+
+matplotlib.use('Agg')
+
+import numpy as np
+import pandas as pd
+
+import chart
+import scoring
+
+def _plot_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({scoring.KEYWORD_COLUMN: [f"키워드{i}" for i in range(n)], scoring.SCORE_COLUMN: rng.integers(1, 5, n),
+                         '유레카지수': rng.integers(1, 5, n)})
+
+def test_jitter_is_stable_per_keyword_and_bounded():
+    first = chart.keyword_jitter(['AI', '기후', '우주'])
+    # 다른 키워드가 끼어들어도 키워드마다 같은 흔들림
+    assert np.array_equal(chart.keyword_jitter(['우주', 'AI'])[[1, 0]], first[[0, 2]])
+    assert not np.array_equal(chart.keyword_jitter(['AI'], seed=1), first[:1])
+    assert np.abs(chart.keyword_jitter([str(i) for i in range(1000)])).max() <= chart.BASE_JITTER_STRENGTH
+
+def test_render_cache_evicts_by_entries_and_bytes():
+    cache = chart.RenderCache(max_entries=3, max_bytes=10)
+    for key, value in [('a', 'xxxx'), ('b', 'xxxx'), ('a', 'xxxx'), ('c', 'xxxx')]:
+        cache.get_or_render(key, lambda value=value: value)
+    # 'a'를 다시 써서 가장 오래된 'b'가 바이트 상한(10) 때문에 밀려남
+    assert list(cache._entries) == ['a', 'c'] and (cache.hits, cache.misses) == (1, 3)
+    cache.put('a', 'x')
+    cache.put('d', 'x')
+    cache.put('e', 'x')
+    assert list(cache._entries) == ['a', 'd', 'e'] and len(cache) == 3
+
+def test_cached_map_renders_once_per_content(monkeypatch):
+    cache, renders = chart.RenderCache(), []
+    original = chart.render_keyword_map
+    monkeypatch.setattr(chart, 'render_keyword_map', lambda *args, **kwargs: renders.append(args[1]) or original(*args, **kwargs))
+    df = _plot_frame(5)
+    first = chart.cached_keyword_map(cache, df, '유레카지수', '유레카 지수', '유레카지수')
+    assert chart.cached_keyword_map(cache, df.copy(), '유레카지수', '유레카 지수', '유레카지수') == first
+    changed = df.copy()
+    changed.loc[0, '유레카지수'] = 5 - changed.loc[0, '유레카지수']
+    chart.cached_keyword_map(cache, changed, '유레카지수', '유레카 지수', '유레카지수')
+    assert len(renders) == 2
+    assert first.startswith('iVBOR')
+
+def _overlaps(boxes):
+    return any(a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3] for i, a in enumerate(boxes) for b in boxes[i + 1:])
+
+def test_placed_labels_never_overlap():
+    rng = np.random.default_rng(0)
+    x, y = rng.random(2000) * 800, rng.random(2000) * 600
+    widths, height = chart.estimate_label_extent([f"키워드{i}" for i in range(2000)], 12)
+    placed = chart.place_labels(x, y, widths, height, range(2000), offset_pt=0)
+    assert 0 < len(placed) <= chart.MAX_PLACED_LABELS
+    boxes = [(x[i] - widths[i] / 2, y[i], x[i] + widths[i] / 2, y[i] + height) for i in placed]
+    assert not _overlaps(boxes)
+    # 순서대로 시도하므로 첫 후보는 항상 놓임
+    assert placed[0] == 0
+
+def test_top_k_per_quadrant_takes_best_from_each_quadrant():
+    x = np.array([1.0, 1.2, 4.0, 3.0, 3.5, 1.0])
+    y = np.array([4.0, 3.0, 4.0, 1.0, 1.5, 1.0])
+    assert sorted(chart.top_k_per_quadrant(x, y, k=1)) == [0, 2, 4, 5]
+
+def test_density_mode_draws_hexbin_instead_of_points():
+    df = _plot_frame(50)
+    sparse = chart.draw_keyword_map(df, '유레카지수', '유레카 지수', density_threshold=1000)
+    dense = chart.draw_keyword_map(df, '유레카지수', '유레카 지수', label_all_max=10, density_threshold=10)
+    try:
+        assert len(sparse.axes) == 1 and len(sparse.axes[0].texts) == 4 + 50
+        assert len(dense.axes) == 2  # 밀도 색 막대
+        assert 4 < len(dense.axes[0].texts) <= 4 + 4 * chart.DENSITY_TOP_K_LABELS
+    finally:
+        chart.plt.close(sparse)
+        chart.plt.close(dense)
@@ -0,0 +1,53 @@
+import itertools
+
+import pytest
+
+import dedupe
+
+KEYWORDS = ['기후 변화', '기후 변화 대응', '기후 변화 대응책', '인공지능 윤리', '인공지능 윤리 교육', '인공지능 윤리교육 사례',
+            '우주 탐사', '우주 탐사선', '우주 탐사선 발사', 'AI 윤리', '에이아이 윤리', '고양이', '고양이를', '결과']
+
+def _similarity(a, b):
+    return dedupe.jaccard(dedupe.keyword_ngrams(a), dedupe.keyword_ngrams(b))
+
+def test_normalize_spells_acronyms_and_strips_particles():
+    assert dedupe.normalize('AI 윤리') == dedupe.normalize('에이아이 윤리')
+    assert dedupe.normalize('고양이를 키우기') == dedupe.normalize('고양이 키우기')
+    assert dedupe.normalize('고양이를') == '고양이를'
+    assert dedupe.normalize('결과') == '결과'
+
+@pytest.mark.parametrize('threshold', [0.5, 0.6, 0.75])
+def test_similar_pairs_match_brute_force(threshold):
+    index = dedupe.NearDuplicateIndex(KEYWORDS)
+    found = {frozenset((a, b)) for a, b, _ in index.similar_pairs(threshold)}
+    expected = {frozenset((a, b)) for a, b in itertools.combinations(KEYWORDS, 2) if _similarity(a, b) >= threshold}
+    assert found == expected
+
+def test_query_respects_threshold_and_skips_itself():
+    index = dedupe.NearDuplicateIndex(KEYWORDS)
+    matches = index.query('기후 변화 대응', threshold=0.7)
+    assert [keyword for keyword, _ in matches] == ['기후 변화 대응책']
+    assert all(similarity >= 0.7 for _, similarity in matches)
+    assert index.query('기후 변화 대응', threshold=0.8) == []
+
+def test_groups_do_not_chain_through_intermediate_keywords():
+    # '기후 변화'~'기후 변화 대응'~'기후 변화 대응책'이지만 양 끝은 기준 미만이라 한 묶음이 되면 안 됨
+    assert _similarity('기후 변화', '기후 변화 대응책') < 0.5 <= _similarity('기후 변화', '기후 변화 대응')
+    index = dedupe.NearDuplicateIndex(['기후 변화', '기후 변화 대응', '기후 변화 대응책'])
+    assert index.duplicate_groups(0.5) == [['기후 변화', '기후 변화 대응']]
+
+@pytest.mark.parametrize('threshold', [0.5, 0.6, 0.75])
+def test_every_member_passes_threshold_against_representative(threshold):
+    index = dedupe.NearDuplicateIndex(KEYWORDS)
+    groups = index.duplicate_groups(threshold)
+    assert groups
+    for representative, *members in groups:
+        assert all(_similarity(representative, member) >= threshold for member in members)
+    grouped = [keyword for group in groups for keyword in group]
+    assert len(grouped) == len(set(grouped))
+
+def test_removed_keywords_leave_the_index():
+    index = dedupe.NearDuplicateIndex(['AI 윤리', '에이아이 윤리'])
+    assert index.duplicate_groups() == [['AI 윤리', '에이아이 윤리']]
+    assert index.remove('에이아이 윤리') and '에이아이 윤리' not in index
+    assert index.duplicate_groups() == [] and index.query('AI 윤리') == []
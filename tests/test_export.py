@@ -0,0 +1,43 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import export
+import scoring
+
+def _frame(n=5):
+    return pd.DataFrame({scoring.KEYWORD_COLUMN: [f"키워드{i}" for i in range(n)], scoring.SCORE_COLUMN: np.arange(n) % 4 + 1,
+                         '유레카지수': 1, '덕질가능지수': 2, '성장잠재력지수': 3})
+
+def test_chunked_csv_equals_one_shot_csv():
+    df = _frame(25)
+    assert export.to_csv_bytes(df) == df.to_csv(index=False).encode('utf-8-sig')
+    assert b"".join(export.iter_csv_bytes(df, chunk_rows=4)) == export.to_csv_bytes(df)
+    assert export.to_csv_bytes(df.iloc[:0]) == df.iloc[:0].to_csv(index=False).encode('utf-8-sig')
+
+@pytest.mark.parametrize('constant_memory_min_rows', [0, export.XLSX_CONSTANT_MEMORY_MIN_ROWS])
+def test_xlsx_round_trip(constant_memory_min_rows):
+    df = _frame()
+    df.loc[2, '유레카지수'] = np.nan
+    data = export.to_xlsx_bytes(df, constant_memory_min_rows=constant_memory_min_rows)
+    read = pd.read_excel(io.BytesIO(data), sheet_name=export.EXCEL_SHEET_NAME)
+    pd.testing.assert_frame_equal(read, df, check_dtype=False)
+
+@pytest.mark.parametrize('fmt, reader', [('parquet', pd.read_parquet), ('arrow', pd.read_feather)])
+def test_columnar_formats_round_trip(fmt, reader):
+    df = _frame()
+    pd.testing.assert_frame_equal(reader(io.BytesIO(export.EXPORT_FORMATS[fmt]['builder'](df))), df)
+
+def test_cache_builds_each_format_once_per_version(monkeypatch):
+    calls = []
+    monkeypatch.setitem(export.EXPORT_FORMATS['csv'], 'builder', lambda df: calls.append(len(df)) or b'csv')
+    cache = export.ExportCache()
+    assert cache.get(1, 'csv') is None
+    assert cache.build(1, 'csv', _frame()) == b'csv'
+    assert cache.build(1, 'csv', _frame()) == b'csv' and cache.get(1, 'csv') == b'csv'
+    assert cache.get(2, 'csv') is None
+    cache.build(2, 'csv', _frame(3))
+    assert calls == [5, 3]
+    assert export.export_file_name('arrow') == f"{export.EXPORT_FILE_STEM}.arrow"
@@ -0,0 +1,47 @@
+import json
+import os
+
+import matplotlib
+import matplotlib.font_manager as fm
+import pytest
+
+import fonts
+
+@pytest.fixture
+def font_file():
+    font_info = next(f for f in fm.fontManager.ttflist if os.path.exists(f.fname))
+    return {'name': font_info.name, 'path': font_info.fname, 'mtime': os.path.getmtime(font_info.fname)}
+
+def test_cached_font_round_trip_and_stale_entries(tmp_path, font_file):
+    cache_path = str(tmp_path / 'font_cache.json')
+    assert fonts.load_cached_font(cache_path) is None
+    fonts.save_cached_font(font_file, cache_path)
+    assert fonts.load_cached_font(cache_path) == font_file
+    # 폰트 파일이 바뀌었으면(mtime 다름) 캐시를 쓰지 않음
+    fonts.save_cached_font({**font_file, 'mtime': font_file['mtime'] - 1}, cache_path)
+    assert fonts.load_cached_font(cache_path) is None
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        f.write('{깨진 json')
+    assert fonts.load_cached_font(cache_path) is None
+
+def test_setup_font_skips_search_when_cache_is_valid(tmp_path, monkeypatch, font_file):
+    cache_path = str(tmp_path / 'font_cache.json')
+    fonts.save_cached_font(font_file, cache_path)
+    monkeypatch.setattr(fonts, 'resolve_korean_font', lambda: pytest.fail("캐시가 유효한데 폰트를 다시 찾음"))
+    with matplotlib.rc_context():
+        assert fonts.setup_font(cache_path) == font_file['name']
+
+def test_setup_font_resolves_and_saves_when_cache_is_stale(tmp_path, monkeypatch, font_file):
+    cache_path = str(tmp_path / 'font_cache.json')
+    fonts.save_cached_font({**font_file, 'path': str(tmp_path / '없는 폰트.ttf')}, cache_path)
+    monkeypatch.setattr(fonts, 'resolve_korean_font', lambda: font_file)
+    with matplotlib.rc_context():
+        assert fonts.setup_font(cache_path) == font_file['name']
+    with open(cache_path, encoding='utf-8') as f:
+        assert json.load(f) == font_file
+
+def test_match_font_prefers_priority_order():
+    entries = [fm.FontEntry(fname='c.ttf', name='Malgun Gothic'), fm.FontEntry(fname='a.ttf', name='NanumGothic'), fm.FontEntry(fname='b.ttf', name='NanumGothic')]
+    assert fonts._match_font(entries).fname == 'a.ttf'
+    assert fonts._match_font([fm.FontEntry(fname='d.ttf', name='NanumGothic Eco')]).fname == 'd.ttf'
+    assert fonts._match_font([fm.FontEntry(fname='e.ttf', name='DejaVu Sans')]) is None
@@ -0,0 +1,44 @@
+import io
+
+import pandas as pd
+
+import importer
+import scoring
+
+SITE_WEIGHTS = {'DBpia': 2.0, 'BIGKINDS': 1.0}
+
+def _csv(rows):
+    return io.StringIO(pd.DataFrame(rows).to_csv(index=False))
+
+def _row(keyword, dbpia=100, eureka=3):
+    return {'키워드': keyword, 'DBpia': dbpia, 'BIGKINDS': 10, '유레카지수': eureka, '덕질가능지수': 2, '성장잠재력지수': 4}
+
+def test_accepted_rows_are_scored_like_score_frame():
+    rows = [_row('AI', 100), _row('기후', 20), _row('우주', 300)]
+    accepted, rejected = importer.import_keywords(_csv(rows), 'a.csv', SITE_WEIGHTS)
+    expected = scoring.score_frame(pd.DataFrame(rows), SITE_WEIGHTS)
+    assert rejected.empty
+    assert accepted[scoring.KEYWORD_COLUMN].tolist() == ['AI', '기후', '우주']
+    assert accepted[scoring.SCORE_COLUMN].tolist() == expected[scoring.SCORE_COLUMN].tolist()
+    assert accepted['DBpia'].tolist() == [100, 20, 300]
+
+def test_invalid_first_copy_does_not_reject_later_valid_copy():
+    rows = [_row('AI', eureka=9), _row('AI'), _row('AI')]
+    accepted, rejected = importer.import_keywords(_csv(rows), 'a.csv', SITE_WEIGHTS)
+    assert accepted[scoring.KEYWORD_COLUMN].tolist() == ['AI']
+    assert rejected['행 번호'].tolist() == [2, 4]
+    assert '유레카지수' in rejected[importer.REJECT_REASON_COLUMN].iloc[0]
+    assert '이미 목록' in rejected[importer.REJECT_REASON_COLUMN].iloc[1]
+
+def test_duplicates_across_chunks_and_existing_keywords():
+    rows = [_row('기존'), _row('새것'), _row('새것'), _row('또새것')]
+    accepted, rejected = importer.import_keywords(_csv(rows), 'a.csv', SITE_WEIGHTS, existing_keywords=['기존'], chunk_rows=2)
+    assert accepted[scoring.KEYWORD_COLUMN].tolist() == ['새것', '또새것']
+    assert rejected['행 번호'].tolist() == [2, 4]
+
+def test_rejects_bad_counts_and_missing_keyword():
+    rows = [_row(''), _row('음수', dbpia=-1), _row('소수', dbpia='1.5'), _row('쉼표', dbpia='1,200')]
+    accepted, rejected = importer.import_keywords(_csv(rows), 'a.csv', SITE_WEIGHTS)
+    assert accepted[scoring.KEYWORD_COLUMN].tolist() == ['쉼표']
+    assert accepted['DBpia'].tolist() == [1200]
+    assert rejected['행 번호'].tolist() == [2, 3, 4]
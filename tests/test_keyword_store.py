@@ -0,0 +1,50 @@
+import random
+
+import pandas as pd
+
+import keyword_store
+import scoring
+
+def _row(keyword, score=2):
+    return {scoring.KEYWORD_COLUMN: keyword, scoring.SCORE_COLUMN: score, '유레카지수': 1, '덕질가능지수': 2, '성장잠재력지수': 3}
+
+def test_frame_matches_plain_list_after_random_edits_and_compaction():
+    store, expected = keyword_store.KeywordStore(), {}
+    rng = random.Random(0)
+    for step in range(2000):
+        keyword = f"키워드{rng.randrange(300)}"
+        action = rng.random()
+        if action < 0.5:
+            assert store.add(_row(keyword, step)) == (keyword not in expected)
+            expected.setdefault(keyword, _row(keyword, step))
+        elif action < 0.85:
+            assert store.remove(keyword) == (expected.pop(keyword, None) is not None)
+        elif keyword in expected:
+            store.update(keyword, **{scoring.SCORE_COLUMN: -step})
+            expected[keyword][scoring.SCORE_COLUMN] = -step
+    assert store.keywords() == list(expected)
+    pd.testing.assert_frame_equal(store.frame(), pd.DataFrame(list(expected.values()), columns=list(scoring.TABLE_COLUMNS)))
+
+def test_extend_skips_existing_and_repeated_keywords_in_one_version():
+    store = keyword_store.KeywordStore()
+    store.add(_row('AI'))
+    version = store.version
+    added = store.extend(pd.DataFrame([_row('AI', 4), _row('기후', 1), _row('기후', 3), _row('우주', 4)]))
+    assert added == 2 and store.version == version + 1
+    assert store.frame()[scoring.SCORE_COLUMN].tolist() == [2, 1, 4]
+
+def test_frame_is_reused_until_the_store_changes():
+    store = keyword_store.KeywordStore()
+    store.add(_row('AI'))
+    frame = store.frame()
+    assert store.frame() is frame
+    assert store.update_column(scoring.SCORE_COLUMN, ['AI', '없는 키워드'], [4, 1]) == 1
+    assert store.frame() is not frame and store.get('AI')[scoring.SCORE_COLUMN] == 4
+    assert store.update_column(scoring.SCORE_COLUMN, ['없는 키워드'], [1]) == 0
+
+def test_empty_store_has_table_columns():
+    store = keyword_store.KeywordStore()
+    assert store.empty and store.frame().columns.tolist() == list(scoring.TABLE_COLUMNS)
+    store.add(_row('AI'))
+    store.clear()
+    assert store.empty and store.get('AI') is None
@@ -0,0 +1,144 @@
+import random
+import sqlite3
+
+import pandas as pd
+
+import library_db
+import scoring
+import skyline
+
+def _site(site_id, name, weight=1.0):
+    return {'id': site_id, 'name': name, 'weight': weight, 'is_default': False, 'user_count': 0}
+
+def _row(keyword, score=2):
+    return {scoring.KEYWORD_COLUMN: keyword, scoring.SCORE_COLUMN: score, '유레카지수': 1, '덕질가능지수': 2, '성장잠재력지수': 3}
+
+def _shared_library(tmp_path):
+    # 두 세션이 같은 파일을 쓰는 상황 (세션마다 따로 불러 둔 사이트 목록을 가짐)
+    path = str(tmp_path / 'library.sqlite3')
+    return library_db.KeywordLibrary(path), library_db.KeywordLibrary(path)
+
+def test_save_sites_keeps_sites_added_by_other_sessions(tmp_path):
+    first, second = _shared_library(tmp_path)
+    first.save_sites([_site('a', 'DBpia', 2.0)])
+    stale_configs = first.load_sites()
+    second.save_sites([_site('b', 'BIGKINDS')])
+    first.add_keyword(_row('AI'), {'a': 10, 'b': 20})
+    stale_configs[0]['weight'] = 3.0
+    first.save_sites(stale_configs)
+    assert [(s['id'], s['weight']) for s in second.load_sites()] == [('a', 3.0), ('b', 1.0)]
+    assert sorted(first.load_counts().columns) == ['a', 'b']
+
+def test_delete_sites_removes_only_given_sites_and_their_counts(tmp_path):
+    library, _ = _shared_library(tmp_path)
+    library.save_sites([_site('a', 'DBpia'), _site('b', 'BIGKINDS')])
+    library.add_keyword(_row('AI'), {'a': 10, 'b': 20})
+    assert library.delete_sites(['b']) == 1
+    assert [s['id'] for s in library.load_sites()] == ['a']
+    assert library.load_counts().columns.tolist() == ['a']
+
+def test_seed_sites_only_fills_empty_library(tmp_path):
+    first, second = _shared_library(tmp_path)
+    first.seed_sites([_site('a', 'DBpia')])
+    assert [s['id'] for s in second.seed_sites([_site('x', 'DBpia'), _site('y', '교보문고')])] == ['a']
+
+def test_site_and_setting_writes_bump_settings_version(tmp_path):
+    first, second = _shared_library(tmp_path)
+    first.seed_sites([_site('a', 'DBpia')])
+    first.seed_sites([_site('x', 'DBpia')])
+    version = second.settings_version()
+    assert version == 1
+    second.save_sites([_site('b', 'BIGKINDS')])
+    second.save_setting('score_thresholds', [10, 20, 30])
+    first.delete_sites(['b'])
+    assert first.settings_version() == version + 3
+    first.add_keyword(_row('AI'))
+    assert second.settings_version() == version + 3 and second.data_version() == 1
+
+def test_every_keyword_write_bumps_data_version():
+    library = library_db.KeywordLibrary(':memory:')
+    assert library.data_version() == 0
+    library.add_keyword(_row('AI'))
+    library.add_keyword(_row('AI'))
+    library.update_scores(['AI'], [4])
+    library.delete_keyword('없는 키워드')
+    assert library.data_version() == 4
+    assert library.has_keyword('AI') and not library.has_keyword('ai')
+
+def test_query_keywords_pages_in_sql():
+    library = library_db.KeywordLibrary(':memory:')
+    for i, score in enumerate([3, 1, 4, 1, 2]):
+        library.add_keyword(_row(f"키워드_{i}", score))
+    library.add_keyword(_row("키워드%"))
+    assert library.count_keywords() == 6
+    assert library.count_keywords("_1") == 1
+    assert library.query_keywords("%")[scoring.KEYWORD_COLUMN].tolist() == ["키워드%"]
+    page = library.query_keywords("_", scoring.SCORE_COLUMN, descending=True, limit=2, offset=1)
+    assert page[scoring.KEYWORD_COLUMN].tolist() == ["키워드_0", "키워드_4"]
+    assert library.query_keywords(limit=2, offset=4)[scoring.KEYWORD_COLUMN].tolist() == ["키워드_4", "키워드%"]
+
+def test_delete_keywords_counts_keywords_not_cascaded_rows():
+    library = library_db.KeywordLibrary(':memory:')
+    library.save_sites([_site('a', 'DBpia'), _site('b', 'BIGKINDS')])
+    library.add_keyword(_row('AI'), {'a': 10, 'b': 20})
+    library.add_keyword(_row('기후'), {'a': 5})
+    assert library.delete_keywords(['AI', '없는 키워드']) == 1
+    assert library.load_counts().index.tolist() == ['기후']
+
+def test_stored_frontier_levels_follow_every_write():
+    library = library_db.KeywordLibrary(':memory:')
+    library.add_keywords(pd.DataFrame([_row('가', 2), _row('나', 3), _row('다', 1)]))
+    library.add_keyword(_row('라', 4))
+    library.update_scores(['다'], [4])
+    library.delete_keyword('라')
+    stored = library.query_keywords(limit=10)
+    expected = skyline.with_frontier_levels(stored.drop(columns=[skyline.LEVEL_COLUMN]))
+    assert stored[skyline.LEVEL_COLUMN].tolist() == expected[skyline.LEVEL_COLUMN].tolist() == [3, 2, 1]
+
+def test_frontier_levels_are_recomputed_only_when_the_combo_set_changes(monkeypatch):
+    library = library_db.KeywordLibrary(':memory:')
+    rng = random.Random(0)
+    library.add_keywords(pd.DataFrame([{**_row(f"k{i}", rng.randint(1, 4)), '유레카지수': rng.randint(1, 4)} for i in range(300)]))
+    calls = []
+    original = skyline.frontier_levels
+    monkeypatch.setattr(skyline, 'frontier_levels', lambda values: calls.append(len(values)) or original(values))
+    # 이미 있는 조합으로만 쓰면 단계를 다시 계산하지 않음
+    library.add_keyword(_row('새 키워드', 2))
+    library.update_scores(['k0', 'k1'], [1, 4])
+    library.delete_keywords(['k2', 'k3'])
+    assert calls == []
+    library.add_keyword({**_row('새 조합', 4), '성장잠재력지수': 4})
+    library.delete_keyword('새 조합')
+    assert calls == [17, 16]
+    stored = library.query_keywords(limit=1000)
+    expected = skyline.with_frontier_levels(stored.drop(columns=[skyline.LEVEL_COLUMN]))
+    assert stored[skyline.LEVEL_COLUMN].tolist() == expected[skyline.LEVEL_COLUMN].tolist()
+    with library.pool.connection() as conn:
+        assert conn.execute("SELECT SUM(keyword_count), COUNT(*) FROM score_combos").fetchone() == (len(stored), 16)
+
+def test_old_library_file_gets_frontier_levels(tmp_path):
+    path = str(tmp_path / 'old.sqlite3')
+    conn = sqlite3.connect(path)
+    conn.executescript("CREATE TABLE keywords (keyword TEXT PRIMARY KEY, score INTEGER NOT NULL, eureka INTEGER NOT NULL, fan INTEGER NOT NULL, potential INTEGER NOT NULL, created_at REAL NOT NULL);"
+                       "INSERT INTO keywords VALUES ('가', 1, 1, 1, 1, 0), ('나', 2, 2, 2, 2, 0);")
+    conn.close()
+    library = library_db.KeywordLibrary(path)
+    page = library.query_keywords(sort_column=skyline.LEVEL_COLUMN)
+    assert page[scoring.KEYWORD_COLUMN].tolist() == ['나', '가']
+    assert page[skyline.LEVEL_COLUMN].tolist() == [1, 2]
+
+def test_merge_keywords_keeps_duplicate_counts_on_survivor():
+    library = library_db.KeywordLibrary(':memory:')
+    library.save_sites([_site('a', 'DBpia'), _site('b', 'BIGKINDS')])
+    library.add_keyword(_row('AI 윤리', 1), {'a': 10})
+    library.add_keyword(_row('에이아이 윤리', 1), {'a': 30, 'b': 600})
+    library.add_keyword(_row('기후'), {'a': 5})
+    version = library.data_version()
+    deleted, merged = library.merge_keywords([['AI 윤리', '에이아이 윤리'], ['없는 키워드', '기후']], {'a': 1.0, 'b': 1.0})
+    assert deleted == 1 and library.data_version() == version + 1
+    # 사이트별로 큰 값을 남기고, 합친 수(30 + 600)로 점수를 다시 계산
+    assert merged == {'AI 윤리': (4, {'a': 30, 'b': 600})}
+    counts = library.load_counts()
+    assert counts.index.tolist() == ['AI 윤리', '기후']
+    assert counts.loc['AI 윤리'].tolist() == [30, 600]
+    assert library.query_keywords("AI")[scoring.SCORE_COLUMN].tolist() == [4]
@@ -0,0 +1,20 @@
+import profiling
+
+def test_sampling_from_environment_does_not_show_panel(monkeypatch):
+    monkeypatch.setenv(profiling.PROFILE_ENV, '1')
+    monkeypatch.delenv(profiling.PROFILE_PANEL_ENV, raising=False)
+    profiler = profiling.Profiler(log_path=None)
+    assert profiler.begin_run(None)
+    assert profiler.enabled and not profiler.show_panel
+
+def test_query_param_or_panel_flag_shows_panel(monkeypatch):
+    monkeypatch.delenv(profiling.PROFILE_ENV, raising=False)
+    monkeypatch.delenv(profiling.PROFILE_PANEL_ENV, raising=False)
+    profiler = profiling.Profiler(log_path=None)
+    profiler.begin_run('1')
+    assert profiler.active and profiler.show_panel
+    profiler.begin_run('0')
+    assert not profiler.show_panel
+    monkeypatch.setenv(profiling.PROFILE_PANEL_ENV, '1')
+    profiler.begin_run(None)
+    assert profiler.show_panel
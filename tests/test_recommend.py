@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import recommend
+import scoring
+
+def _brute_force_top_k(rank_values, members, k):
+    return np.array(sorted(members.tolist(), key=lambda i: (-rank_values[i], i))[:k], dtype=members.dtype)
+
+@pytest.mark.parametrize('k', [0, 1, 3, 10, 50])
+def test_top_k_matches_full_sort_with_many_ties(k):
+    rng = np.random.default_rng(3)
+    rank_values = rng.integers(1, 5, 40).astype(float)
+    members = np.sort(rng.choice(40, 25, replace=False))
+    np.testing.assert_array_equal(recommend.top_k_indices(rank_values, members, k), _brute_force_top_k(rank_values, members, k))
+
+def test_top_k_keeps_earlier_rows_first_among_ties():
+    rank_values = np.array([2.0, 3.0, 3.0, 1.0, 3.0])
+    assert recommend.top_k_indices(rank_values, np.arange(5), 2).tolist() == [1, 2]
+
+def test_classify_splits_quadrants_and_ranks_rows():
+    df = pd.DataFrame({scoring.KEYWORD_COLUMN: list('abcde'), scoring.SCORE_COLUMN: [4, 4, 1, 1, 3], 'y': [3.0, 4.0, 4.0, 1.0, 4.0]})
+    result = {quadrant['code']: quadrant for quadrant in recommend.classify(df, 'y', default_k=1)}
+    assert [result[code]['total'] for code in range(4)] == [3, 1, 0, 1]
+    assert result[0]['rows'][scoring.KEYWORD_COLUMN].tolist() == ['b']
+    assert result[1]['rows'][scoring.KEYWORD_COLUMN].tolist() == ['c']
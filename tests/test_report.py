@@ -0,0 +1,83 @@
+import io
+import os
+import signal
+import time
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+import pytest
+
+import report
+import scoring
+import skyline
+
+def _frame():
+    return pd.DataFrame({
+        scoring.KEYWORD_COLUMN: ['가', '나', '다', '라'],
+        scoring.SCORE_COLUMN: [4, '3', 1, None],
+        '유레카지수': [4, 1, 3, 2],
+        '덕질가능지수': [4, 2, 3, 2],
+        '성장잠재력지수': [1, 3, 3, 2],
+    })
+
+@pytest.fixture
+def renderer():
+    renderer = report.ReportRenderer(max_workers=2)
+    yield renderer
+    renderer.shutdown()
+
+def test_plot_frame_drops_missing_scores_and_averages_indices():
+    plot_df = report.plot_frame(_frame(), report.CRITERIA[0])
+    assert plot_df[scoring.KEYWORD_COLUMN].tolist() == ['가', '나', '다']
+    assert plot_df[report.AVERAGE_COLUMN].tolist() == [3.0, 2.0, 3.0]
+    assert skyline.LEVEL_COLUMN in plot_df.columns
+
+def test_recommendation_table_lists_every_keyword_once():
+    plot_df = report.plot_frame(_frame(), report.CRITERIA[1])
+    table = report.recommendation_table(plot_df, '유레카지수')
+    assert sorted(table[scoring.KEYWORD_COLUMN]) == ['가', '나', '다']
+    first_quadrant = table[table[report.QUADRANT_COLUMN] == table[report.QUADRANT_COLUMN].iloc[0]]
+    assert first_quadrant[report.RANK_COLUMN].tolist() == list(range(1, len(first_quadrant) + 1))
+
+def test_workers_run_outside_the_app_process(renderer):
+    pool = renderer.executor()
+    assert renderer.executor() is pool
+    assert len(set(pool.pids)) == 2 and os.getpid() not in pool.pids
+    # 작업 프로세스의 __main__은 report_worker.py이므로 부모의 __main__(앱 스크립트)을 다시 실행하지 않음
+    assert pool.submit(eval, "__import__('sys').modules['__main__'].__file__").result().endswith('report_worker.py')
+
+def test_worker_errors_reach_the_caller_and_pool_keeps_working(renderer):
+    pool = renderer.executor()
+    with pytest.raises(ZeroDivisionError):
+        pool.submit(divmod, 1, 0).result()
+    assert pool.submit(divmod, 7, 2).result() == (3, 1)
+
+def test_dead_workers_are_replaced_and_the_pool_keeps_working(renderer):
+    pool = renderer.executor()
+    old_pids = pool.pids
+    for pid in old_pids:
+        os.kill(pid, signal.SIGKILL)
+    with pytest.raises(BrokenProcessPool):
+        renderer.render(_frame())
+    assert renderer.executor() is pool
+    assert len(set(pool.pids)) == 2 and not set(pool.pids) & set(old_pids)
+    assert len(renderer.render(_frame())) == len(report.CRITERIA)
+
+def test_call_timeout_kills_and_respawns_the_worker():
+    pool = report.WorkerPool(1, call_timeout=0.5)
+    try:
+        [old_pid] = pool.pids
+        with pytest.raises(TimeoutError):
+            pool.submit(time.sleep, 30).result(timeout=10)
+        assert pool.pids != [old_pid] and pool.submit(divmod, 7, 2).result() == (3, 1)
+    finally:
+        pool.shutdown()
+
+def test_build_report_bundles_every_criterion(renderer):
+    bundle = report.build_report(_frame(), renderer)
+    assert bundle['pdf'].startswith(b'%PDF')
+    with zipfile.ZipFile(io.BytesIO(bundle['zip'])) as archive:
+        names = archive.namelist()
+    assert len([name for name in names if name.endswith('.png')]) == len(report.CRITERIA)
+    assert f"{report.REPORT_FILE_STEM}.xlsx" in names
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+import rescoring
+import scoring
+
+SITE_IDS = ['a', 'b', 'c']
+
+def _matrix(rows):
+    matrix = rescoring.SiteCountMatrix()
+    for keyword, counts in rows.items():
+        matrix.set(keyword, counts)
+    return matrix
+
+def _frame(keywords, scores):
+    return pd.DataFrame({scoring.KEYWORD_COLUMN: keywords, scoring.SCORE_COLUMN: scores})
+
+def test_lookup_fills_missing_sites_and_flags_unknown_keywords():
+    matrix = _matrix({'AI': {'a': 10, 'b': 20}, '기후': {'c': 5}})
+    counts, known = matrix.lookup(['기후', '없음', 'AI'], ['a', 'c', 'zz'])
+    assert counts.tolist() == [[0, 5, 0], [0, 0, 0], [10, 0, 0]]
+    assert known.tolist() == [True, False, True]
+
+def test_remove_compacts_without_losing_rows():
+    matrix = _matrix({f"k{i}": {'a': i} for i in range(200)})
+    for i in range(150):
+        assert matrix.remove(f"k{i}")
+    assert not matrix.remove('k0') and len(matrix) == 50
+    counts, _ = matrix.lookup(['k150', 'k199'], ['a'])
+    assert counts.ravel().tolist() == [150, 199]
+
+def test_incremental_weight_changes_match_full_recompute():
+    rng = np.random.default_rng(0)
+    keywords = [f"k{i}" for i in range(300)]
+    matrix = rescoring.SiteCountMatrix.from_frame(pd.DataFrame(np.floor(rng.lognormal(3.5, 1.5, (300, 3))), index=keywords, columns=SITE_IDS))
+    df = _frame(keywords, 1)
+    scorer = rescoring.WhatIfScorer()
+    for weights in ([1, 1, 1], [2, 1, 1], [2, 0.5, 1], [2, 0.5, 3]):
+        new_scores = scorer.rescore(df, 1, matrix, SITE_IDS, weights, (40, 150, 400))
+        counts, _ = matrix.lookup(keywords, SITE_IDS)
+        assert new_scores.tolist() == scoring.score_matrix(counts, weights, (40, 150, 400))[2].tolist()
+
+def test_keywords_without_counts_keep_their_score():
+    matrix = _matrix({'AI': {'a': 600}})
+    new_scores = rescoring.WhatIfScorer().rescore(_frame(['AI', '예전'], [1, 3]), 1, matrix, SITE_IDS, [1, 1, 1])
+    assert new_scores.tolist() == [4, 3]
+
+def test_matrix_changes_invalidate_cached_counts():
+    matrix = _matrix({'AI': {'a': 10}})
+    scorer = rescoring.WhatIfScorer()
+    df = _frame(['AI'], [1])
+    assert scorer.rescore(df, 1, matrix, SITE_IDS, [1, 1, 1]).tolist() == [1]
+    matrix.set('AI', {'a': 300})
+    assert scorer.rescore(df, 1, matrix, SITE_IDS, [1, 1, 1]).tolist() == [3]
+
+def test_score_changes_counts_moves():
+    changes = rescoring.score_changes([1, 2, 3, 4], [2, 2, 1, 4])
+    assert changes['changed'].tolist() == [0, 2]
+    assert (changes['up'], changes['down']) == (1, 1)
+    assert changes['transitions'][0, 1] == 1 and changes['transitions'][2, 0] == 1 and changes['transitions'].sum() == 4
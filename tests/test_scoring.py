@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import scoring
+
+def _reference_score(counts, weights, thresholds=scoring.SCORE_THRESHOLDS, top_n=scoring.TOP_N_SITES):
+    # 앱의 원래 방식: 양수인 검색 결과 수 x 가중치 중 큰 값 top_n개를 더하고 기준선 몇 개를 넘었는지 셈
+    contributions = sorted((count * weight for count, weight in zip(counts, weights) if count > 0), reverse=True)
+    weighted_sum = sum(contributions[:top_n])
+    return weighted_sum, 1 + sum(weighted_sum >= threshold for threshold in thresholds)
+
+def test_score_matrix_matches_reference_on_random_counts():
+    rng = np.random.default_rng(0)
+    counts = np.floor(rng.lognormal(3.5, 1.5, size=(500, 5)))
+    counts[rng.random(counts.shape) < 0.2] = 0
+    weights = [2.0, 1.0, 1.0, 0.5, 3.0]
+    _, weighted_sum, scores = scoring.score_matrix(counts, weights)
+    expected = [_reference_score(row, weights) for row in counts]
+    assert np.allclose(weighted_sum, [total for total, _ in expected])
+    assert scores.tolist() == [score for _, score in expected]
+
+@pytest.mark.parametrize('weighted_sum, score', [(0, 1), (49.99, 1), (50, 2), (199, 2), (200, 3), (500, 4), (1e9, 4)])
+def test_thresholds_are_inclusive_lower_bounds(weighted_sum, score):
+    assert scoring.bin_scores([weighted_sum]).tolist() == [score]
+
+def test_top_site_indices_keep_site_order_on_ties():
+    assert scoring.top_site_indices(np.array([5.0, 10.0, 10.0, 0.0, 7.0]), top_n=3) == [1, 2, 4]
+    assert scoring.top_site_indices(np.array([0.0, 0.0])) == []
+
+def test_score_site_configs_summarizes_one_keyword():
+    site_configs = [{'name': 'A', 'weight': 2.0, 'user_count': 30}, {'name': 'B', 'user_count': 0}, {'name': 'C', 'weight': 0.5, 'user_count': 600}]
+    score, weighted_sum, raw_counts_summary, top_sites = scoring.score_site_configs(site_configs, (50, 200, 500))
+    assert (score, weighted_sum) == (3, 360.0)
+    assert raw_counts_summary['B'] == {'count': 0, 'weight': 1.0}
+    assert [site['name'] for site in top_sites] == ['C', 'A']
+
+def test_score_frame_treats_missing_and_bad_counts_as_zero():
+    df = pd.DataFrame({scoring.KEYWORD_COLUMN: ['AI', '기후'], 'DBpia': [30, 'x'], 'BIGKINDS': [None, 60]})
+    scored = scoring.score_frame(df, {'DBpia': 2.0, 'BIGKINDS': 1.0, '교보문고': 1.0})
+    assert scored[scoring.WEIGHTED_SUM_COLUMN].tolist() == [60.0, 60.0]
+    assert scored[scoring.SCORE_COLUMN].tolist() == [2, 2]
+
+def test_command_line_scores_csv(tmp_path):
+    source = tmp_path / 'in.csv'
+    pd.DataFrame({scoring.KEYWORD_COLUMN: ['AI', '기후'], 'DBpia': [100, 10], 'A': [400, 0]}).to_csv(source, index=False)
+    output = tmp_path / 'out.csv'
+    assert scoring.main([str(source), '-o', str(output), '-w', 'A=0.5']) == 0
+    scored = pd.read_csv(output, encoding='utf-8-sig')
+    assert scored[scoring.WEIGHTED_SUM_COLUMN].tolist() == [400.0, 20.0]
+    assert scored[scoring.SCORE_COLUMN].tolist() == [3, 1]
+
+def test_bad_weight_argument_is_a_usage_error(tmp_path):
+    source = tmp_path / 'in.csv'
+    pd.DataFrame({scoring.KEYWORD_COLUMN: ['AI'], 'DBpia': [1]}).to_csv(source, index=False)
+    with pytest.raises(SystemExit):
+        scoring.main([str(source), '-w', 'DBpia'])
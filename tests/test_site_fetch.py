@@ -0,0 +1,74 @@
+import pytest
+import requests
+
+import site_fetch
+import stub_server as stub
+
+KEYWORDS = [f"키워드{i}" for i in range(20)]
+# 요청 속도 제한과 재시도 대기로 테스트가 느려지지 않게 함
+FAST = {'rate_per_sec': 0, 'concurrency': 8}
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(site_fetch, 'BACKOFF_BASE_SEC', 0.0)
+
+@pytest.fixture
+def stub_server(request):
+    server = stub.start_stub_server(flaky_ratio=getattr(request, 'param', 0.0))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def _regex_adapter(server, name='stub'):
+    return site_fetch.RegexCountAdapter(name, f"http://127.0.0.1:{server.server_address[1]}/search?q={{query}}", stub.STUB_COUNT_PATTERN, **FAST)
+
+@pytest.mark.parametrize('stub_server', [0.5], indirect=True)
+def test_flaky_responses_are_retried(stub_server):
+    counts, errors = site_fetch.fetch_counts(KEYWORDS, [_regex_adapter(stub_server)], max_retries=40)
+    assert errors == []
+    assert counts['stub'].tolist() == [stub.expected_count(k) for k in KEYWORDS]
+    statuses = [status for _, status in stub_server.served]
+    assert statuses.count(200) == len(KEYWORDS)
+    assert 503 in statuses
+
+@pytest.mark.parametrize('stub_server', [0.3], indirect=True)
+def test_cache_hit_skips_requests_until_ttl_expires(stub_server):
+    cache = site_fetch.CountCache(':memory:')
+    first, _ = site_fetch.fetch_counts(KEYWORDS[:5], [_regex_adapter(stub_server)], cache, max_retries=40)
+    served = len(stub_server.served)
+    second, errors = site_fetch.fetch_counts(KEYWORDS[:5], [_regex_adapter(stub_server)], cache)
+    assert errors == [] and len(stub_server.served) == served
+    assert second['stub'].tolist() == first['stub'].tolist()
+    cache.ttl_sec = -1
+    site_fetch.fetch_counts(KEYWORDS[:5], [_regex_adapter(stub_server)], cache, max_retries=40)
+    assert sum(status == 200 for _, status in stub_server.served[served:]) == 5
+
+@pytest.mark.parametrize('stub_server', [1.0], indirect=True)
+def test_exhausted_retries_are_reported_per_keyword(stub_server):
+    counts, errors = site_fetch.fetch_counts(KEYWORDS[:3], [_regex_adapter(stub_server)], max_retries=2)
+    assert sorted(errors) == [f"'stub' / '{keyword}': HTTP 503" for keyword in KEYWORDS[:3]]
+    assert counts['stub'].isna().all()
+    assert len(stub_server.served) == 3 * 3
+
+def test_parse_errors_do_not_hide_other_sites(stub_server):
+    # JSON 사이트는 HTML 응답을 읽지 못해 재시도 없이 키워드마다 실패하고, 같은 키워드의 다른 사이트 결과는 남음
+    json_adapter = site_fetch.JsonCountAdapter('json', f"http://127.0.0.1:{stub_server.server_address[1]}/search?q={{query}}", 'total', **FAST)
+    counts, errors = site_fetch.fetch_counts(KEYWORDS[:3], [_regex_adapter(stub_server), json_adapter])
+    assert len(errors) == 3
+    assert all(any(f"'json' / '{keyword}'" in error for error in errors) for keyword in KEYWORDS[:3])
+    assert counts['stub'].tolist() == [stub.expected_count(k) for k in KEYWORDS[:3]]
+    assert counts['json'].isna().all()
+    assert len(stub_server.served) == 6
+
+def test_retry_after_is_clamped():
+    response = requests.Response()
+    response.headers['Retry-After'] = '86400'
+    assert site_fetch._retry_delay(0, response) == site_fetch.MAX_BACKOFF_SEC
+    response.headers['Retry-After'] = '2'
+    assert site_fetch._retry_delay(0, response) == 2.0
+
+def test_adapters_must_implement_parse_count():
+    class NoParser(site_fetch.SiteAdapter):
+        pass
+    with pytest.raises(TypeError):
+        NoParser('x', 'http://127.0.0.1/{query}')
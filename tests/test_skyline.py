@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import scoring
+import skyline
+
+def _brute_force_levels(values):
+    # 정의대로: 남은 점 중 다른 점에 지배되지 않는 점을 한 단계씩 벗겨냄
+    levels = np.zeros(len(values), dtype=np.int64)
+    remaining = np.arange(len(values))
+    level = 0
+    while len(remaining):
+        level += 1
+        points = values[remaining]
+        dominated = np.array([np.any(np.all(points >= point, axis=1) & np.any(points > point, axis=1)) for point in points])
+        levels[remaining[~dominated]] = level
+        remaining = remaining[dominated]
+    return levels
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('n', [1, 7, 300])
+def test_frontier_levels_match_brute_force(seed, n):
+    values = np.random.default_rng(seed).integers(1, 5, size=(n, len(skyline.SKYLINE_COLUMNS))).astype(float)
+    assert skyline.frontier_levels(values).tolist() == _brute_force_levels(values).tolist()
+
+def test_frontier_levels_with_continuous_values():
+    values = np.random.default_rng(0).random((200, 3))
+    assert skyline.frontier_levels(values).tolist() == _brute_force_levels(values).tolist()
+
+def test_non_numeric_rows_get_no_level():
+    df = pd.DataFrame({scoring.KEYWORD_COLUMN: ['가', '나', '다'], scoring.SCORE_COLUMN: [4, 'x', 1],
+                       '유레카지수': [4, 4, 1], '덕질가능지수': [4, 4, 1], '성장잠재력지수': [4, 4, 1]})
+    levels = skyline.with_frontier_levels(df)[skyline.LEVEL_COLUMN]
+    assert levels.isna().tolist() == [False, True, False]
+    assert levels.dropna().tolist() == [1, 2]
+
+def test_ranking_orders_by_level_then_total():
+    df = skyline.with_frontier_levels(pd.DataFrame({scoring.KEYWORD_COLUMN: list('가나다라'), scoring.SCORE_COLUMN: [1, 4, 2, 4],
+                                                    '유레카지수': [1, 1, 4, 1], '덕질가능지수': [1, 1, 2, 1], '성장잠재력지수': [1, 1, 2, 1]}))
+    assert df[skyline.LEVEL_COLUMN].tolist() == [2, 1, 1, 1]
+    assert skyline.frontier_ranking(df).tolist() == [2, 1, 3, 0]
+    assert skyline.level_counts(df[skyline.LEVEL_COLUMN]) == {1: 3, 2: 1}
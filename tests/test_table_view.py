@@ -0,0 +1,34 @@
+import library_db
+import scoring
+import skyline
+import table_view
+
+def _library(scores):
+    library = library_db.KeywordLibrary(':memory:')
+    for i, score in enumerate(scores):
+        library.add_keyword({scoring.KEYWORD_COLUMN: f"키워드{i:02d}", scoring.SCORE_COLUMN: score, '유레카지수': 2, '덕질가능지수': 2, '성장잠재력지수': 2})
+    return library
+
+def test_page_reads_sorted_window_from_library():
+    library = _library([1, 4, 2, 3, 4, 1])
+    view = table_view.TableView()
+    page_df, _, total_rows, total_pages, page = view.page(library, library.data_version(), sort_column=scoring.SCORE_COLUMN, descending=True, page=2, page_size=4)
+    assert (total_rows, total_pages, page) == (6, 2, 2)
+    assert page_df[scoring.KEYWORD_COLUMN].tolist() == ["키워드05", "키워드00"]
+    assert page_df.index.tolist() == [4, 5]
+    assert skyline.LEVEL_COLUMN in page_df.columns
+
+def test_page_colors_use_whole_library_range():
+    # 한 페이지에 같은 값만 있어도 전체 목록의 최소/최대 기준으로 색을 칠함
+    library = _library([1, 4, 4, 4])
+    view = table_view.TableView()
+    _, colors, _, _, _ = view.page(library, library.data_version(), search="키워드0", sort_column=scoring.SCORE_COLUMN, descending=True, page=1, page_size=2)
+    expected = table_view.gradient_css([1, 4])[1]
+    assert colors[scoring.SCORE_COLUMN].tolist() == [expected, expected]
+
+def test_search_and_page_clamping():
+    library = _library([1, 2, 3])
+    view = table_view.TableView()
+    page_df, _, total_rows, total_pages, page = view.page(library, library.data_version(), search="02", page=5, page_size=2)
+    assert (total_rows, total_pages, page) == (1, 1, 1)
+    assert page_df[scoring.KEYWORD_COLUMN].tolist() == ["키워드02"]
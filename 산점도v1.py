@@ -1,69 +1,68 @@
 import streamlit as st
 import numpy as np
 import pandas as pd
-import matplotlib
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-import seaborn as sns
-import io
-import base64
-import time
-import shutil
+import re
 import uuid
 
-# --- Matplotlib Font Setup ---
+import dedupe
+import export
+import importer
+import library_db
+import profiling
+import recommend
+import report
+import rescoring
+import scoring
+import site_fetch
+import skyline
+import table_view
+from keyword_store import KeywordStore
+
+# --- Lazy Chart Loading ---
+# matplotlib/seaborn은 그래프 섹션을 처음 열 때만 불러오고, 한글 폰트는 저장된 결과로 바로 설정
 @st.cache_resource
-def setup_font():
-    try:
-        shutil.rmtree(matplotlib.get_cachedir(), ignore_errors=True)
-    except Exception:
-        pass
-    try:
-        fm._fontManager = fm.FontManager() 
-    except Exception:
-        st.warning("폰트 매니저를 새로고침하는 중 오류가 발생했어요. 기본 폰트로 진행할게요!")
-
-    font_name_to_set = None
-    korean_fonts_priority = ["NanumSquareRound", "NanumGothic", "Malgun Gothic", "AppleSDGothicNeo"]
-    available_font_names = [f.name for f in fm.fontManager.ttflist]
-
-    for font in korean_fonts_priority:
-        if font in available_font_names:
-            font_name_to_set = font
-            break
-    if not font_name_to_set:
-        for font_info in fm.fontManager.ttflist:
-            if any(kor_font.lower() in font_info.name.lower() for kor_font in korean_fonts_priority):
-                font_name_to_set = font_info.name
-                break
-    
-    if font_name_to_set:
-        try:
-            plt.rcParams['font.family'] = font_name_to_set
-            plt.rcParams['axes.unicode_minus'] = False
-        except Exception: 
-            plt.rcParams['font.family'] = 'sans-serif'
-            plt.rcParams['axes.unicode_minus'] = False
-    else: 
-        plt.rcParams['font.family'] = 'sans-serif'
-        plt.rcParams['axes.unicode_minus'] = False
-    
-    sns.set_theme(style="whitegrid", rc={"font.family": plt.rcParams.get('font.family', 'sans-serif'), "axes.unicode_minus": False})
-
-setup_font()
+def load_chart_module():
+    import fonts
+    with profile_span('font_setup'):
+        fonts.setup_font()
+    import chart
+    return chart
 
 # --- Helper Functions ---
-def get_color_palette(n):
-    base_colors = ['#FF9AA2', '#FFB7B2', '#FFDAC1', '#E2F0CB', '#B5EAD7', '#C7CEEA', '#B5B9FF', '#ADE8F4']
-    return (base_colors * (n // len(base_colors) + 1))[:n]
-
-def fig_to_base64(fig):
-    buf = io.BytesIO()
-    fig.savefig(buf, format='png', bbox_inches='tight', dpi=150)
-    plt.close(fig)
-    buf.seek(0)
-    img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-    return img_base64
+def profile_span(name):
+    # 프로파일링이 꺼져 있으면 profiling.NULL_SPAN (아무 일도 하지 않는 공유 객체)
+    return st.session_state.profiler.span(name)
+
+@st.cache_resource
+def get_keyword_library():
+    # 모든 세션이 같은 라이브러리 객체를 씀. 세션마다 불러 둔 사이트 목록과 점수 기준은 sync_site_settings로 최신 상태를 맞춤
+    return library_db.KeywordLibrary()
+
+def sync_site_settings(force=False):
+    # 다른 세션이 사이트나 점수 기준을 바꿨으면 다시 불러옴 (이 세션에서 입력 중인 검색 결과 수는 유지)
+    # 버전을 먼저 읽어서, 불러오는 사이에 바뀌면 다음 실행에서 한 번 더 불러오게 함
+    settings_version = keyword_library.settings_version()
+    if not force and settings_version == st.session_state.site_settings_version:
+        return
+    user_counts = {site_config['id']: site_config.get('user_count', 0) for site_config in st.session_state.site_configs}
+    site_configs = keyword_library.load_sites()
+    for site_config in site_configs:
+        site_config['user_count'] = user_counts.get(site_config['id'], 0)
+    st.session_state.site_configs = site_configs
+    st.session_state.score_thresholds = tuple(keyword_library.load_setting('score_thresholds', scoring.SCORE_THRESHOLDS))
+    st.session_state.site_settings_version = settings_version
+
+@st.cache_resource
+def get_render_cache():
+    return load_chart_module().RenderCache()
+
+@st.cache_resource
+def get_report_renderer():
+    return report.ReportRenderer()
+
+@st.cache_resource
+def get_count_cache():
+    return site_fetch.CountCache()
 
 def download_button_component(label, data, file_name, mime, key_suffix):
     st.download_button(
@@ -147,53 +146,229 @@ def display_html_message(message_text, type="success", icon_char_override=None,
         <span style="font-size: 1.0em;">{message_text}</span>
     </div>
     """
-    message_placeholder = st.empty()
-    message_placeholder.markdown(message_html, unsafe_allow_html=True)
-    
     if duration_sec > 0:
-        time.sleep(duration_sec)
-        message_placeholder.empty()
+        # 스크립트를 멈추지 않고 큐에 넣어두면 flush_notifications()가 브라우저에서 사라지는 알림으로 그려줌 (st.rerun() 뒤에도 유지)
+        st.session_state.notification_queue.append((uuid.uuid4().hex, message_html, duration_sec))
+    else:
+        st.markdown(message_html, unsafe_allow_html=True)
+
+def flush_notifications():
+    if not st.session_state.notification_queue:
+        return
+    toasts_html = "".join(
+        f'<div id="kw-toast-{toast_id}" style="animation: kw-toast-expire 0.4s ease {duration_sec}s forwards;">{message_html}</div>'
+        for toast_id, message_html, duration_sec in st.session_state.notification_queue
+    )
+    st.session_state.notification_queue = []
+    st.markdown(f"""
+    <style>@keyframes kw-toast-expire {{ to {{ opacity: 0; visibility: hidden; }} }}</style>
+    <div style="position: fixed; top: 4.5rem; left: 50%; transform: translateX(-50%); z-index: 999999; pointer-events: none; width: max-content; max-width: 90vw;">
+        {toasts_html}
+    </div>
+    """, unsafe_allow_html=True)
 
 # --- State Initialization ---
-if 'keywords_data' not in st.session_state:
-    st.session_state.keywords_data = pd.DataFrame(columns=['키워드', '데이터가용성점수', '유레카지수', '덕질가능지수', '성장잠재력지수'])
+# ?profile=1 또는 KEYWORD_APP_PROFILE 환경 변수로 이번 실행의 구간 측정 여부를 정함
+if 'profiler' not in st.session_state: st.session_state.profiler = profiling.Profiler()
+st.session_state.profiler.begin_run(st.query_params.get(profiling.PROFILE_QUERY_PARAM))
+keyword_library = get_keyword_library()
 if 'site_configs' not in st.session_state:
-    st.session_state.site_configs = [
+    # 저장된 사이트 설정이 있으면 복원, 없으면 기본값으로 시작해서 저장
+    st.session_state.site_settings_version = keyword_library.settings_version()
+    st.session_state.site_configs = keyword_library.load_sites() or keyword_library.seed_sites([
         {'id': str(uuid.uuid4()), 'name': 'DBpia', 'weight': 2.0, 'is_default': True, 'user_count': 0},
         {'id': str(uuid.uuid4()), 'name': 'BIGKINDS', 'weight': 1.0, 'is_default': True, 'user_count': 0},
         {'id': str(uuid.uuid4()), 'name': '교보문고', 'weight': 1.0, 'is_default': True, 'user_count': 0},
-    ]
+    ])
 else: 
     for i in range(len(st.session_state.site_configs)):
         if 'id' not in st.session_state.site_configs[i]: st.session_state.site_configs[i]['id'] = str(uuid.uuid4())
         if 'user_count' not in st.session_state.site_configs[i]: st.session_state.site_configs[i]['user_count'] = 0
         if 'is_default' not in st.session_state.site_configs[i]: st.session_state.site_configs[i]['is_default'] = False
 
+# 전체 키워드 목록은 시작할 때 불러오지 않음 (get_keyword_store 참고)
+if 'keyword_store' not in st.session_state: st.session_state.keyword_store = None
+if 'keyword_store_version' not in st.session_state: st.session_state.keyword_store_version = None
+if 'keyword_counts' not in st.session_state: st.session_state.keyword_counts = None
 if 'keyword_input_val' not in st.session_state: st.session_state.keyword_input_val = ""
 if 'eureka_slider_val' not in st.session_state: st.session_state.eureka_slider_val = 2
 if 'fan_slider_val' not in st.session_state: st.session_state.fan_slider_val = 2
 if 'potential_slider_val' not in st.session_state: st.session_state.potential_slider_val = 2
 if 'data_availability_score_result' not in st.session_state: st.session_state.data_availability_score_result = None
 if 'show_graph_section' not in st.session_state: st.session_state.show_graph_section = False
+if 'import_rejected_rows' not in st.session_state: st.session_state.import_rejected_rows = None
+if 'graph_jitter_seed' not in st.session_state: st.session_state.graph_jitter_seed = 0
+if 'notification_queue' not in st.session_state: st.session_state.notification_queue = []
+if 'export_cache' not in st.session_state: st.session_state.export_cache = export.ExportCache()
+if 'rec_pages_per_quadrant' not in st.session_state: st.session_state.rec_pages_per_quadrant = {}
+if 'keyword_table_view' not in st.session_state: st.session_state.keyword_table_view = table_view.TableView()
+if 'bulk_fetch_result' not in st.session_state: st.session_state.bulk_fetch_result = None
+if 'score_thresholds' not in st.session_state: st.session_state.score_thresholds = tuple(keyword_library.load_setting('score_thresholds', scoring.SCORE_THRESHOLDS))
+if 'what_if_scorer' not in st.session_state: st.session_state.what_if_scorer = rescoring.WhatIfScorer()
+if 'report_bundle' not in st.session_state: st.session_state.report_bundle = (None, None)
+if 'dedupe_threshold' not in st.session_state: st.session_state.dedupe_threshold = float(keyword_library.load_setting('dedupe_threshold', dedupe.DEFAULT_SIMILARITY_THRESHOLD))
+if 'pending_near_duplicate' not in st.session_state: st.session_state.pending_near_duplicate = None
+if 'duplicate_groups' not in st.session_state: st.session_state.duplicate_groups = (None, None, [])
+if 'ranked_keyword_frame' not in st.session_state: st.session_state.ranked_keyword_frame = (None, None)
+if 'frontier_shortlist_size' not in st.session_state: st.session_state.frontier_shortlist_size = recommend.DEFAULT_TOP_K
+if 'site_settings_version' not in st.session_state: st.session_state.site_settings_version = None
+sync_site_settings()
 
 # --- Core Logic Functions ---
 def calculate_data_availability_score_from_configs():
-    site_contributions = []
-    raw_counts_summary = {}
+    return scoring.score_site_configs(st.session_state.site_configs, st.session_state.score_thresholds)
+
+def get_keyword_store():
+    # 모든 키워드가 필요한 기능(그래프, 보고서, 내보내기, 점수 다시 계산, 비슷한 키워드)을 처음 쓸 때 불러오고,
+    # 다른 세션이 라이브러리를 고쳐서 버전이 달라졌으면 다시 불러옴. 표와 삭제 검색은 DB에서 페이지 단위로 읽음
+    library_version = keyword_library.data_version()
+    if st.session_state.keyword_store is None or st.session_state.keyword_store_version != library_version:
+        with profile_span('library_load'):
+            keyword_store = KeywordStore()
+            keyword_store.extend(keyword_library.load_keywords())
+            st.session_state.keyword_counts = rescoring.SiteCountMatrix.from_frame(keyword_library.load_counts())
+        st.session_state.keyword_store, st.session_state.keyword_store_version = keyword_store, library_version
+        st.session_state.pop('duplicate_index', None)
+    return st.session_state.keyword_store
+
+def record_keyword_write(apply_locally):
+    # 라이브러리에 쓴 직후 호출: 불러 둔 목록이 바로 전 버전이면 같은 변경을 메모리에도 반영하고,
+    # 그 사이 다른 세션의 쓰기가 끼어들었으면 버려서 다음에 쓸 때 다시 불러오게 함
+    if st.session_state.keyword_store is None:
+        return
+    library_version = keyword_library.data_version()
+    if library_version == st.session_state.keyword_store_version + 1:
+        apply_locally(st.session_state.keyword_store, st.session_state.keyword_counts)
+        st.session_state.keyword_store_version = library_version
+    else:
+        st.session_state.keyword_store = None
+        st.session_state.pop('duplicate_index', None)
+
+def preview_rescore(weights, thresholds):
+    # 저장된 원본 검색 결과 수로 전체 키워드 점수를 다시 계산 (반영은 하지 않음)
+    keywords_df = get_keyword_store().frame()
+    site_ids = [site_config['id'] for site_config in st.session_state.site_configs]
+    new_scores = st.session_state.what_if_scorer.rescore(keywords_df, st.session_state.keyword_store_version, st.session_state.keyword_counts, site_ids, weights, thresholds)
+    return keywords_df, new_scores, rescoring.score_changes(keywords_df[scoring.SCORE_COLUMN].to_numpy(dtype=int), new_scores)
+
+def rescore_library():
+    # 현재 사이트 설정과 기준선으로 다시 계산해서 점수가 바뀐 키워드만 목록과 라이브러리에 반영
+    # 다른 세션이 바꾼 사이트까지 반영된 설정으로 계산해야 공유 라이브러리의 점수가 어긋나지 않음
+    sync_site_settings(force=True)
+    if not keyword_library.count_keywords():
+        return 0
+    weights = [float(site_config['weight']) for site_config in st.session_state.site_configs]
+    with profile_span('scoring_library'):
+        keywords_df, new_scores, changes = preview_rescore(weights, st.session_state.score_thresholds)
+    changed = changes['changed']
+    if len(changed):
+        changed_keywords = keywords_df[scoring.KEYWORD_COLUMN].to_numpy()[changed].tolist()
+        keyword_library.update_scores(changed_keywords, new_scores[changed])
+        record_keyword_write(lambda keyword_store, _: keyword_store.update_column(scoring.SCORE_COLUMN, changed_keywords, new_scores[changed].tolist()))
+    return len(changed)
+
+def ranked_keyword_frame():
+    # 키워드 목록 + 최전선 단계 열. 목록이 바뀔 때만 다시 계산해서 내보내기와 그래프가 같이 씀 (표는 DB에 저장된 단계를 읽음)
+    keyword_store = get_keyword_store()
+    ranked_version, ranked_df = st.session_state.ranked_keyword_frame
+    if ranked_version != st.session_state.keyword_store_version:
+        with profile_span('skyline'):
+            ranked_df = skyline.with_frontier_levels(keyword_store.frame())
+        st.session_state.ranked_keyword_frame = (st.session_state.keyword_store_version, ranked_df)
+    return ranked_df
+
+def show_more_frontier_keywords():
+    st.session_state.frontier_shortlist_size += recommend.DEFAULT_TOP_K
+
+def get_duplicate_index():
+    # 비슷한 키워드 색인은 처음 쓸 때 목록 전체로 만들고, 그 뒤로는 추가/삭제할 때 같이 고침
+    keyword_store = get_keyword_store()
+    if 'duplicate_index' not in st.session_state:
+        st.session_state.duplicate_index = dedupe.NearDuplicateIndex(keyword_store.keywords())
+    return st.session_state.duplicate_index
+
+def index_keywords(keywords, removed=False):
+    duplicate_index = st.session_state.get('duplicate_index')
+    if duplicate_index is not None:
+        for keyword in keywords:
+            if removed:
+                duplicate_index.remove(keyword)
+            else:
+                duplicate_index.add(keyword)
+
+def add_keyword_row(row, site_counts):
+    keyword_library.add_keyword(row, site_counts)
+
+    def apply_locally(keyword_store, keyword_counts):
+        keyword_store.add(row)
+        keyword_counts.set(row[scoring.KEYWORD_COLUMN], site_counts)
+        index_keywords([row[scoring.KEYWORD_COLUMN]])
+    record_keyword_write(apply_locally)
+
+def merge_into_keyword(existing_keyword, row, site_counts):
+    # 새로 계산한 점수/지수와 검색 결과 수로 기존 키워드를 덮어씀 (키워드 이름은 기존 것 유지)
+    merged_row = {**row, scoring.KEYWORD_COLUMN: existing_keyword}
+    keyword_library.update_keyword(merged_row, site_counts)
+
+    def apply_locally(keyword_store, keyword_counts):
+        keyword_store.update(existing_keyword, **{column: merged_row[column] for column in scoring.TABLE_COLUMNS if column != scoring.KEYWORD_COLUMN})
+        keyword_counts.set(existing_keyword, site_counts)
+    record_keyword_write(apply_locally)
+
+def merge_duplicate_groups(groups):
+    # 묶음마다 대표 키워드만 남기고 나머지를 목록, 라이브러리, 색인에서 지움.
+    # 지운 키워드의 검색 결과 수는 대표 키워드에 합치고, 합친 수로 대표 키워드 점수를 다시 계산
+    site_weights = {site_config['id']: float(site_config['weight']) for site_config in st.session_state.site_configs}
+    deleted_count, merged = keyword_library.merge_keywords(groups, site_weights, st.session_state.score_thresholds)
+    duplicates = [keyword for group in groups if group[0] in merged for keyword in group[1:]]
+
+    def apply_locally(keyword_store, keyword_counts):
+        for keyword in duplicates:
+            keyword_store.remove(keyword)
+            keyword_counts.remove(keyword)
+        for keyword, (score, site_counts) in merged.items():
+            keyword_store.update(keyword, **{scoring.SCORE_COLUMN: score})
+            keyword_counts.set(keyword, site_counts)
+        index_keywords(duplicates, removed=True)
+    record_keyword_write(apply_locally)
+    return deleted_count
+
+def save_dedupe_threshold():
+    st.session_state.dedupe_threshold = float(st.session_state.dedupe_threshold_slider)
+    keyword_library.save_setting('dedupe_threshold', st.session_state.dedupe_threshold)
+
+def fetchable_site_adapters():
+    # 검색 주소와 결과 수 패턴을 설정한 사이트만 자동 수집 대상
+    adapters = {}
     for site_config in st.session_state.site_configs:
-        count = int(site_config.get('user_count', 0))
-        weight = float(site_config.get('weight', 1.0))
-        raw_counts_summary[site_config['name']] = {'count': count, 'weight': weight}
-        if count > 0:
-             site_contributions.append({'name': site_config['name'], 'contribution': count * weight, 'raw_count': count, 'weight': weight})
-    sorted_sites = sorted(site_contributions, key=lambda x: x['contribution'], reverse=True)
-    top_sites_for_score = sorted_sites[:3]
-    weighted_sum = sum(s['contribution'] for s in top_sites_for_score)
-    score = 1
-    if weighted_sum >= 500: score = 4
-    elif weighted_sum >= 200: score = 3
-    elif weighted_sum >= 50: score = 2
-    return score, weighted_sum, raw_counts_summary, top_sites_for_score
+        try:
+            adapter = site_fetch.adapter_from_site_config(site_config)
+        except (ValueError, re.error):
+            adapter = None
+        if adapter is not None:
+            adapters[site_config['id']] = adapter
+    return adapters
+
+def fetch_counts_for_input_keyword():
+    keyword = st.session_state.get('main_keyword_input', '').strip()
+    adapters = fetchable_site_adapters()
+    if not keyword:
+        display_html_message("키워드를 입력해주세요!", type="warning_red_text", duration_sec=2)
+        return
+    counts_df, errors = site_fetch.fetch_counts([keyword], list(adapters.values()), get_count_cache())
+    for site_config in st.session_state.site_configs:
+        adapter = adapters.get(site_config['id'])
+        if adapter is not None and pd.notna(counts_df.at[0, adapter.name]):
+            site_config['user_count'] = int(counts_df.at[0, adapter.name])
+            st.session_state[f"count_input_{site_config['id']}"] = site_config['user_count']
+    if errors:
+        display_html_message(f"일부 사이트에서 가져오지 못했어요: {errors[0]}", type="warning_red_text", duration_sec=3)
+    else:
+        display_html_message(f"'{keyword}' 검색 결과 수를 가져왔어요!", type="success", icon_char_override="🌐", duration_sec=1.5)
+
+def show_more_recommendations(quadrant_code):
+    rec_pages = st.session_state.rec_pages_per_quadrant
+    rec_pages[quadrant_code] = rec_pages.get(quadrant_code, 1) + 1
 
 def reset_inputs():
     st.session_state.keyword_input_val = ""
@@ -213,9 +388,8 @@ st.markdown("""
     </div>
     """, unsafe_allow_html=True)
 
-with st.sidebar:
-    st.title("⚙️ 검색 사이트 설정")
-    st.caption("여기서 검색할 사이트와 가중치를 마음대로 바꿀 수 있어요!")
+@st.experimental_fragment
+def site_settings_fragment():
     with st.expander("➕ 새 사이트 추가하기", expanded=False):
         with st.form("new_site_form"):
             new_site_name = st.text_input("새 사이트 이름")
@@ -227,253 +401,497 @@ with st.sidebar:
                         st.warning(f"'{new_site_name}' 사이트는 이미 있어요!")
                     else:
                         st.session_state.site_configs.append({'id': str(uuid.uuid4()), 'name': new_site_name.strip(), 'weight': new_site_weight, 'is_default': False, 'user_count': 0})
-                        st.success(f"'{new_site_name}' 사이트가 추가되었어요!")
-                        st.experimental_rerun()
+                        keyword_library.save_sites(st.session_state.site_configs[-1:])
+                        rescored_count = rescore_library()
+                        display_html_message(f"'{new_site_name.strip()}' 사이트가 추가되었어요!" + (f" (점수가 바뀐 키워드 {rescored_count:,}개)" if rescored_count else ""), type="success")
+                        st.rerun()
                 else:
                     st.warning("새 사이트 이름을 입력해주세요!")
+    with st.expander("📏 점수 구간 기준 (가중치 합계)", expanded=False):
+        st.caption("가중치 합계가 기준 이상이면 한 단계 높은 점수예요. (2점 / 3점 / 4점)")
+        threshold_cols = st.columns(3)
+        pending_thresholds = tuple(
+            float(threshold_cols[t_idx].number_input(f"{t_idx + 2}점 기준", min_value=0.0, value=float(st.session_state.score_thresholds[t_idx]), step=10.0, key=f"score_threshold_{t_idx}"))
+            for t_idx in range(len(scoring.SCORE_THRESHOLDS))
+        )
+        if st.button("💾 기준 저장", key="save_score_thresholds", use_container_width=True):
+            if any(a >= b for a, b in zip(pending_thresholds, pending_thresholds[1:])):
+                st.warning("기준은 2점 < 3점 < 4점 순서로 커져야 해요!")
+            else:
+                st.session_state.score_thresholds = pending_thresholds
+                keyword_library.save_setting('score_thresholds', list(pending_thresholds))
+                rescored_count = rescore_library()
+                display_html_message(f"점수 구간 기준을 저장했어요! (점수가 바뀐 키워드 {rescored_count:,}개)", type="success")
+                st.rerun()
     st.markdown("---")
     st.subheader("현재 설정된 사이트 목록:")
     sites_to_delete_ids_sidebar = []
-    for i, site_config_sidebar in enumerate(st.session_state.site_configs):
-        with st.container():
-            st.markdown(f"**{site_config_sidebar['name']}** (현재 가중치: {site_config_sidebar['weight']})")
-            col1_edit, col2_edit, col3_edit = st.columns([3,2,1])
-            new_name_sidebar = col1_edit.text_input(f"이름 변경##{site_config_sidebar['id']}", value=site_config_sidebar['name'], label_visibility="collapsed")
-            new_weight_sidebar = col2_edit.number_input(f"가중치 변경##{site_config_sidebar['id']}", value=float(site_config_sidebar['weight']), min_value=0.1, step=0.1, label_visibility="collapsed")
-            action_col = col3_edit
-            if action_col.button("💾", key=f"save_sidebar_{site_config_sidebar['id']}", help="이 사이트 정보 저장"):
-                is_duplicate = False
-                if new_name_sidebar.strip().lower() != site_config_sidebar['name'].lower():
-                    if any(s['name'].lower() == new_name_sidebar.strip().lower() for s_idx, s in enumerate(st.session_state.site_configs) if s_idx != i):
-                        is_duplicate = True
-                if not new_name_sidebar.strip(): st.warning(f"'{site_config_sidebar['name']}' 사이트의 이름은 비워둘 수 없어요!")
-                elif is_duplicate: st.warning(f"'{new_name_sidebar.strip()}' 이름은 이미 다른 사이트가 사용 중이에요!")
-                else:
-                    st.session_state.site_configs[i]['name'] = new_name_sidebar.strip()
-                    st.session_state.site_configs[i]['weight'] = new_weight_sidebar
-                    st.success(f"'{st.session_state.site_configs[i]['name']}' 정보가 업데이트되었어요!")
-                    st.experimental_rerun()
-            if not site_config_sidebar.get('is_default', False) or len(st.session_state.site_configs) > 1:
-                if action_col.button("🗑️", key=f"delete_sidebar_{site_config_sidebar['id']}", help="이 사이트 삭제"):
-                    sites_to_delete_ids_sidebar.append(site_config_sidebar['id'])
-            else: action_col.caption("기본")
-            st.markdown("---")
+    pending_weights = []
+    with profile_span('sidebar_loop'):
+        for i, site_config_sidebar in enumerate(st.session_state.site_configs):
+            with st.container():
+                st.markdown(f"**{site_config_sidebar['name']}** (현재 가중치: {site_config_sidebar['weight']})")
+                col1_edit, col2_edit, col3_edit = st.columns([3,2,1])
+                new_name_sidebar = col1_edit.text_input(f"이름 변경##{site_config_sidebar['id']}", value=site_config_sidebar['name'], label_visibility="collapsed")
+                new_weight_sidebar = col2_edit.number_input(f"가중치 변경##{site_config_sidebar['id']}", value=float(site_config_sidebar['weight']), min_value=0.1, step=0.1, label_visibility="collapsed")
+                pending_weights.append(float(new_weight_sidebar))
+                with st.expander("🔗 자동 수집 설정", expanded=False):
+                    new_search_url_sidebar = st.text_input("검색 주소 ({query} 자리에 키워드)", value=site_config_sidebar.get('search_url', ''), key=f"search_url_{site_config_sidebar['id']}", placeholder="https://example.com/search?q={query}")
+                    new_count_pattern_sidebar = st.text_input("결과 수 정규식 (JSON이면 json:경로)", value=site_config_sidebar.get('count_pattern', ''), key=f"count_pattern_{site_config_sidebar['id']}", placeholder="검색결과 ([\\d,]+)건")
+                    st.caption("입력 후 💾 버튼을 눌러 저장하세요.")
+                action_col = col3_edit
+                if action_col.button("💾", key=f"save_sidebar_{site_config_sidebar['id']}", help="이 사이트 정보 저장"):
+                    is_duplicate = False
+                    if new_name_sidebar.strip().lower() != site_config_sidebar['name'].lower():
+                        if any(s['name'].lower() == new_name_sidebar.strip().lower() for s_idx, s in enumerate(st.session_state.site_configs) if s_idx != i):
+                            is_duplicate = True
+                    new_search_url_sidebar, new_count_pattern_sidebar = new_search_url_sidebar.strip(), new_count_pattern_sidebar.strip()
+                    fetch_config_error = None
+                    if new_search_url_sidebar or new_count_pattern_sidebar:
+                        try:
+                            if site_fetch.adapter_from_site_config({'name': new_name_sidebar.strip(), 'search_url': new_search_url_sidebar, 'count_pattern': new_count_pattern_sidebar}) is None:
+                                fetch_config_error = "검색 주소와 결과 수 패턴을 모두 입력해주세요!"
+                        except (ValueError, re.error) as e:
+                            fetch_config_error = f"자동 수집 설정을 확인해주세요: {e}"
+                    if not new_name_sidebar.strip(): st.warning(f"'{site_config_sidebar['name']}' 사이트의 이름은 비워둘 수 없어요!")
+                    elif is_duplicate: st.warning(f"'{new_name_sidebar.strip()}' 이름은 이미 다른 사이트가 사용 중이에요!")
+                    elif fetch_config_error: st.warning(fetch_config_error)
+                    else:
+                        st.session_state.site_configs[i]['name'] = new_name_sidebar.strip()
+                        st.session_state.site_configs[i]['weight'] = new_weight_sidebar
+                        st.session_state.site_configs[i]['search_url'] = new_search_url_sidebar
+                        st.session_state.site_configs[i]['count_pattern'] = new_count_pattern_sidebar
+                        keyword_library.save_sites([st.session_state.site_configs[i]])
+                        rescored_count = rescore_library()
+                        display_html_message(f"'{st.session_state.site_configs[i]['name']}' 정보가 업데이트되었어요!" + (f" (점수가 바뀐 키워드 {rescored_count:,}개)" if rescored_count else ""), type="success")
+                        st.rerun()
+                if not site_config_sidebar.get('is_default', False) or len(st.session_state.site_configs) > 1:
+                    if action_col.button("🗑️", key=f"delete_sidebar_{site_config_sidebar['id']}", help="이 사이트 삭제"):
+                        sites_to_delete_ids_sidebar.append(site_config_sidebar['id'])
+                else: action_col.caption("기본")
+                st.markdown("---")
     if sites_to_delete_ids_sidebar:
         st.session_state.site_configs = [s for s in st.session_state.site_configs if s['id'] not in sites_to_delete_ids_sidebar]
-        st.success("선택한 사이트가 삭제되었어요!")
-        st.experimental_rerun()
-
-st.markdown("<div style='text-align:center;'><h2 style='margin-bottom:0px;'>📝 새로운 키워드 입력</h2></div>", unsafe_allow_html=True)
-st.session_state.keyword_input_val = st.text_input(
-    '📌 키워드 입력:', value=st.session_state.keyword_input_val,
-    placeholder='연구하고 싶은 주제 키워드를 입력하세요', key="main_keyword_input",
-    label_visibility="collapsed"
-).strip()
-
-st.markdown("<div style='text-align:center;'><h3 style='font-weight:normal; margin-top:20px; margin-bottom:5px;'>각 사이트별 검색 결과 수 입력</h3></div>", unsafe_allow_html=True)
-st.markdown("<div style='text-align:center;'><p style='color:grey; font-size:0.9em; margin-bottom:15px;'>*직접 검색해서 검색 결과를 입력해보세요.</p></div>", unsafe_allow_html=True)
-
-for site_idx, site_config_main in enumerate(st.session_state.site_configs):
-    current_val_main = int(site_config_main.get('user_count', 0))
-    st.session_state.site_configs[site_idx]['user_count'] = st.number_input(
-        f"📚 {site_config_main['name']} (가중치: {site_config_main['weight']}):", min_value=0,
-        value=current_val_main, key=f"count_input_{site_config_main['id']}", step=1
-    )
-
-calc_button_cols = st.columns([1, 1.8, 1]) 
-with calc_button_cols[1]:
-    if st.button('🔍 데이터 가용성 점수 계산하기', key="calc_avail_button_main", use_container_width=True):
-        if not st.session_state.keyword_input_val:
-            # 2. "키워드를 입력해주세요!" 빨간 글씨, ⚠️ 아이콘
-            display_html_message("키워드를 입력해주세요!", type="warning_red_text", duration_sec=2)
+        keyword_library.delete_sites(sites_to_delete_ids_sidebar)
+        rescored_count = rescore_library()
+        display_html_message("선택한 사이트가 삭제되었어요!" + (f" (점수가 바뀐 키워드 {rescored_count:,}개)" if rescored_count else ""), type="info", icon_char_override="🗑️")
+        st.rerun()
+    # 저장하기 전의 가중치/기준으로 전체 목록을 미리 다시 계산해서 점수 변화를 보여줌
+    saved_weights = [float(site_config['weight']) for site_config in st.session_state.site_configs]
+    if (pending_weights != saved_weights or pending_thresholds != tuple(st.session_state.score_thresholds)) and keyword_library.count_keywords():
+        with profile_span('scoring_preview'):
+            _, _, preview_changes = preview_rescore(pending_weights, pending_thresholds)
+        if len(preview_changes['changed']):
+            st.markdown(f"**💡 저장하면 {len(preview_changes['changed']):,}개 키워드의 점수가 바뀌어요** (⬆️ {preview_changes['up']:,} / ⬇️ {preview_changes['down']:,})")
+            score_labels = [f"{level}점" for level in range(1, rescoring.SCORE_LEVELS + 1)]
+            st.dataframe(pd.DataFrame(preview_changes['transitions'], index=pd.Index(score_labels, name="지금 → 저장 후"), columns=score_labels), use_container_width=True)
         else:
-            has_any_count = any(int(site.get('user_count',0)) > 0 for site in st.session_state.site_configs)
-            if not has_any_count:
-                display_html_message("검색 결과 수를 입력해주세요!", type="warning_red_text", duration_sec=2)
+            st.caption("💡 저장해도 점수가 바뀌는 키워드는 없어요.")
+    flush_notifications()
+
+@st.experimental_fragment
+def keyword_input_fragment():
+    st.markdown("<div style='text-align:center;'><h2 style='margin-bottom:0px;'>📝 새로운 키워드 입력</h2></div>", unsafe_allow_html=True)
+    st.session_state.keyword_input_val = st.text_input(
+        '📌 키워드 입력:', value=st.session_state.keyword_input_val,
+        placeholder='연구하고 싶은 주제 키워드를 입력하세요', key="main_keyword_input",
+        label_visibility="collapsed"
+    ).strip()
+
+    st.markdown("<div style='text-align:center;'><h3 style='font-weight:normal; margin-top:20px; margin-bottom:5px;'>각 사이트별 검색 결과 수 입력</h3></div>", unsafe_allow_html=True)
+    st.markdown("<div style='text-align:center;'><p style='color:grey; font-size:0.9em; margin-bottom:15px;'>*직접 검색해서 검색 결과를 입력해보세요.</p></div>", unsafe_allow_html=True)
+    if fetchable_site_adapters():
+        fetch_button_cols = st.columns([1, 1.8, 1])
+        fetch_button_cols[1].button("🌐 검색 결과 수 자동으로 가져오기", key="fetch_counts_button", use_container_width=True, on_click=fetch_counts_for_input_keyword,
+                                    help="사이드바에서 자동 수집을 설정한 사이트만 가져와요.")
+
+    for site_idx, site_config_main in enumerate(st.session_state.site_configs):
+        current_val_main = int(site_config_main.get('user_count', 0))
+        st.session_state.site_configs[site_idx]['user_count'] = st.number_input(
+            f"📚 {site_config_main['name']} (가중치: {site_config_main['weight']}):", min_value=0,
+            value=current_val_main, key=f"count_input_{site_config_main['id']}", step=1
+        )
+
+    calc_button_cols = st.columns([1, 1.8, 1]) 
+    with calc_button_cols[1]:
+        if st.button('🔍 데이터 가용성 점수 계산하기', key="calc_avail_button_main", use_container_width=True):
+            if not st.session_state.keyword_input_val:
+                # 2. "키워드를 입력해주세요!" 빨간 글씨, ⚠️ 아이콘
+                display_html_message("키워드를 입력해주세요!", type="warning_red_text", duration_sec=2)
             else:
-                with st.spinner(""): # Spinner text removed
-                    time.sleep(0.5) 
-                    score, weighted_sum, raw_counts_summary, top_sites_for_score = calculate_data_availability_score_from_configs()
-                    st.session_state.data_availability_score_result = (score, weighted_sum, raw_counts_summary, top_sites_for_score)
-                display_html_message("분석 완료!", type="success", icon_char_override="✅", duration_sec=1)
-
-
-if st.session_state.data_availability_score_result:
-    score, weighted_sum, raw_counts_summary, top_sites_for_score = st.session_state.data_availability_score_result
-    emoji, message, color = {
-        4: ("🎉", "풍년일세! 자료가 넘쳐나서 행복한 고민이에요!", "#32CD32"),
-        3: ("👌", "이 정도면 충분! 파고들 만하겠어요!", "#1E90FF"),
-        2: ("💧", "가뭄의 단비... 자료가 좀 부족하지만, 희귀템을 노려볼까요?", "#FFA500"),
-        1: ("🏜️", "사막인가요... 정말 특별한 각오가 필요하겠어요!", "#FF4500"),
-    }.get(score, ("🤔", "음... 점수를 다시 확인해봐야겠어요.", "#808080"))
-    result_html = f"""
-    <div style="background-color: #f0f0f0; padding: 15px; border-radius: 10px; margin: 20px auto; text-align:center; max-width: 700px;">
-        <h3 style="text-align:center;">"{st.session_state.keyword_input_val}" 키워드 분석 결과</h3>
-        <h4>입력된 전체 검색 결과:</h4><ul style='list-style-position: inside; padding-left: 0; text-align: center;'>"""
-    for site_name_res, data_res in raw_counts_summary.items():
-        result_html += f"<li style='text-align:center; margin-left: 0;'>{site_name_res}: {data_res['count']}개 (설정 가중치: {data_res['weight']})</li>"
-    result_html += "</ul>"
-    if top_sites_for_score:
-        result_html += "<h4>점수 계산에 반영된 상위 사이트 기여도:</h4><ul style='list-style-position: inside; padding-left: 0; text-align: center;'>"
-        for site_data_res in top_sites_for_score:
-            result_html += f"<li style='text-align:center; margin-left: 0;'>{site_data_res['name']}: {site_data_res['raw_count']}개 (가중치 {site_data_res['weight']} 적용, 기여도: {site_data_res['contribution']:.1f})</li>"
+                has_any_count = any(int(site.get('user_count',0)) > 0 for site in st.session_state.site_configs)
+                if not has_any_count:
+                    display_html_message("검색 결과 수를 입력해주세요!", type="warning_red_text", duration_sec=2)
+                else:
+                    with st.spinner(""): # Spinner text removed
+                        with profile_span('scoring'):
+                            score, weighted_sum, raw_counts_summary, top_sites_for_score = calculate_data_availability_score_from_configs()
+                        st.session_state.data_availability_score_result = (score, weighted_sum, raw_counts_summary, top_sites_for_score)
+                    display_html_message("분석 완료!", type="success", icon_char_override="✅", duration_sec=1)
+
+
+    if st.session_state.data_availability_score_result:
+        score, weighted_sum, raw_counts_summary, top_sites_for_score = st.session_state.data_availability_score_result
+        emoji, message, color = {
+            4: ("🎉", "풍년일세! 자료가 넘쳐나서 행복한 고민이에요!", "#32CD32"),
+            3: ("👌", "이 정도면 충분! 파고들 만하겠어요!", "#1E90FF"),
+            2: ("💧", "가뭄의 단비... 자료가 좀 부족하지만, 희귀템을 노려볼까요?", "#FFA500"),
+            1: ("🏜️", "사막인가요... 정말 특별한 각오가 필요하겠어요!", "#FF4500"),
+        }.get(score, ("🤔", "음... 점수를 다시 확인해봐야겠어요.", "#808080"))
+        result_html = f"""
+        <div style="background-color: #f0f0f0; padding: 15px; border-radius: 10px; margin: 20px auto; text-align:center; max-width: 700px;">
+            <h3 style="text-align:center;">"{st.session_state.keyword_input_val}" 키워드 분석 결과</h3>
+            <h4>입력된 전체 검색 결과:</h4><ul style='list-style-position: inside; padding-left: 0; text-align: center;'>"""
+        for site_name_res, data_res in raw_counts_summary.items():
+            result_html += f"<li style='text-align:center; margin-left: 0;'>{site_name_res}: {data_res['count']}개 (설정 가중치: {data_res['weight']})</li>"
         result_html += "</ul>"
-    else: result_html += "<p>입력된 검색 결과가 없어 점수 계산에 반영된 사이트가 없어요.</p>"
-    result_html += f"""
-        <p style="text-align:center;"><strong>✨ 가중치 적용 총합 (상위 사이트 기준): {weighted_sum:.1f} ✨</strong></p>
-        <h2 style="color: {color}; text-align:center;">데이터 가용성 점수: {score}점 {emoji}</h2>
-        <h4 style="color: {color}; text-align:center;">{message}</h4></div>"""
-    st.markdown(result_html, unsafe_allow_html=True)
-
-st.markdown("<div style='text-align:center;'><hr style='margin: 30px auto 15px auto; width: 80%;'></div>", unsafe_allow_html=True) 
-st.markdown('<div style="text-align:center;"><h2 style="margin-bottom:15px;">💡 참신성/흥미도/미래가치 점수 직접 선택하기</h2></div>', unsafe_allow_html=True)
-explanation_box_st("""<b>✨ 유레카 지수란? (1~4점)</b><br>"이 주제, 다른 친구들은 잘 모르는 나만의 숨겨진 보석 같아!<br>새로운 관점으로 세상을 놀라게 할 수 있을 것 같아!"<br><span style="font-size:0.9em;">4점: 완전히 새로운 발견! 아무도 연구하지 않은 분야<br>3점: 기존과는 다른 새로운 시각이 있는 주제<br>2점: 익숙하지만 나만의 독특한 관점이 있음<br>1점: 많은 사람들이 다루는 일반적인 주제</span>""")
-st.session_state.eureka_slider_val = st.slider('✨ 유레카 지수:', 1, 4, st.session_state.eureka_slider_val, key="eureka_slider_main")
-explanation_box_st("""<b>💓 덕질 가능 지수란? (1~4점)</b><br>"이 주제만 생각하면 밤새도록 자료를 찾아보고 싶을 만큼 너무너무 재미있고 흥미진진해!<br>내 열정을 불태울 수 있어!"<br><span style="font-size:0.9em;">4점: 완전 몰입! 이것만 생각하면 밤새 행복해짐<br>3점: 충분히 흥미롭고 파고들 가치가 있음<br>2점: 평범하게 재미있는 수준<br>1점: 별로 흥미롭지 않은 주제</span>""")
-st.session_state.fan_slider_val = st.slider('💓 덕질 가능 지수:', 1, 4, st.session_state.fan_slider_val, key="fan_slider_main")
-explanation_box_st("""<b>🚀 성장 잠재력 지수란? (1~4점)</b><br>"이 주제, 지금도 중요하지만 앞으로 우리 사회에 더 큰 영향을 줄 수 있는 엄청난 잠재력이 느껴져!<br>미래를 예측하고 대비하는 데 도움이 될 것 같아!"<br><span style="font-size:0.9em;">4점: 미래 사회를 바꿀 혁신적인 주제<br>3점: 앞으로 더 중요해질 가능성이 높은 주제<br>2점: 현재와 미래에 적당히 의미 있는 주제<br>1점: 미래 발전 가능성이 낮은 주제</span>""")
-st.session_state.potential_slider_val = st.slider('🚀 성장 잠재력 지수:', 1, 4, st.session_state.potential_slider_val, key="potential_slider_main")
-
-add_keyword_cols = st.columns([1, 1.8, 1]) 
-with add_keyword_cols[1]:
-    if st.button('✅ 키워드 추가하기', key="add_keyword_button_main_submit", use_container_width=True):
-        keyword_to_add = st.session_state.keyword_input_val
-        if not keyword_to_add: 
-            display_html_message("키워드를 입력해주세요!", type="warning_red_text", duration_sec=2)
-        elif st.session_state.data_availability_score_result is None: 
-            display_html_message("먼저 '데이터 가용성 점수 계산하기' 버튼을 눌러 점수를 계산해주세요!", type="warning_red_text", icon_char_override="⚠️", duration_sec=2)
-        else:
-            if keyword_to_add in st.session_state.keywords_data['키워드'].values: 
-                display_html_message(f"'{keyword_to_add}' 키워드는 이미 목록에 있어요!", type="warning_red_text", icon_char_override="⚠️", duration_sec=2)
+        if top_sites_for_score:
+            result_html += "<h4>점수 계산에 반영된 상위 사이트 기여도:</h4><ul style='list-style-position: inside; padding-left: 0; text-align: center;'>"
+            for site_data_res in top_sites_for_score:
+                result_html += f"<li style='text-align:center; margin-left: 0;'>{site_data_res['name']}: {site_data_res['raw_count']}개 (가중치 {site_data_res['weight']} 적용, 기여도: {site_data_res['contribution']:.1f})</li>"
+            result_html += "</ul>"
+        else: result_html += "<p>입력된 검색 결과가 없어 점수 계산에 반영된 사이트가 없어요.</p>"
+        result_html += f"""
+            <p style="text-align:center;"><strong>✨ 가중치 적용 총합 (상위 사이트 기준): {weighted_sum:.1f} ✨</strong></p>
+            <h2 style="color: {color}; text-align:center;">데이터 가용성 점수: {score}점 {emoji}</h2>
+            <h4 style="color: {color}; text-align:center;">{message}</h4></div>"""
+        st.markdown(result_html, unsafe_allow_html=True)
+
+    st.markdown("<div style='text-align:center;'><hr style='margin: 30px auto 15px auto; width: 80%;'></div>", unsafe_allow_html=True) 
+    st.markdown('<div style="text-align:center;"><h2 style="margin-bottom:15px;">💡 참신성/흥미도/미래가치 점수 직접 선택하기</h2></div>', unsafe_allow_html=True)
+    explanation_box_st("""<b>✨ 유레카 지수란? (1~4점)</b><br>"이 주제, 다른 친구들은 잘 모르는 나만의 숨겨진 보석 같아!<br>새로운 관점으로 세상을 놀라게 할 수 있을 것 같아!"<br><span style="font-size:0.9em;">4점: 완전히 새로운 발견! 아무도 연구하지 않은 분야<br>3점: 기존과는 다른 새로운 시각이 있는 주제<br>2점: 익숙하지만 나만의 독특한 관점이 있음<br>1점: 많은 사람들이 다루는 일반적인 주제</span>""")
+    st.session_state.eureka_slider_val = st.slider('✨ 유레카 지수:', 1, 4, st.session_state.eureka_slider_val, key="eureka_slider_main")
+    explanation_box_st("""<b>💓 덕질 가능 지수란? (1~4점)</b><br>"이 주제만 생각하면 밤새도록 자료를 찾아보고 싶을 만큼 너무너무 재미있고 흥미진진해!<br>내 열정을 불태울 수 있어!"<br><span style="font-size:0.9em;">4점: 완전 몰입! 이것만 생각하면 밤새 행복해짐<br>3점: 충분히 흥미롭고 파고들 가치가 있음<br>2점: 평범하게 재미있는 수준<br>1점: 별로 흥미롭지 않은 주제</span>""")
+    st.session_state.fan_slider_val = st.slider('💓 덕질 가능 지수:', 1, 4, st.session_state.fan_slider_val, key="fan_slider_main")
+    explanation_box_st("""<b>🚀 성장 잠재력 지수란? (1~4점)</b><br>"이 주제, 지금도 중요하지만 앞으로 우리 사회에 더 큰 영향을 줄 수 있는 엄청난 잠재력이 느껴져!<br>미래를 예측하고 대비하는 데 도움이 될 것 같아!"<br><span style="font-size:0.9em;">4점: 미래 사회를 바꿀 혁신적인 주제<br>3점: 앞으로 더 중요해질 가능성이 높은 주제<br>2점: 현재와 미래에 적당히 의미 있는 주제<br>1점: 미래 발전 가능성이 낮은 주제</span>""")
+    st.session_state.potential_slider_val = st.slider('🚀 성장 잠재력 지수:', 1, 4, st.session_state.potential_slider_val, key="potential_slider_main")
+
+    add_keyword_cols = st.columns([1, 1.8, 1]) 
+    with add_keyword_cols[1]:
+        if st.button('✅ 키워드 추가하기', key="add_keyword_button_main_submit", use_container_width=True):
+            keyword_to_add = st.session_state.keyword_input_val
+            if not keyword_to_add: 
+                display_html_message("키워드를 입력해주세요!", type="warning_red_text", duration_sec=2)
+            elif st.session_state.data_availability_score_result is None: 
+                display_html_message("먼저 '데이터 가용성 점수 계산하기' 버튼을 눌러 점수를 계산해주세요!", type="warning_red_text", icon_char_override="⚠️", duration_sec=2)
             else:
-                data_score_to_add, _, _, _ = st.session_state.data_availability_score_result
-                new_data_entry = pd.DataFrame([{'키워드': keyword_to_add, '데이터가용성점수': data_score_to_add, '유레카지수': st.session_state.eureka_slider_val, '덕질가능지수': st.session_state.fan_slider_val, '성장잠재력지수': st.session_state.potential_slider_val}])
-                st.session_state.keywords_data = pd.concat([st.session_state.keywords_data, new_data_entry], ignore_index=True)
-                # 1. "키워드가 성공적으로 추가되었어요!" 한 줄, 예쁜 컬러 박스
-                display_html_message(f"'{keyword_to_add}' 키워드가 추가되었어요!", type="success", icon_char_override="✨", duration_sec=1.5)
+                if keyword_library.has_keyword(keyword_to_add): 
+                    display_html_message(f"'{keyword_to_add}' 키워드는 이미 목록에 있어요!", type="warning_red_text", icon_char_override="⚠️", duration_sec=2)
+                else:
+                    data_score_to_add, _, _, _ = st.session_state.data_availability_score_result
+                    new_keyword_row = {'키워드': keyword_to_add, '데이터가용성점수': data_score_to_add, '유레카지수': st.session_state.eureka_slider_val, '덕질가능지수': st.session_state.fan_slider_val, '성장잠재력지수': st.session_state.potential_slider_val}
+                    new_keyword_counts = {site['id']: int(site.get('user_count', 0)) for site in st.session_state.site_configs}
+                    # 띄어쓰기/조사/영문 약어만 다른 키워드가 이미 있으면 바로 추가하지 않고 어떻게 할지 물어봄
+                    near_duplicates = get_duplicate_index().query(keyword_to_add, st.session_state.dedupe_threshold)
+                    if near_duplicates:
+                        st.session_state.pending_near_duplicate = (new_keyword_row, new_keyword_counts, near_duplicates)
+                    else:
+                        add_keyword_row(new_keyword_row, new_keyword_counts)
+                        # 1. "키워드가 성공적으로 추가되었어요!" 한 줄, 예쁜 컬러 박스
+                        display_html_message(f"'{keyword_to_add}' 키워드가 추가되었어요!", type="success", icon_char_override="✨", duration_sec=1.5)
+                        reset_inputs()
+                        st.rerun()
+        pending_near_duplicate = st.session_state.pending_near_duplicate
+        if pending_near_duplicate is not None and pending_near_duplicate[0][scoring.KEYWORD_COLUMN] != st.session_state.keyword_input_val:
+            # 입력한 키워드를 바꾸면 이전 확인 요청은 버림
+            st.session_state.pending_near_duplicate = pending_near_duplicate = None
+        if pending_near_duplicate is not None:
+            pending_row, pending_counts, near_duplicates = pending_near_duplicate
+            pending_keyword = pending_row[scoring.KEYWORD_COLUMN]
+            near_duplicate_text = ", ".join(f"'{keyword}' ({similarity:.0%})" for keyword, similarity in near_duplicates)
+            st.markdown(f"<p style='text-align:center; color:#D32F2F;'>⚠️ '{pending_keyword}'와(과) 비슷한 키워드가 이미 있어요: {near_duplicate_text}</p>", unsafe_allow_html=True)
+            for position, (existing_keyword, _) in enumerate(near_duplicates):
+                if st.button(f"🔗 기존 키워드 '{existing_keyword}'에 합치기", key=f"merge_near_duplicate_{position}", use_container_width=True):
+                    merge_into_keyword(existing_keyword, pending_row, pending_counts)
+                    st.session_state.pending_near_duplicate = None
+                    display_html_message(f"'{existing_keyword}' 키워드의 점수를 새로 계산한 값으로 바꿨어요!", type="success", icon_char_override="🔗", duration_sec=1.5)
+                    reset_inputs()
+                    st.rerun()
+            if st.button(f"➕ 그래도 '{pending_keyword}' 따로 추가하기", key="add_despite_near_duplicate", use_container_width=True):
+                add_keyword_row(pending_row, pending_counts)
+                st.session_state.pending_near_duplicate = None
+                display_html_message(f"'{pending_keyword}' 키워드가 추가되었어요!", type="success", icon_char_override="✨", duration_sec=1.5)
                 reset_inputs()
-                st.experimental_rerun()
-
-if not st.session_state.keywords_data.empty:
-    st.markdown("<div style='text-align:center;'><hr style='margin: 30px auto 15px auto; width: 80%;'></div>", unsafe_allow_html=True)
-    st.markdown('<div style="text-align:center;"><h3 style="margin-bottom:15px;">📋 지금까지 추가된 키워드 목록</h3></div>', unsafe_allow_html=True)
-    
-    keywords_list_for_delete = ["삭제할 키워드 선택..."] + st.session_state.keywords_data['키워드'].tolist()
-    delete_cols = st.columns([0.8, 1.4, 0.8]) 
-    with delete_cols[1]:
-        keyword_to_delete_select = st.selectbox("삭제할 키워드 선택:", options=keywords_list_for_delete, index=0, key="delete_kw_select", label_visibility="collapsed")
-        if keyword_to_delete_select != "삭제할 키워드 선택...":
-            if st.button(f"🗑️ '{keyword_to_delete_select}' 삭제", key="delete_selected_keyword_button", use_container_width=True):
-                st.session_state.keywords_data = st.session_state.keywords_data[st.session_state.keywords_data['키워드'] != keyword_to_delete_select].reset_index(drop=True)
-                display_html_message(f"'{keyword_to_delete_select}' 키워드가 삭제되었어요!", type="info", icon_char_override="🗑️", duration_sec=1.5)
-                # st.session_state.delete_kw_select = "삭제할 키워드 선택..." 
-                st.experimental_rerun()
+                st.rerun()
+            if st.button("✖️ 취소", key="cancel_near_duplicate", use_container_width=True):
+                st.session_state.pending_near_duplicate = None
+                st.rerun()
+    flush_notifications()
+
+@st.experimental_fragment
+def bulk_import_fragment():
+    import_cols = st.columns([0.5, 3, 0.5])
+    with import_cols[1]:
+        with st.expander("📂 파일로 키워드 한꺼번에 추가하기 (CSV / Excel)", expanded=False):
+            site_column_names = ", ".join(f"'{site['name']}'" for site in st.session_state.site_configs)
+            st.caption(f"'키워드', {site_column_names}, '유레카지수', '덕질가능지수', '성장잠재력지수' 열이 있는 파일을 올려주세요. 지수는 1~4점이에요.")
+            uploaded_import_file = st.file_uploader("키워드 파일 선택", type=['csv', 'xlsx'], key="bulk_import_uploader", label_visibility="collapsed")
+            if uploaded_import_file is not None and st.button("📥 파일의 키워드 모두 추가하기", key="bulk_import_button", use_container_width=True):
+                import_progress_bar = st.progress(0.0, text="파일을 읽고 있어요...")
+                site_weights_for_import = {site['name']: float(site.get('weight', 1.0)) for site in st.session_state.site_configs}
+                try:
+                    imported_rows, rejected_rows = importer.import_keywords(
+                        uploaded_import_file, uploaded_import_file.name, site_weights_for_import,
+                        existing_keywords=get_keyword_store().keywords(), thresholds=st.session_state.score_thresholds,
+                        on_progress=lambda progress, rows_read: import_progress_bar.progress(progress, text=f"{rows_read:,}행 확인 중...")
+                    )
+                except Exception as e:
+                    import_progress_bar.empty()
+                    display_html_message(f"파일을 읽지 못했어요: {e}", type="error", duration_sec=0)
+                else:
+                    import_progress_bar.progress(1.0, text="완료!")
+                    site_count_columns = {site['id']: site['name'] for site in st.session_state.site_configs}
+                    keyword_library.add_keywords(imported_rows, site_count_columns)
+
+                    def apply_import_locally(keyword_store, keyword_counts):
+                        keyword_store.extend(imported_rows)
+                        keyword_counts.extend(imported_rows[scoring.KEYWORD_COLUMN], {site_id: imported_rows[column].to_numpy() for site_id, column in site_count_columns.items()})
+                        index_keywords(imported_rows[scoring.KEYWORD_COLUMN])
+                    record_keyword_write(apply_import_locally)
+                    st.session_state.import_rejected_rows = rejected_rows if not rejected_rows.empty else None
+                    display_html_message(f"{len(imported_rows):,}개 키워드를 추가했어요! (제외된 행: {len(rejected_rows):,}개)", type="success", icon_char_override="📥", duration_sec=3)
+                    st.rerun()
+            if st.session_state.import_rejected_rows is not None:
+                st.markdown(f"<p style='text-align:center; color:#D32F2F;'>⚠️ 추가되지 않은 행이 {len(st.session_state.import_rejected_rows):,}개 있어요.</p>", unsafe_allow_html=True)
+                st.dataframe(st.session_state.import_rejected_rows.head(100), use_container_width=True, hide_index=True)
+                download_button_component(label="📄 제외된 행 보고서 다운로드 (CSV)", data=st.session_state.import_rejected_rows.to_csv(index=False, encoding='utf-8-sig').encode('utf-8-sig'), file_name="키워드_가져오기_제외목록.csv", mime='text/csv', key_suffix="import_rejected_csv")
+        fetch_adapters = fetchable_site_adapters()
+        if fetch_adapters:
+            with st.expander("🌐 여러 키워드의 검색 결과 수 한꺼번에 가져오기", expanded=False):
+                st.caption(f"한 줄에 키워드 하나씩 적어주세요. 자동 수집 대상: {', '.join(adapter.name for adapter in fetch_adapters.values())} (사이트별 요청 속도 제한, 결과는 {site_fetch.DEFAULT_CACHE_TTL_SEC // 86400}일 동안 캐시)")
+                bulk_fetch_text = st.text_area("키워드 목록", key="bulk_fetch_keywords", label_visibility="collapsed", height=150)
+                bulk_fetch_keywords = [line.strip() for line in bulk_fetch_text.splitlines() if line.strip()]
+                if bulk_fetch_keywords and st.button(f"🌐 {len(dict.fromkeys(bulk_fetch_keywords)):,}개 키워드 검색 결과 수 가져오기", key="bulk_fetch_button", use_container_width=True):
+                    fetch_progress_bar = st.progress(0.0, text="검색 결과 수를 가져오고 있어요...")
+                    fetched_counts, fetch_errors = site_fetch.fetch_counts(bulk_fetch_keywords, list(fetch_adapters.values()), get_count_cache(),
+                                                                           on_progress=lambda done, total: fetch_progress_bar.progress(done / total, text=f"{done:,}/{total:,}건 요청 완료"))
+                    fetch_progress_bar.empty()
+                    st.session_state.bulk_fetch_result = (fetched_counts, fetch_errors)
+                if st.session_state.bulk_fetch_result is not None:
+                    fetched_counts, fetch_errors = st.session_state.bulk_fetch_result
+                    if fetch_errors:
+                        st.markdown(f"<p style='text-align:center; color:#D32F2F;'>⚠️ {len(fetch_errors):,}건은 가져오지 못했어요. (예: {fetch_errors[0]})</p>", unsafe_allow_html=True)
+                    st.dataframe(fetched_counts.head(100), use_container_width=True, hide_index=True)
+                    st.caption("받은 CSV에 지수 열('유레카지수', '덕질가능지수', '성장잠재력지수')을 채우면 위의 파일 가져오기로 한꺼번에 추가할 수 있어요.")
+                    download_button_component(label="📄 검색 결과 수 다운로드 (CSV)", data=export.to_csv_bytes(fetched_counts), file_name="키워드_검색결과수.csv", mime='text/csv', key_suffix="bulk_fetch_csv")
+    flush_notifications()
+
+@st.experimental_fragment
+def keyword_table_fragment():
+    library_version = keyword_library.data_version()
+    if keyword_library.count_keywords():
+        st.markdown("<div style='text-align:center;'><hr style='margin: 30px auto 15px auto; width: 80%;'></div>", unsafe_allow_html=True)
+        st.markdown('<div style="text-align:center;"><h3 style="margin-bottom:15px;">📋 지금까지 추가된 키워드 목록</h3></div>', unsafe_allow_html=True)
     
-    st.dataframe(st.session_state.keywords_data.style.background_gradient(cmap='YlGnBu', subset=['데이터가용성점수', '유레카지수', '덕질가능지수', '성장잠재력지수']).set_table_styles([{'selector': 'th', 'props': [('text-align', 'center'), ('font-size', '1.05em'), ('padding', '10px 12px')]}, {'selector': 'td', 'props': [('text-align', 'center'), ('padding', '8px 10px')]} ]).set_properties(**{'text-align': 'center', 'width': '150px'}), use_container_width=True)
+        keyword_table_view = st.session_state.keyword_table_view
+
+        # 삭제할 키워드는 검색 + 페이지 단위로 골라서, 선택 상자에 전체 목록을 넣지 않음
+        delete_cols = st.columns([0.8, 1.4, 0.8]) 
+        with delete_cols[1]:
+            delete_search = st.text_input("삭제할 키워드 검색:", key="delete_kw_search", placeholder="🔎 삭제할 키워드 검색", label_visibility="collapsed").strip()
+            delete_match_count = keyword_library.count_keywords(delete_search)
+            delete_total_pages = max(1, -(-delete_match_count // table_view.PICKER_PAGE_SIZE))
+            delete_page = 1
+            if delete_total_pages > 1:
+                delete_page = st.number_input(f"검색 결과 페이지 (총 {delete_total_pages}쪽, {delete_match_count:,}개):", min_value=1, max_value=delete_total_pages, value=1, step=1, key="delete_kw_page")
+            delete_page_matches = keyword_library.query_keywords(delete_search, limit=table_view.PICKER_PAGE_SIZE, offset=(delete_page - 1) * table_view.PICKER_PAGE_SIZE)[scoring.KEYWORD_COLUMN].tolist()
+            keywords_list_for_delete = ["삭제할 키워드 선택..."] + delete_page_matches
+            keyword_to_delete_select = st.selectbox("삭제할 키워드 선택:", options=keywords_list_for_delete, index=0, key="delete_kw_select", label_visibility="collapsed")
+            if keyword_to_delete_select != "삭제할 키워드 선택...":
+                if st.button(f"🗑️ '{keyword_to_delete_select}' 삭제", key="delete_selected_keyword_button", use_container_width=True):
+                    keyword_library.delete_keyword(keyword_to_delete_select)
+
+                    def apply_delete_locally(keyword_store, keyword_counts):
+                        keyword_store.remove(keyword_to_delete_select)
+                        keyword_counts.remove(keyword_to_delete_select)
+                        index_keywords([keyword_to_delete_select], removed=True)
+                    record_keyword_write(apply_delete_locally)
+                    display_html_message(f"'{keyword_to_delete_select}' 키워드가 삭제되었어요!", type="info", icon_char_override="🗑️", duration_sec=1.5)
+                    st.rerun()
+
+        dedupe_cols = st.columns([0.4, 3, 0.4])
+        with dedupe_cols[1]:
+            with st.expander("🧹 비슷한 키워드 정리하기", expanded=False):
+                st.caption("띄어쓰기, 조사, 영문 약어 표기만 다른 키워드를 자모 단위로 비교해서 묶어요. 묶음마다 먼저 추가된 키워드만 남기고 나머지는 지워요.")
+                st.slider("비슷함 기준 (높을수록 거의 같은 키워드만 묶음)", 0.5, 0.95, st.session_state.dedupe_threshold, step=0.05, key="dedupe_threshold_slider", on_change=save_dedupe_threshold)
+                if st.button("🔎 비슷한 키워드 찾기", key="find_duplicates_button", use_container_width=True):
+                    with st.spinner("비슷한 키워드를 찾고 있어요..."):
+                        duplicate_index = get_duplicate_index()
+                        st.session_state.duplicate_groups = (st.session_state.keyword_store_version, st.session_state.dedupe_threshold, duplicate_index.duplicate_groups(st.session_state.dedupe_threshold))
+                groups_version, groups_threshold, duplicate_groups = st.session_state.duplicate_groups
+                if groups_version == library_version and groups_threshold == st.session_state.dedupe_threshold:
+                    if not duplicate_groups:
+                        st.markdown("<p style='text-align:center;'>비슷한 키워드가 없어요! 👍</p>", unsafe_allow_html=True)
+                    else:
+                        duplicate_count = sum(len(group) - 1 for group in duplicate_groups)
+                        st.dataframe(pd.DataFrame({'남길 키워드': [group[0] for group in duplicate_groups[:200]],
+                                                   '합칠 키워드': [", ".join(group[1:]) for group in duplicate_groups[:200]]}),
+                                     use_container_width=True, hide_index=True)
+                        if st.button(f"🧹 {len(duplicate_groups):,}개 묶음에서 {duplicate_count:,}개 키워드 합치기", key="merge_duplicates_button", use_container_width=True):
+                            merged_count = merge_duplicate_groups(duplicate_groups)
+                            st.session_state.duplicate_groups = (None, None, [])
+                            display_html_message(f"비슷한 키워드 {merged_count:,}개를 정리했어요!", type="success", icon_char_override="🧹", duration_sec=1.5)
+                            st.rerun()
+
+        # 보이는 페이지만 DB에서 읽어서 스타일을 입히고, 색 기준은 데이터가 바뀔 때만 다시 조회
+        table_control_cols = st.columns([2.2, 1.5, 0.9, 0.9, 0.9])
+        table_search = table_control_cols[0].text_input("키워드 검색:", key="table_search", placeholder="🔎 키워드 검색").strip()
+        sort_options = ["입력 순서"] + list(scoring.TABLE_COLUMNS) + [skyline.LEVEL_COLUMN]
+        table_sort_label = table_control_cols[1].selectbox("정렬 기준:", options=sort_options, index=0, key="table_sort_column")
+        table_sort_desc = table_control_cols[2].selectbox("정렬 방향:", options=["오름차순", "내림차순"], index=0, key="table_sort_direction") == "내림차순"
+        table_page_size = table_control_cols[3].selectbox("페이지 크기:", options=table_view.PAGE_SIZE_OPTIONS, index=1, key="table_page_size")
+        table_sort_column = None if table_sort_label == "입력 순서" else table_sort_label
+        table_total_rows = keyword_library.count_keywords(table_search)
+        table_total_pages = max(1, -(-table_total_rows // table_page_size))
+        if st.session_state.get('table_page', 1) > table_total_pages:
+            st.session_state.table_page = table_total_pages
+        table_page = table_control_cols[4].number_input("페이지:", min_value=1, max_value=table_total_pages, value=1, step=1, key="table_page")
+        with profile_span('styler_table'):
+            table_styler, table_total_rows, table_total_pages, table_page = keyword_table_view.styled_page(keyword_library, library_version, search=table_search, sort_column=table_sort_column, descending=table_sort_desc, page=table_page, page_size=table_page_size)
+            st.dataframe(table_styler, use_container_width=True)
+        first_row = (table_page - 1) * table_page_size + 1 if table_total_rows else 0
+        st.caption(f"총 {table_total_rows:,}개 중 {first_row:,}–{min(table_page * table_page_size, table_total_rows):,}번째 키워드 ({table_page}/{table_total_pages}쪽)")
             
-    st.markdown("<div style='margin-top: 25px;'></div>", unsafe_allow_html=True)
+        st.markdown("<div style='margin-top: 25px;'></div>", unsafe_allow_html=True)
     
-    button_row_cols = st.columns([0.4, 1.2, 0.15, 1.2, 0.4]) 
-    with button_row_cols[1]:
-        csv_data = st.session_state.keywords_data.to_csv(index=False, encoding='utf-8-sig').encode('utf-8-sig')
-        download_button_component(label="📥 CSV 파일 다운로드", data=csv_data, file_name="키워드_분석_결과.csv", mime='text/csv', key_suffix="csv_final_v4")
-    
-    with button_row_cols[3]:
-        excel_output = io.BytesIO()
-        with pd.ExcelWriter(excel_output, engine='xlsxwriter') as writer:
-            st.session_state.keywords_data.to_excel(writer, index=False, sheet_name='키워드분석')
-        excel_data = excel_output.getvalue()
-        download_button_component(label="📊 엑셀 파일 다운로드", data=excel_data, file_name="키워드_분석_결과.xlsx", mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', key_suffix="excel_main_final_v4")
-
-if not st.session_state.keywords_data.empty:
-    st.markdown("<div style='text-align:center;'><hr style='margin: 30px auto 15px auto; width: 80%;'></div>", unsafe_allow_html=True)
-    graph_button_cols = st.columns([1, 2, 1]) 
-    with graph_button_cols[1]:
-        if st.button('📊 모든 키워드 그래프로 보기', key="show_graph_button_main_toggle", use_container_width=True):
-            st.session_state.show_graph_section = not st.session_state.get('show_graph_section', False)
-elif 'show_graph_section' in st.session_state and st.session_state.keywords_data.empty:
-    st.session_state.show_graph_section = False
-
-if st.session_state.get('show_graph_section', False) and not st.session_state.keywords_data.empty:
-    st.markdown('<div style="text-align:center;"><h2 style="margin-bottom:15px;">📈 키워드 시각화 맵</h2></div>', unsafe_allow_html=True)
-    assessment_options_graph = {'종합 점수 (평균)': 'average', '유레카 지수 (참신성)': '유레카지수', '덕질 가능 지수 (흥미도)': '덕질가능지수', '성장 잠재력 지수 (미래성)': '성장잠재력지수'}
+        # 내보내기 파일은 누를 때만 만들고, 같은 데이터 버전이면 다시 만들지 않음
+        button_row_cols = st.columns([0.4, 1.2, 0.15, 1.2, 0.4]) 
+        with button_row_cols[1]:
+            export_format = st.selectbox("내보내기 형식 선택:", options=list(export.EXPORT_FORMATS.keys()), format_func=lambda fmt: f"{export.EXPORT_FORMATS[fmt]['icon']} {export.EXPORT_FORMATS[fmt]['label']}", key="export_format_select", label_visibility="collapsed")
+        export_spec = export.EXPORT_FORMATS[export_format]
+        with button_row_cols[3]:
+            export_data = st.session_state.export_cache.get(library_version, export_format)
+            if export_data is None and st.button("📦 다운로드 파일 만들기", key="prepare_export_button", use_container_width=True):
+                with st.spinner(""), profile_span(f'export_{export_format}') as export_span:
+                    # 프레임을 먼저 불러와야 세션 스냅샷 버전이 최신으로 맞춰짐
+                    export_frame = ranked_keyword_frame()
+                    export_data = st.session_state.export_cache.build(st.session_state.keyword_store_version, export_format, export_frame)
+                    export_span.add_bytes(len(export_data))
+            if export_data is not None:
+                download_button_component(label=f"{export_spec['icon']} {export_spec['label']} 파일 다운로드", data=export_data, file_name=export.export_file_name(export_format), mime=export_spec['mime'], key_suffix=f"export_{export_format}")
+    flush_notifications()
+
+@st.experimental_fragment
+def keyword_map_fragment():
+    has_keywords = keyword_library.count_keywords() > 0
+    if has_keywords:
+        st.markdown("<div style='text-align:center;'><hr style='margin: 30px auto 15px auto; width: 80%;'></div>", unsafe_allow_html=True)
+        graph_button_cols = st.columns([1, 2, 1]) 
+        with graph_button_cols[1]:
+            if st.button('📊 모든 키워드 그래프로 보기', key="show_graph_button_main_toggle", use_container_width=True):
+                st.session_state.show_graph_section = not st.session_state.get('show_graph_section', False)
+            # 네 가지 기준의 그래프와 추천 표를 작업 프로세스에서 동시에 만들고, 같은 데이터/기준이면 다시 만들지 않음
+            report_key = (keyword_library.data_version(), st.session_state.get('rec_x_threshold', recommend.DEFAULT_THRESHOLD), st.session_state.get('rec_y_threshold', recommend.DEFAULT_THRESHOLD), st.session_state.graph_jitter_seed)
+            bundle_key, report_bundle = st.session_state.report_bundle
+            if bundle_key != report_key and st.button('🗂️ 네 가지 기준 보고서 한 번에 만들기', key="build_report_button", use_container_width=True):
+                report_progress_bar = st.progress(0.0, text="네 가지 그래프를 동시에 그리고 있어요...")
+                try:
+                    with profile_span('report_build') as report_span:
+                        report_frame = get_keyword_store().frame()
+                        report_key = (st.session_state.keyword_store_version,) + report_key[1:]
+                        report_bundle = report.build_report(report_frame, get_report_renderer(), *report_key[1:],
+                                                            on_progress=lambda done, total: report_progress_bar.progress(done / total, text=f"{done}/{total}개 기준 완료"))
+                        report_span.add_bytes(sum(len(data) for data in report_bundle.values()))
+                except Exception as e:
+                    report_progress_bar.empty()
+                    display_html_message(f"보고서를 만들지 못했어요: {e}", type="error", duration_sec=0)
+                else:
+                    report_progress_bar.empty()
+                    st.session_state.report_bundle = (report_key, report_bundle)
+                    bundle_key = report_key
+            if bundle_key == report_key:
+                for report_format, report_spec in report.REPORT_FORMATS.items():
+                    download_button_component(label=f"{report_spec['icon']} {report_spec['label']} 다운로드", data=report_bundle[report_format], file_name=report.report_file_name(report_format), mime=report_spec['mime'], key_suffix=f"report_{report_format}")
+    elif 'show_graph_section' in st.session_state:
+        st.session_state.show_graph_section = False
+
+    if st.session_state.get('show_graph_section', False) and has_keywords:
+        st.markdown('<div style="text-align:center;"><h2 style="margin-bottom:15px;">📈 키워드 시각화 맵</h2></div>', unsafe_allow_html=True)
+        assessment_options_graph = {'종합 점수 (평균)': 'average', '유레카 지수 (참신성)': '유레카지수', '덕질 가능 지수 (흥미도)': '덕질가능지수', '성장 잠재력 지수 (미래성)': '성장잠재력지수'}
     
-    graph_select_cols = st.columns([0.5, 3, 0.5]) 
-    with graph_select_cols[1]:
-        selected_assessment_label_graph = st.selectbox('그래프 평가 기준 선택:', options=list(assessment_options_graph.keys()), index=0, key="graph_assessment_type_select_main", label_visibility="collapsed")
-    assessment_type_graph = assessment_options_graph[selected_assessment_label_graph]
-
-    graph_spinner_cols_main = st.columns([0.5, 3, 0.5])
-    with graph_spinner_cols_main[1]:
-        # 3. 시각화 맵 로딩 중 문구 복원
-        with st.spinner("그래프를 그리고 있어요! 예쁘게 나올 거예요! 🎨"):
-            time.sleep(0.1) 
-            df_graph_plot = st.session_state.keywords_data.copy()
+        graph_select_cols = st.columns([0.5, 3, 0.5]) 
+        with graph_select_cols[1]:
+            selected_assessment_label_graph = st.selectbox('그래프 평가 기준 선택:', options=list(assessment_options_graph.keys()), index=0, key="graph_assessment_type_select_main", label_visibility="collapsed")
+        assessment_type_graph = assessment_options_graph[selected_assessment_label_graph]
+
+        graph_spinner_cols_main = st.columns([0.5, 3, 0.5])
+        with graph_spinner_cols_main[1]:
+            # 3. 시각화 맵 로딩 중 문구 복원
+            with st.spinner("그래프를 그리고 있어요! 예쁘게 나올 거예요! 🎨"):
+                df_graph_plot = ranked_keyword_frame().copy()
             
-            for col in ['유레카지수', '덕질가능지수', '성장잠재력지수', '데이터가용성점수']:
-                df_graph_plot[col] = pd.to_numeric(df_graph_plot[col], errors='coerce')
-            df_graph_plot = df_graph_plot.dropna(subset=['유레카지수', '덕질가능지수', '성장잠재력지수', '데이터가용성점수'])
+                for col in ['유레카지수', '덕질가능지수', '성장잠재력지수', '데이터가용성점수']:
+                    df_graph_plot[col] = pd.to_numeric(df_graph_plot[col], errors='coerce')
+                df_graph_plot = df_graph_plot.dropna(subset=['유레카지수', '덕질가능지수', '성장잠재력지수', '데이터가용성점수'])
 
-            if df_graph_plot.empty:
-                display_html_message("이런! 유효한 데이터가 없어서 그래프를 그릴 수 없어요. 점수들이 올바르게 입력되었는지 확인해주세요.", type="warning_red_text", duration_sec=0) 
-            else:
-                if assessment_type_graph == 'average':
-                    df_graph_plot['종합점수'] = df_graph_plot[['유레카지수', '덕질가능지수', '성장잠재력지수']].astype(float).mean(axis=1)
-                    df_graph_plot['종합점수'] = df_graph_plot['종합점수'].apply(lambda x: round(x, 2) if pd.notnull(x) else np.nan)
-                    y_column_graph = '종합점수'
-                    title_suffix_graph = '종합 점수'
-                else:
-                    y_column_graph = assessment_type_graph
-                    title_suffix_graph = selected_assessment_label_graph.split('(')[0].strip()
-                
-                df_graph_plot = df_graph_plot.dropna(subset=[y_column_graph, '데이터가용성점수'])
                 if df_graph_plot.empty:
-                    display_html_message("평가 기준에 따른 유효 데이터가 없어 그래프를 그릴 수 없습니다.", type="warning_red_text", duration_sec=0) 
+                    display_html_message("이런! 유효한 데이터가 없어서 그래프를 그릴 수 없어요. 점수들이 올바르게 입력되었는지 확인해주세요.", type="warning_red_text", duration_sec=0) 
                 else:
-                    fig_graph, ax_graph = plt.subplots(figsize=(17, 14))
-                    base_jitter_strength = 0.05 
-                    
-                    df_graph_plot['x_jittered'] = df_graph_plot['데이터가용성점수'].astype(float) + \
-                                                np.random.uniform(-base_jitter_strength, base_jitter_strength, size=len(df_graph_plot))
-                    df_graph_plot['y_jittered'] = df_graph_plot[y_column_graph].astype(float) + \
-                                                np.random.uniform(-base_jitter_strength, base_jitter_strength, size=len(df_graph_plot))
-                    
-                    colors_graph = get_color_palette(len(df_graph_plot))
-                    sns.scatterplot(x='x_jittered', y='y_jittered', data=df_graph_plot, s=250, 
-                                    hue='키워드', palette=colors_graph, legend=False, ax=ax_graph, 
-                                    alpha=0.8) 
-
-                    ax_graph.axhline(y=2.5, color='gray', linestyle='--', alpha=0.7); ax_graph.axvline(x=2.5, color='gray', linestyle='--', alpha=0.7)
-                    quadrant_fills = {"top_left": ([0.5, 2.5], 2.5, 4.5, 'gold', 0.05), "top_right": ([2.5, 4.5], 2.5, 4.5, 'limegreen', 0.05), "bottom_left": ([0.5, 2.5], 0.5, 2.5, 'tomato', 0.05), "bottom_right": ([2.5, 4.5], 0.5, 2.5, 'dodgerblue', 0.05)}
-                    for x_range, y_bottom, y_top, color_fill, alpha_fill in quadrant_fills.values(): ax_graph.fill_between(x_range, y_bottom, y_top, alpha=alpha_fill, color=color_fill)
-                    quadrant_texts = [(1.5, 3.5, "도전적인 보석\n(자료 부족, 높은 가치)", '#b28900'), (3.5, 3.5, "최고의 보석\n(자료 풍부, 높은 가치)", '#2a7d2a'), (1.5, 1.5, "재고려 필요\n(자료 부족, 낮은 가치)", '#c33'), (3.5, 1.5, "안정적 선택\n(자료 풍부, 낮은 가치)", '#177a8c')]
-                    for x_text, y_text, label_text, color_text in quadrant_texts: ax_graph.text(x_text, y_text, label_text, ha='center', va='center', fontsize=20, color=color_text, wrap=True, linespacing=1.5)
-                    for _, row_graph in df_graph_plot.iterrows(): ax_graph.annotate(row_graph['키워드'], (row_graph['x_jittered'], row_graph['y_jittered']), xytext=(0, 15), textcoords='offset points', fontsize=20, fontweight='bold', ha='center')
-                    ax_graph.set_title(f'키워드 평가 맵: 데이터 가용성 vs {title_suffix_graph}', fontsize=35, pad=30, weight='bold')
-                    ax_graph.set_xlabel('데이터 가용성 점수', fontsize=25, labelpad=25); ax_graph.set_ylabel(title_suffix_graph, fontsize=25, labelpad=25)
-                    ax_graph.set_xlim(0.5, 4.5); ax_graph.set_ylim(0.5, 4.5); ax_graph.set_xticks([1, 2, 3, 4]); ax_graph.set_yticks([1, 2, 3, 4])
-                    ax_graph.tick_params(axis='both', which='major', labelsize=20); ax_graph.grid(True, linestyle=':', alpha=0.6)
-                    plt.tight_layout(pad=1.5)
-                    img_data_b64_graph = fig_to_base64(fig_graph)
-                    st.markdown(f'<div style="text-align:center; margin-top: 20px;"><img src="data:image/png;base64,{img_data_b64_graph}" style="max-width:100%; height:auto; border-radius:18px; box-shadow:0 1.5px 8px #aaa;"></div>', unsafe_allow_html=True)
-                    st.markdown('<div style="text-align:center; margin-top:30px;"><h3>✨ 보석 키워드 추천 ✨</h3></div>', unsafe_allow_html=True)
-                    quadrants_rec = {"🌟 최고의 보석 (자료 풍부, 높은 가치)": df_graph_plot[(df_graph_plot['데이터가용성점수'] >= 2.5) & (df_graph_plot[y_column_graph] >= 2.5)], "💡 도전적인 보석 (자료 부족, 높은 가치)": df_graph_plot[(df_graph_plot['데이터가용성점수'] < 2.5) & (df_graph_plot[y_column_graph] >= 2.5)], "👍 안정적 선택 (자료 풍부, 낮은 가치)": df_graph_plot[(df_graph_plot['데이터가용성점수'] >= 2.5) & (df_graph_plot[y_column_graph] < 2.5)], "🤔 재고려 필요 (자료 부족, 낮은 가치)": df_graph_plot[(df_graph_plot['데이터가용성점수'] < 2.5) & (df_graph_plot[y_column_graph] < 2.5)]}
-                    badge_colors_rec = {"🌟 최고의 보석": "#28a745", "💡 도전적인 보석": "#ffc107", "👍 안정적 선택": "#17a2b8", "🤔 재고려 필요": "#dc3545"}
-                    for category_rec, keywords_in_cat_rec in quadrants_rec.items():
-                        if not keywords_in_cat_rec.empty:
-                            st.markdown(f'<h4 style="text-align:center; color:#555; margin-top:15px;">{category_rec}</h4>', unsafe_allow_html=True)
-                            num_cols_rec = min(3, len(keywords_in_cat_rec)) if len(keywords_in_cat_rec) > 0 else 1
-                            cols_rec = st.columns(num_cols_rec)
-                            for idx_rec, (_, row_data_rec) in enumerate(keywords_in_cat_rec.iterrows()):
-                                current_badge_color_rec = "#6c757d"
-                                for cat_prefix, color_val in badge_colors_rec.items():
-                                    if category_rec.startswith(cat_prefix): current_badge_color_rec = color_val; break
-                                with cols_rec[idx_rec % num_cols_rec]:
-                                    st.markdown(f"""<div style="margin: 8px 0; padding: 12px; border-radius: 8px; background-color: #f8f9fa; border-left: 6px solid {current_badge_color_rec}; box-shadow: 2px 2px 5px #eee;"><strong style="font-size:1.1em;">{row_data_rec['키워드']}</strong><span style="float: right; padding: 3px 10px; border-radius: 12px; background-color: {current_badge_color_rec}; color: white; font-size:0.9em;">점수: {row_data_rec[y_column_graph]:.2f}</span></div>""", unsafe_allow_html=True)
-                    st.markdown("<br>", unsafe_allow_html=True) 
-elif st.session_state.get('show_graph_section', False) and st.session_state.keywords_data.empty:
-    display_html_message("앗, 그래프를 그리려면 먼저 키워드를 추가해야 해요! 위에서 키워드를 추가해주세요. 😊", type="info", duration_sec=0) 
-    st.session_state.show_graph_section = False 
+                    if assessment_type_graph == 'average':
+                        df_graph_plot['종합점수'] = df_graph_plot[['유레카지수', '덕질가능지수', '성장잠재력지수']].astype(float).mean(axis=1)
+                        df_graph_plot['종합점수'] = df_graph_plot['종합점수'].apply(lambda x: round(x, 2) if pd.notnull(x) else np.nan)
+                        y_column_graph = '종합점수'
+                        title_suffix_graph = '종합 점수'
+                    else:
+                        y_column_graph = assessment_type_graph
+                        title_suffix_graph = selected_assessment_label_graph.split('(')[0].strip()
+                
+                    df_graph_plot = df_graph_plot.dropna(subset=[y_column_graph, '데이터가용성점수'])
+                    if df_graph_plot.empty:
+                        display_html_message("평가 기준에 따른 유효 데이터가 없어 그래프를 그릴 수 없습니다.", type="warning_red_text", duration_sec=0) 
+                    else:
+                        img_data_b64_graph = load_chart_module().cached_keyword_map(get_render_cache(), df_graph_plot, y_column_graph, title_suffix_graph, assessment_type_graph, jitter_seed=st.session_state.graph_jitter_seed, profiler=st.session_state.profiler)
+                        st.markdown(f'<div style="text-align:center; margin-top: 20px;"><img src="data:image/png;base64,{img_data_b64_graph}" style="max-width:100%; height:auto; border-radius:18px; box-shadow:0 1.5px 8px #aaa;"></div>', unsafe_allow_html=True)
+                        # 사분면은 평가 기준 하나만 보지만, 최전선 단계는 네 점수를 한꺼번에 비교한 순위
+                        frontier_order = skyline.frontier_ranking(df_graph_plot)
+                        frontier_rows = df_graph_plot.iloc[frontier_order[:st.session_state.frontier_shortlist_size]]
+                        frontier_rows = frontier_rows[frontier_rows[skyline.LEVEL_COLUMN] == skyline.FRONTIER_LEVEL]
+                        frontier_level_counts = skyline.level_counts(df_graph_plot[skyline.LEVEL_COLUMN], max_levels=3)
+                        st.markdown(f'<div style="text-align:center; margin-top:30px;"><h3>⭐ 파레토 최전선 키워드</h3><p style="color:grey; font-size:0.9em;">데이터 가용성과 세 지수 모두에서 다른 키워드보다 못한 점이 없는 키워드예요. (단계별 키워드 수: {", ".join(f"{level}단계 {count:,}개" for level, count in frontier_level_counts.items())})</p></div>', unsafe_allow_html=True)
+                        st.markdown(recommend.cards_html(frontier_rows, y_column_graph, '#d4a017'), unsafe_allow_html=True)
+                        if len(frontier_rows) < frontier_level_counts.get(skyline.FRONTIER_LEVEL, 0):
+                            frontier_more_cols = st.columns([1, 1, 1])
+                            frontier_more_cols[1].button("더 보기 ⬇️", key="frontier_more", use_container_width=True, on_click=show_more_frontier_keywords)
+                        st.markdown('<div style="text-align:center; margin-top:30px;"><h3>✨ 보석 키워드 추천 ✨</h3></div>', unsafe_allow_html=True)
+                        with st.expander("⚙️ 추천 기준 설정", expanded=False):
+                            rec_setting_cols = st.columns(3)
+                            rec_x_threshold = rec_setting_cols[0].number_input("데이터 가용성 기준선", min_value=1.0, max_value=4.0, value=recommend.DEFAULT_THRESHOLD, step=0.5, key="rec_x_threshold")
+                            rec_y_threshold = rec_setting_cols[1].number_input("평가 점수 기준선", min_value=1.0, max_value=4.0, value=recommend.DEFAULT_THRESHOLD, step=0.5, key="rec_y_threshold")
+                            rec_top_k = int(rec_setting_cols[2].number_input("한 번에 보여줄 개수", min_value=1, max_value=60, value=recommend.DEFAULT_TOP_K, step=1, key="rec_top_k"))
+                        rec_pages = st.session_state.rec_pages_per_quadrant
+                        shown_per_quadrant = {quadrant['code']: rec_pages.get(quadrant['code'], 1) * rec_top_k for quadrant in recommend.QUADRANTS}
+                        with profile_span('recommendation_cards') as cards_span:
+                            for quadrant_rec in recommend.classify(df_graph_plot, y_column_graph, rec_x_threshold, rec_y_threshold, shown_per_quadrant):
+                                if quadrant_rec['total'] == 0:
+                                    continue
+                                st.markdown(f'<h4 style="text-align:center; color:#555; margin-top:15px;">{quadrant_rec["label"]} <span style="font-size:0.75em; color:#999;">({len(quadrant_rec["rows"]):,}/{quadrant_rec["total"]:,})</span></h4>', unsafe_allow_html=True)
+                                cards_markup = recommend.cards_html(quadrant_rec['rows'], y_column_graph, quadrant_rec['badge_color'])
+                                cards_span.add_bytes(len(cards_markup))
+                                st.markdown(cards_markup, unsafe_allow_html=True)
+                                if len(quadrant_rec['rows']) < quadrant_rec['total']:
+                                    more_cols = st.columns([1, 1, 1])
+                                    more_cols[1].button("더 보기 ⬇️", key=f"rec_more_{quadrant_rec['code']}", use_container_width=True, on_click=show_more_recommendations, args=(quadrant_rec['code'],))
+                        st.markdown("<br>", unsafe_allow_html=True) 
+    elif st.session_state.get('show_graph_section', False):
+        display_html_message("앗, 그래프를 그리려면 먼저 키워드를 추가해야 해요! 위에서 키워드를 추가해주세요. 😊", type="info", duration_sec=0) 
+        st.session_state.show_graph_section = False 
+    flush_notifications()
+
+with st.sidebar:
+    st.title("⚙️ 검색 사이트 설정")
+    st.caption("여기서 검색할 사이트와 가중치를 마음대로 바꿀 수 있어요!")
+    site_settings_fragment()
+keyword_input_fragment()
+bulk_import_fragment()
+keyword_table_fragment()
+keyword_map_fragment()
+
+if st.session_state.profiler.show_panel:
+    # 구간 측정 결과 (fragment만 다시 실행된 경우는 다음 전체 실행 때 반영). 표본 수집만 켜져 있으면 기록만 하고 패널은 숨김
+    with st.expander("🛠️ 성능 디버그 패널", expanded=False):
+        st.caption(f"세션 {st.session_state.profiler.session_id} · 실행 {st.session_state.profiler.run_id}회 기록 · 로그: {st.session_state.profiler.log_path or '저장 안 함'}")
+        st.dataframe(st.session_state.profiler.summary(), use_container_width=True)
+        st.dataframe(st.session_state.profiler.frame().iloc[::-1].head(50), use_container_width=True, hide_index=True)
 
 st.markdown("<div style='text-align:center;'><hr style='margin: 30px auto 15px auto; width: 80%;'></div>", unsafe_allow_html=True)
 st.markdown("<p style='text-align:center; color:grey; font-size:0.9em;'>✨ 나만의 보석 키워드 발굴 시스템 by 꾸물 ✨<br>contact: zambi23@naver.com</p>", unsafe_allow_html=True)